@@ -0,0 +1,312 @@
+"""
+Render benchmark for the LED animations.
+
+Drives every AnimationRunner animation, update_calendar and
+LEDController.set_pixel against an in-memory LED backend with sleeping
+disabled, for several LED counts. The *_overlay cases run the weather
+animation through the compositor, over a drawn calendar.
+
+Features:
+- Frames per second and p50/p99 frame render time per animation and size
+- Allocated bytes per frame: the peak traced memory above the frame's
+  starting point, measured in a separate tracemalloc pass so tracing does
+  not slow down the timed pass
+- Results saved as JSON so runs can be compared
+- With --baseline, fails (exit status 1) when an animation's p50 frame time
+  regressed by more than --threshold against the baseline run
+
+Usage:
+    python -m led_control.cli.benchmark --output bench.json
+    python -m led_control.cli.benchmark --baseline bench.json --threshold 0.25
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from led_control.core import render_kernels
+from led_control.core.animation_runner import AnimationRunner
+from led_control.core.compositor import Compositor
+from led_control.core.frame_clock import FrameClock
+from led_control.core.led_backends import MemoryBackend
+from led_control.core.led_controller import LEDController
+
+DEFAULT_SIZES = (28, 112, 448)
+DEFAULT_DURATION = 0.5
+DEFAULT_MAX_FRAMES = 5000
+ALLOC_FRAMES = 100
+DEFAULT_THRESHOLD = 0.25
+
+
+class _FrameLimit(Exception):
+    """Raised by the recorder once enough frames were sampled."""
+
+
+class _FrameRecorder:
+    """One sample per frame: seconds spent, or peak bytes allocated."""
+
+    def __init__(self, max_frames, trace_memory=False):
+        self.max_frames = max_frames
+        self.trace_memory = trace_memory
+        self.samples = []
+        self._start = 0.0
+
+    def begin(self):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            self._start = tracemalloc.get_traced_memory()[0]
+        else:
+            self._start = time.perf_counter()
+
+    def end(self):
+        if self.trace_memory:
+            self.samples.append(tracemalloc.get_traced_memory()[1] - self._start)
+        else:
+            self.samples.append(time.perf_counter() - self._start)
+        if len(self.samples) >= self.max_frames:
+            raise _FrameLimit()
+        self.begin()
+
+
+class _RecordingClock(FrameClock):
+    """FrameClock that never waits; each frame boundary is a sample."""
+
+    def __init__(self, fps, recorder):
+        super().__init__(fps)
+        self.recorder = recorder
+
+    def start(self):
+        now = super().start()
+        self.recorder.begin()
+        return now
+
+    def tick(self):
+        self.frames += 1
+        self.recorder.end()
+        return 0
+
+    def hold(self, seconds):
+        self.frames += 1
+        self.recorder.end()
+
+
+class BenchmarkRunner(AnimationRunner):
+    """AnimationRunner whose frame clocks record samples instead of pacing."""
+
+    def __init__(self, led_controller, recorder, use_numpy=True, compositor=None):
+        super().__init__(led_controller, use_numpy=use_numpy, compositor=compositor)
+        self.recorder = recorder
+
+    def _frame_clock(self, name, fps=None):
+        clock = _RecordingClock(fps or self.frame_rates.get(name, 20), self.recorder)
+        self.clocks[name] = clock
+        clock.start()
+        return clock
+
+
+def _calendar_counts(num_leds):
+    return [(i * 7) % 5 for i in range(num_leds)]
+
+
+def _calendar_frame(runner):
+    runner.update_calendar(
+        _calendar_counts(runner.num_leds),
+        {"event": (0, 255, 0), "no_events": (30, 30, 30)},
+        brightness=0.8,
+    )
+
+
+def _set_pixel_frame(runner):
+    led = runner.led
+    for i in range(led.num_leds):
+        led.set_pixel(i, (i % 256, 128, 255 - i % 256), 0.5)
+    led.show()
+
+
+# Animations paced by a FrameClock: called with an end time, one sample per frame
+LOOP_CASES = {
+    "sun": lambda r, end: r.sun_animation_loop(end, 0.8),
+    "cloud": lambda r, end: r.cloud_animation_loop(end, 0.8),
+    "rain": lambda r, end: r.rain_animation_loop(end, speed=1.0, drop_chance=0.9, brightness=0.8),
+    "snow": lambda r, end: r.snow_animation_loop(end, brightness=0.8),
+    "thunderstorm": lambda r, end: r.thunderstorm_animation_loop(end, 0.8),
+    "fog": lambda r, end: r.fog_animation_loop(end, 0.8),
+    "default": lambda r, end: r.default_animation_loop(end, 0.8),
+    "color_wipe": lambda r, end: r.color_wipe((255, 255, 255), wait=0.03),
+    "theater_chase": lambda r, end: r.theater_chase((0, 0, 255), wait=0.05),
+    "rainbow": lambda r, end: r.rainbow_cycle(wait=0.01),
+    "flash": lambda r, end: r.flash(),
+}
+
+def _overlay(loop):
+    """A weather loop drawn over the calendar layer."""
+    def run(runner, end):
+        _calendar_frame(runner)
+        loop(runner, end)
+    return run
+
+
+# Weather loops composited over the calendar; these runners get a Compositor
+OVERLAY_CASES = {
+    "rain_overlay": _overlay(LOOP_CASES["rain"]),
+    "sun_overlay": _overlay(LOOP_CASES["sun"]),
+}
+LOOP_CASES.update(OVERLAY_CASES)
+
+# Single frame draws: one sample per call
+FRAME_CASES = {
+    "update_calendar": _calendar_frame,
+    "set_pixel": _set_pixel_frame,
+}
+
+CASES = list(LOOP_CASES) + list(FRAME_CASES)
+
+
+def _collect(name, num_leds, duration, max_frames, trace_memory=False, use_numpy=True):
+    """Run one case and return its per-frame samples."""
+    recorder = _FrameRecorder(max_frames, trace_memory=trace_memory)
+    led = LEDController(num_leds=num_leds, backend=MemoryBackend(num_leds, max_frames=1))
+    compositor = Compositor(led) if name in OVERLAY_CASES else None
+    runner = BenchmarkRunner(led, recorder, use_numpy=use_numpy, compositor=compositor)
+    end_time = time.monotonic() + duration
+    # Only the thunderstorm flashes call time.sleep directly
+    with patch("time.sleep", return_value=None):
+        try:
+            if name in LOOP_CASES:
+                # Finite animations are restarted until the time is up
+                while time.monotonic() < end_time:
+                    LOOP_CASES[name](runner, end_time)
+            else:
+                draw = FRAME_CASES[name]
+                while time.monotonic() < end_time:
+                    recorder.begin()
+                    draw(runner)
+                    recorder.end()
+        except _FrameLimit:
+            pass
+    return recorder.samples
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_case(name, num_leds, duration=DEFAULT_DURATION, max_frames=DEFAULT_MAX_FRAMES,
+             use_numpy=True):
+    """Benchmark one animation at one LED count. Returns a result dict."""
+    times = _collect(name, num_leds, duration, max_frames, use_numpy=use_numpy)
+
+    tracemalloc.start()
+    try:
+        allocs = _collect(name, num_leds, duration, min(max_frames, ALLOC_FRAMES),
+                          trace_memory=True, use_numpy=use_numpy)
+    finally:
+        tracemalloc.stop()
+
+    total = sum(times)
+    return {
+        "animation": name,
+        "num_leds": num_leds,
+        "frames": len(times),
+        "fps": round(len(times) / total, 1) if total else None,
+        "p50_ms": round(_percentile(times, 50) * 1000, 4) if times else None,
+        "p99_ms": round(_percentile(times, 99) * 1000, 4) if times else None,
+        "alloc_bytes_per_frame": round(statistics.mean(allocs)) if allocs else None,
+    }
+
+
+def run_benchmarks(cases=None, sizes=DEFAULT_SIZES, duration=DEFAULT_DURATION,
+                   max_frames=DEFAULT_MAX_FRAMES, use_numpy=True):
+    """Benchmark every case at every size. Returns the JSON report dict."""
+    results = []
+    for num_leds in sizes:
+        for name in cases or CASES:
+            results.append(run_case(name, num_leds, duration, max_frames, use_numpy))
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "numpy": use_numpy and render_kernels.HAVE_NUMPY,
+            "duration": duration,
+        },
+        "results": results,
+    }
+
+
+def find_regressions(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Cases whose p50 frame time grew by more than threshold (0.25 = 25%)
+    against the baseline report. Cases missing from either side are skipped.
+    """
+    previous = {(r["animation"], r["num_leds"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in report["results"]:
+        old = previous.get((result["animation"], result["num_leds"]))
+        if not old or not old.get("p50_ms") or result["p50_ms"] is None:
+            continue
+        change = result["p50_ms"] / old["p50_ms"] - 1
+        if change > threshold:
+            regressions.append(dict(result, baseline_p50_ms=old["p50_ms"], change=round(change, 3)))
+    return regressions
+
+
+def format_report(report):
+    lines = [f"{'animation':<16}{'leds':>6}{'fps':>12}{'p50 ms':>10}{'p99 ms':>10}{'bytes/frame':>13}"]
+    for r in report["results"]:
+        lines.append(
+            f"{r['animation']:<16}{r['num_leds']:>6}{r['fps'] or 0:>12.1f}"
+            f"{r['p50_ms'] or 0:>10.3f}{r['p99_ms'] or 0:>10.3f}"
+            f"{r['alloc_bytes_per_frame'] or 0:>13}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the LED animations.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="LED counts to render at")
+    parser.add_argument("--animations", nargs="+", choices=CASES, default=None,
+                        help="only run these cases")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help="seconds per case and size")
+    parser.add_argument("--max-frames", type=int, default=DEFAULT_MAX_FRAMES)
+    parser.add_argument("--no-numpy", action="store_true", help="use the pure Python kernels")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed p50 slowdown against the baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.animations, args.sizes, args.duration, args.max_frames,
+                            use_numpy=not args.no_numpy)
+    print(format_report(report))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(report, baseline, args.threshold)
+        for r in regressions:
+            print(
+                f"[ERROR] {r['animation']} at {r['num_leds']} LEDs: p50 "
+                f"{r['baseline_p50_ms']:.3f} -> {r['p50_ms']:.3f} ms (+{r['change']:.0%})"
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
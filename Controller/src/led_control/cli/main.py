@@ -1,18 +1,38 @@
-"""Main entry point for CCal_V2 LED control (rewritten version)."""
+"""
+Main entry point for CCal_V2 LED control (rewritten version).
 
+Startup is ordered for the time to the first frame: the LEDs and the startup
+animation come up first, and the integrations (the tracker modules and
+requests) are only imported if configured, while the startup animation
+plays. Run with --startup-profile to print the timeline.
+"""
+
+import time
+
+# Taken before the other imports so the startup timeline includes them
+_STARTED = time.perf_counter()
+
+import argparse
 import os
+import signal
 import sys
-import time
+import threading
 import traceback
+from led_control.cli.startup_profile import StartupProfile
 from led_control.core.config_manager import ConfigManager
 from led_control.core.led_controller import LEDController
+from led_control.core.led_backends import backend_name, create_backend
 from led_control.core.animation_runner import AnimationRunner
-from led_control.core.integration_manager import IntegrationManager
-from led_control.integrations.github_tracker import GitHubTracker
-from led_control.integrations.weather_tracker import WeatherTracker
-from led_control.integrations.strava import StravaTracker
-from led_control.integrations.generic_tracker import GenericTracker
-from datetime import datetime, timedelta
+from led_control.core.compositor import Compositor
+from led_control.core.frame_cache import FrameCache, DEFAULT_CACHE_DIR
+from led_control.core.activity_store import ActivityStore, DEFAULT_STORE_PATH
+from led_control.core.display_snapshot import DisplaySnapshot, DEFAULT_SNAPSHOT_PATH
+from led_control.core.metrics import REGISTRY, MetricsExporter
+from led_control.integrations.registry import (
+    GENERIC_TRACKER, GITHUB_BACKENDS, enabled_integrations, integration_for, load_class
+)
+
+_IMPORTED = time.perf_counter()
 
 USERNAME = "USERNAME"
 CONFIG_PATH = f"/home/{USERNAME}/Daily-Grid/config.json"
@@ -34,11 +54,10 @@ def safe_get(config, key, default=None, required=False):
 
 
 def load_config():
-    """Load and parse configuration file."""
+    """Load the configuration file; the manager keeps it up to date."""
     config_path = CONFIG_PATH
     try:
-        config_manager = ConfigManager(config_path)
-        return config_manager.conf
+        return ConfigManager(config_path)
     except Exception as exc:
         print(f"[ERROR] Failed to load config from {config_path}: {exc}")
         sys.exit(1)
@@ -49,22 +68,37 @@ def extract_config_values(config):
     return {
         # Hardware settings
         'pin_num': safe_get(config, "PIN_NUM", 18),
+        'led_backend': safe_get(config, "LED_BACKEND", "neopixel"),
         'num_leds': safe_get(config, "NUM_LEDS", 28), # For future potential expansion
         'brightness': safe_get(config, "BRIGHTNESS", 0.8),
+        'gamma': safe_get(config, "GAMMA", 1.0),
+        'white_balance': safe_get(config, "WHITE_BALANCE", [1.0, 1.0, 1.0]),
         'startup_animation': safe_get(config, "STARTUP_ANIMATION", 3),
+        'frame_rates': safe_get(config, "FRAME_RATES", {}),
+        'frame_cache_dir': safe_get(config, "FRAME_CACHE_DIR", DEFAULT_CACHE_DIR),
+        'layers': safe_get(config, "LAYERS", None),
         
         # Schedule settings
         'on_time': safe_get(config, "ON_TIME", 9),
         'off_time': safe_get(config, "OFF_TIME", 22),
         'poll_time': safe_get(config, "POLL_TIME", 90),
         'weather_display_time': safe_get(config, "WEATHER_DISPLAY_TIME", 4),
+        'fetch_workers': safe_get(config, "FETCH_WORKERS", 4),
+        'fetch_timeout': safe_get(config, "FETCH_TIMEOUT", 30),
+        'activity_db': safe_get(config, "ACTIVITY_DB", DEFAULT_STORE_PATH),
+        'activity_retention_days': safe_get(config, "ACTIVITY_RETENTION_DAYS", 400),
+        'display_snapshot': safe_get(config, "DISPLAY_SNAPSHOT", DEFAULT_SNAPSHOT_PATH),
+        'metrics_port': safe_get(config, "METRICS_PORT", None),
+        'metrics_file': safe_get(config, "METRICS_FILE", ""),
         
         # API credentials
         'github_username': safe_get(config, "GITHUB_USERNAME", required=False),
         'github_token': safe_get(config, "GITHUB_TOKEN", required=False),
+        'github_backend': safe_get(config, "GITHUB_BACKEND", "events"),
         'weather_api_key': safe_get(config, "OPENWEATHERMAP_API_KEY", required=True),
         'weather_lat': safe_get(config, "WEATHER_LAT", required=True),
         'weather_lon': safe_get(config, "WEATHER_LON", required=True),
+        'weather_max_staleness': safe_get(config, "WEATHER_MAX_STALENESS", 3 * 60 * 60),
         'strava_client_id': safe_get(config, "STRAVA_ID", required=False),
         'strava_client_secret': safe_get(config, "STRAVA_SECRET", required=False),
         
@@ -77,44 +111,85 @@ def extract_config_values(config):
     }
 
 
-def setup_integrations(cfg, animation_runner):
-    """Initialize all integration trackers and manager."""
-    trackers = []
-
-    if cfg['github_username'] and cfg['github_token']:
-        colors = {
-            "event": cfg['github_event_color'],
-            "no_events": cfg['github_no_events_color']
-        }
-        github_tracker = GitHubTracker(cfg['github_username'], cfg['github_token'], colors=colors)
-        trackers.append(github_tracker)
-    
-    if cfg['strava_client_id'] and cfg['strava_client_secret']:
-        colors = {
-            "event": cfg['strava_events_color'],
-            "no_events": cfg['strava_no_events_color']
-        }
-        strava_tracker = StravaTracker(
-            client_id=cfg['strava_client_id'], 
-            client_secret=cfg['strava_client_secret'],
-            num_days=cfg['num_leds'],
-            colors=colors
+def open_activity_store(cfg):
+    """Open the activity store; without one the display shows the latest fetch only."""
+    if not cfg['activity_db']:
+        return None
+    try:
+        return ActivityStore(
+            os.path.expanduser(cfg['activity_db']),
+            retention_days=cfg['activity_retention_days']
         )
-        trackers.append(strava_tracker)
+    except Exception as exc:
+        print(f"[ERROR] Failed to open activity store {cfg['activity_db']}: {exc}")
+        return None
 
-    if cfg['weather_api_key'] and cfg['weather_lat'] and cfg['weather_lon']:
-        weather_tracker = WeatherTracker(
-            cfg['weather_api_key'], 
-            (cfg['weather_lat'], cfg['weather_lon'])
-        )
+
+def start_metrics(cfg):
+    """Export metrics on METRICS_PORT (localhost) and/or to METRICS_FILE, if set."""
+    if not cfg['metrics_port'] and not cfg['metrics_file']:
+        return None
+    exporter = MetricsExporter(
+        port=cfg['metrics_port'] or None,
+        path=os.path.expanduser(cfg['metrics_file']) if cfg['metrics_file'] else None
+    )
+    try:
+        exporter.start()
+    except OSError as exc:
+        print(f"[ERROR] Failed to start metrics export: {exc}")
+        return None
+    return exporter
+
+
+def create_compositor(cfg, led_controller):
+    """
+    Layer the display if LAYERS is set ({} for the defaults); without it
+    every animation redraws the whole strip.
+    """
+    if cfg['layers'] is None:
+        return None
+    compositor = Compositor(led_controller)
+    try:
+        compositor.configure(cfg['layers'])
+    except ValueError as exc:
+        print(f"[ERROR] Invalid LAYERS in config, using the defaults: {exc}")
+    return compositor
+
+
+def setup_integrations(cfg, animation_runner, activity_store=None, profile=None):
+    """
+    Initialize the configured integration trackers and the manager.
+    Tracker modules are imported here, and only for integrations whose
+    config is present.
+    """
+    from led_control.core.integration_manager import IntegrationManager
+
+    profile = profile or StartupProfile()
+    if cfg['github_backend'] not in GITHUB_BACKENDS:
+        print(f"[ERROR] Unknown GITHUB_BACKEND '{cfg['github_backend']}', using 'events'")
+
+    trackers = []
+    weather_tracker = None
+    for integration in enabled_integrations(cfg):
+        with profile.step(f"import {integration.name}"):
+            integration.load()
+        with profile.step(f"create {integration.name}"):
+            tracker = integration.create(cfg, activity_store=activity_store)
+        if integration.role == "weather":
+            weather_tracker = tracker
+        else:
+            trackers.append(tracker)
     
     # For each file in the CustomTrackers directory, create a GenericTracker integration
     custom_trackers_dir = f"/home/{USERNAME}/Daily-Grid/CustomTrackers"
-    for filename in os.listdir(custom_trackers_dir):
-        if filename.endswith(".json"):
+    tracker_files = [f for f in sorted(os.listdir(custom_trackers_dir)) if f.endswith(".json")]
+    if tracker_files:
+        with profile.step("import generic"):
+            GenericTracker = load_class(GENERIC_TRACKER)
+        for filename in tracker_files:
             tracker_path = os.path.join(custom_trackers_dir, filename)
             try:
-                generic_tracker = GenericTracker(tracker_path)
+                generic_tracker = GenericTracker(tracker_path, activity_store=activity_store)
                 trackers.append(generic_tracker)
             except Exception as exc:
                 print(f"[ERROR] Failed to load GenericTracker from {tracker_path}: {exc}")
@@ -122,53 +197,201 @@ def setup_integrations(cfg, animation_runner):
     return IntegrationManager(
         animation_runner=animation_runner,
         trackers=trackers,
-        weather_tracker=weather_tracker
+        weather_tracker=weather_tracker,
+        max_workers=cfg['fetch_workers'],
+        fetch_timeout=cfg['fetch_timeout'],
+        activity_store=activity_store,
+        window_days=cfg['num_leds'],
+        # An empty DISPLAY_SNAPSHOT keeps the calendar dark until the first fetches
+        snapshot=(
+            DisplaySnapshot(os.path.expanduser(cfg['display_snapshot']))
+            if cfg['display_snapshot'] else None
+        )
     )
 
 
-def main():
+# Changing these only takes effect after a service restart
+RESTART_KEYS = {
+    "PIN_NUM", "NUM_LEDS", "LED_BACKEND", "FRAME_RATES", "FRAME_CACHE_DIR", "FETCH_WORKERS",
+    "FETCH_TIMEOUT", "ACTIVITY_DB", "ACTIVITY_RETENTION_DAYS",
+    "DISPLAY_SNAPSHOT", "METRICS_PORT", "METRICS_FILE",
+    "GITHUB_USERNAME", "GITHUB_TOKEN", "GITHUB_BACKEND",
+    "OPENWEATHERMAP_API_KEY", "WEATHER_LAT", "WEATHER_LON", "WEATHER_MAX_STALENESS",
+    "STRAVA_ID", "STRAVA_SECRET",
+}
+
+
+def apply_config_changes(cfg, config, changes, led_controller, integration_manager):
+    """Apply a reloaded config to the running display without a restart."""
+    cfg.update(extract_config_values(config))
+
+    if changes.keys() & {"BRIGHTNESS", "POLL_TIME", "WEATHER_DISPLAY_TIME"}:
+        integration_manager.apply_settings(
+            brightness=cfg['brightness'],
+            poll_time=cfg['poll_time'],
+            weather_display_time=cfg['weather_display_time']
+        )
+
+    if changes.keys() & {"GAMMA", "WHITE_BALANCE"}:
+        try:
+            led_controller.set_color_correction(cfg['gamma'], cfg['white_balance'])
+        except ValueError as exc:
+            print(f"[ERROR] Invalid color correction in config: {exc}")
+
+    for tracker in integration_manager.trackers:
+        integration = integration_for(tracker)
+        if integration is not None and integration.color_keys is not None:
+            tracker.colors.update(integration.colors(cfg))
+
+    if "LAYERS" in changes:
+        compositor = integration_manager.animation_runner.compositor
+        if compositor is None or cfg['layers'] is None:
+            # Turning the compositor on or off needs a restart
+            print("[INFO] Restart the service to apply: LAYERS")
+        else:
+            try:
+                compositor.configure(cfg['layers'])
+            except ValueError as exc:
+                print(f"[ERROR] Invalid LAYERS in config: {exc}")
+
+    needs_restart = sorted(changes.keys() & RESTART_KEYS)
+    if needs_restart:
+        print(f"[INFO] Restart the service to apply: {', '.join(needs_restart)}")
+
+
+def _handle_sigterm(signum, frame):
+    """Turn systemd's SIGTERM into a normal exit so cleanup handlers run."""
+    raise SystemExit(0)
+
+
+def close_http_transport():
+    """Close the shared HTTP session, if a tracker ever imported it."""
+    transport = sys.modules.get("led_control.integrations.http_transport")
+    if transport is not None:
+        transport.close_transport()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Drive the CCal LED calendar.")
+    parser.add_argument(
+        "--startup-profile", action="store_true",
+        help="print an import and initialization timeline once the display is running"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main program loop for LED control."""
+    args = parse_args(argv)
+    profile = StartupProfile(started=_STARTED)
+    profile.record("import display modules", _STARTED, _IMPORTED)
+    signal.signal(signal.SIGTERM, _handle_sigterm)
     try:
-        config = load_config()
-        cfg = extract_config_values(config)
+        with profile.step("load config"):
+            config_manager = load_config()
+            cfg = extract_config_values(config_manager.conf)
 
-        led_controller = LEDController(
-            pin_num=cfg['pin_num'], 
-            num_leds=cfg['num_leds'], 
-            brightness=cfg['brightness']
+        with profile.step("init LEDs"):
+            # CCAL_LED_BACKEND=terminal runs the display off the Pi
+            backend = create_backend(
+                backend_name(cfg['led_backend']), cfg['num_leds'], pin_num=cfg['pin_num']
+            )
+            if args.startup_profile:
+                profile.mark_first_write(backend)
+            led_controller = LEDController(
+                pin_num=cfg['pin_num'], 
+                num_leds=cfg['num_leds'], 
+                brightness=cfg['brightness'],
+                gamma=cfg['gamma'],
+                white_balance=cfg['white_balance'],
+                backend=backend
+            )
+            # An empty FRAME_CACHE_DIR disables the compiled startup animations
+            frame_cache = (
+                FrameCache(os.path.expanduser(cfg['frame_cache_dir']))
+                if cfg['frame_cache_dir'] else None
+            )
+            animation_runner = AnimationRunner(
+                led_controller,
+                frame_rates=cfg['frame_rates'],
+                frame_cache=frame_cache,
+                compositor=create_compositor(cfg, led_controller)
+            )
+
+        # The startup animation is the only thing drawing until it is joined
+        # below; meanwhile the integrations are imported and set up
+        startup_animation = threading.Thread(
+            target=animation_runner.run_startup_animation,
+            args=(cfg['startup_animation'],),
+            kwargs={"brightness": cfg['brightness']},
+            name="startup-animation",
+            daemon=True
         )
-        animation_runner = AnimationRunner(led_controller)
+        startup_animation.start()
+        profile.mark("startup animation started")
         
-        integration_manager = setup_integrations(cfg, animation_runner)
+        REGISTRY.add_collector(animation_runner.collect_metrics)
+        with profile.step("start metrics"):
+            metrics_exporter = start_metrics(cfg)
+
+        with profile.step("open activity store"):
+            activity_store = open_activity_store(cfg)
+        with profile.step("setup integrations"):
+            integration_manager = setup_integrations(cfg, animation_runner, activity_store, profile)
+        with profile.step("restore display snapshot"):
+            integration_manager.restore_snapshot()
+        integration_manager.apply_settings(
+            brightness=cfg['brightness'],
+            poll_time=cfg['poll_time'],
+            weather_display_time=cfg['weather_display_time']
+        )
 
-        animation_runner.run_startup_animation(
-            cfg['startup_animation'], 
-            brightness=cfg['brightness']
+        startup_animation.join()
+        profile.mark("startup animation finished")
+        # Show the last calendar until the first fetches replace it
+        if integration_manager.show_snapshot():
+            profile.mark("snapshot shown")
+
+        # Settings edited in the WebGUI apply within a second
+        config_manager.subscribe(
+            lambda config, changes: apply_config_changes(
+                cfg, config, changes, led_controller, integration_manager
+            )
         )
+        config_manager.watch(interval=1.0)
+
+        if args.startup_profile:
+            print("[PROFILE] Startup timeline:")
+            print(profile.format())
 
         # Main loop
-        while True:
-            try:
-                now_hour = time.localtime().tm_hour
-                if (cfg['on_time'] != cfg['off_time'] and 
-                    (cfg['brightness'] == 0 or not (cfg['on_time'] <= now_hour < cfg['off_time']))):
-                    led_controller.turn_all_off()
-                    time.sleep(cfg['poll_time'])
-                    continue
-
-                integration_manager.run_integration_cycle(
-                    brightness=cfg['brightness'],
-                    poll_time=cfg['poll_time'],
-                    weather_display_time=cfg['weather_display_time']
-                )
-
-            except KeyboardInterrupt:
-                print("Exiting gracefully.")
-                break
-            except Exception as exc:
-                print(f"[ERROR] Unexpected error in main loop: {exc}")
-                traceback.print_exc()
-                time.sleep(10)
+        try:
+            while True:
+                try:
+                    now_hour = time.localtime().tm_hour
+                    if (cfg['on_time'] != cfg['off_time'] and 
+                        (cfg['brightness'] == 0 or not (cfg['on_time'] <= now_hour < cfg['off_time']))):
+                        led_controller.turn_all_off()
+                        integration_manager.pause(cfg['poll_time'])
+                        continue
+
+                    integration_manager.run_integration_cycle()
+
+                except KeyboardInterrupt:
+                    print("Exiting gracefully.")
+                    break
+                except Exception as exc:
+                    print(f"[ERROR] Unexpected error in main loop: {exc}")
+                    traceback.print_exc()
+                    time.sleep(10)
+        finally:
+            config_manager.close()
+            integration_manager.close()
+            close_http_transport()
+            if activity_store is not None:
+                activity_store.close()
+            if metrics_exporter is not None:
+                metrics_exporter.stop()
 
     except Exception as exc:
         print(f"[FATAL] Unhandled exception: {exc}")
@@ -0,0 +1,76 @@
+"""
+Startup timeline for the LED control daemon.
+
+main() records each import and initialization step here; with
+--startup-profile the timeline is printed once the display is running.
+Only the standard library's time module is used, so it can be set up
+before anything else is imported.
+
+For a per-module breakdown of the imports, run the daemon with
+python -X importtime.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfile:
+    """
+    Steps and events since the profile was created, in milliseconds.
+
+    Usage:
+        profile = StartupProfile()
+        with profile.step("load config"):
+            ...
+        profile.mark("first frame")
+        print(profile.format())
+    """
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        # (label, start ms, duration ms or None for events)
+        self.entries = []
+        self._lock = threading.Lock()
+
+    def _elapsed_ms(self, now=None):
+        return ((now if now is not None else time.perf_counter()) - self.started) * 1000
+
+    @contextmanager
+    def step(self, label):
+        """Time the block as one step of the timeline."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(label, start, time.perf_counter())
+
+    def record(self, label, start, end):
+        """Add a step timed elsewhere, from two time.perf_counter() values."""
+        with self._lock:
+            self.entries.append((label, self._elapsed_ms(start), (end - start) * 1000))
+
+    def mark(self, label):
+        """Record an instant, like the first frame reaching the LEDs."""
+        with self._lock:
+            self.entries.append((label, self._elapsed_ms(), None))
+
+    def mark_first_write(self, backend, label="first frame"):
+        """Mark when the LED backend writes its first frame."""
+        write = backend.write
+
+        def first_write(frame):
+            backend.write = write
+            self.mark(label)
+            write(frame)
+
+        backend.write = first_write
+
+    def format(self):
+        with self._lock:
+            entries = sorted(self.entries, key=lambda entry: entry[1])
+        lines = [f"{'at ms':>10}{'took ms':>10}  step"]
+        for label, start, duration in entries:
+            took = f"{duration:>10.1f}" if duration is not None else f"{'':>10}"
+            lines.append(f"{start:>10.1f}{took}  {label}")
+        return "\n".join(lines)
@@ -0,0 +1,151 @@
+"""
+Local time-series store for tracker activity.
+
+Every tracker writes its per-day counts into one SQLite database and the
+calendar display reads back the window it shows with a single range query.
+
+Features:
+- One row per (tracker, day); the primary key is also the index for range
+  queries, so reading a window only touches the rows inside it
+- WAL journal: the display, the fetch threads and other local tools can read
+  while a fetch writes, and a crash never leaves half a window behind
+- Batched upserts: a tracker's whole window is written in one transaction
+- Rows older than the retention period are pruned once a day
+- History survives restarts and failed fetches
+
+Days are stored as ISO dates ("2025-01-31") so other tools can query the
+database without knowing anything about this package.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+from led_control.core import metrics
+
+DEFAULT_STORE_PATH = os.path.expanduser("~/.cache/ccal_activity.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS activity (
+    tracker TEXT NOT NULL,
+    day TEXT NOT NULL,
+    count NUMERIC NOT NULL,
+    PRIMARY KEY (tracker, day)
+) WITHOUT ROWID
+"""
+
+UPSERT = """
+INSERT INTO activity (tracker, day, count) VALUES (?, ?, ?)
+ON CONFLICT (tracker, day) DO UPDATE SET count = excluded.count
+"""
+
+WINDOW_QUERY = """
+SELECT day, count FROM activity
+WHERE tracker = ? AND day BETWEEN ? AND ?
+"""
+
+STORAGE_WRITE_SECONDS = metrics.histogram(
+    "ccal_storage_write_seconds", "Time spent writing files and databases", ("target",)
+)
+
+
+class ActivityStore:
+    """
+    Per-day activity counts for every tracker, in one SQLite database.
+
+    Usage:
+        store = ActivityStore()
+        store.record_window("github:octocat", [3, 0, 1])  # today first
+        counts = store.window("github:octocat", 28)
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, retention_days=400):
+        self.path = path
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._pruned_on = None
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # One connection shared by the fetch threads, serialised by _lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL with synchronous=NORMAL only fsyncs at checkpoints; a power cut
+        # can lose the last writes but never corrupts the database
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        with self._conn:
+            self._conn.execute(SCHEMA)
+        self.prune()
+
+    def record(self, tracker, counts_by_day, today=None):
+        """
+        Upsert {date: count} for a tracker in one transaction.
+        Returns False if the write failed.
+        """
+        rows = [(tracker, day.isoformat(), count) for day, count in counts_by_day.items()]
+        if rows:
+            try:
+                with STORAGE_WRITE_SECONDS.time(target="activity_store"), self._lock, self._conn:
+                    self._conn.executemany(UPSERT, rows)
+            except sqlite3.Error as exc:
+                print(f"[ERROR] Failed to record activity for {tracker}: {exc}")
+                return False
+        today = today or date.today()
+        if self._pruned_on != today:
+            self.prune(today)
+        return True
+
+    def record_window(self, tracker, counts, today=None):
+        """Upsert a today-first list of counts, as returned by get_activity."""
+        today = today or date.today()
+        return self.record(
+            tracker,
+            {today - timedelta(days=days_ago): count for days_ago, count in enumerate(counts)},
+            today=today,
+        )
+
+    def window(self, tracker, num_days=28, today=None):
+        """
+        Counts for the last num_days, today first. Days without a row are 0.
+        Returns None if the store could not be read.
+        """
+        today = today or date.today()
+        start = today - timedelta(days=num_days - 1)
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    WINDOW_QUERY, (tracker, start.isoformat(), today.isoformat())
+                ).fetchall()
+        except sqlite3.Error as exc:
+            print(f"[ERROR] Failed to read activity for {tracker}: {exc}")
+            return None
+        counts = [0] * num_days
+        for day, count in rows:
+            counts[(today - date.fromisoformat(day)).days] = count
+        return counts
+
+    def trackers(self):
+        """Keys of all trackers that have rows in the store."""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT tracker FROM activity").fetchall()
+        return [row[0] for row in rows]
+
+    def prune(self, today=None):
+        """Delete rows older than the retention period. Returns how many."""
+        today = today or date.today()
+        cutoff = today - timedelta(days=self.retention_days)
+        try:
+            with self._lock, self._conn:
+                deleted = self._conn.execute(
+                    "DELETE FROM activity WHERE day < ?", (cutoff.isoformat(),)
+                ).rowcount
+        except sqlite3.Error as exc:
+            print(f"[ERROR] Failed to prune activity store: {exc}")
+            return 0
+        self._pruned_on = today
+        return deleted
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
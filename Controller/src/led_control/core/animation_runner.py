@@ -1,70 +1,181 @@
-import math
 import random
 import time
 from typing import Tuple, Optional
 from led_control.core.led_controller import LEDController
+from led_control.core.frame_clock import FrameClock, deadline
+from led_control.core import render_kernels
+from led_control.core.frame_cache import CachedAnimation, FrameCache
+from led_control.core.compositor import Compositor
+from led_control.core.particles import ParticleSystem
+from led_control.core import metrics
+from led_control.core.render_kernels import (
+    FogKernel,
+    RainbowKernel,
+    SunKernel,
+    TheaterChaseKernel,
+)
+
+# Target frame rates per animation, overridable with the FRAME_RATES config key
+DEFAULT_FRAME_RATES = {
+    "sun": 20,
+    "cloud": 2,
+    "rain": 10,
+    "snow": 10,
+    "thunderstorm": 10,
+    "fog": 30,
+    "default": 20,
+}
+
+ANIMATION_FRAMES = metrics.counter(
+    "ccal_animation_frames_total", "Frames rendered per animation", ("animation",)
+)
+ANIMATION_FRAMES_LATE = metrics.counter(
+    "ccal_animation_frames_late_total", "Frames that finished after their deadline", ("animation",)
+)
+ANIMATION_FRAMES_DROPPED = metrics.counter(
+    "ccal_animation_frames_dropped_total", "Frame periods skipped to catch up", ("animation",)
+)
 
 
 class AnimationRunner:
-    """Runs various LED animations using LED controller."""
-
-    def __init__(self, led_controller: LEDController):
+    """
+    Runs various LED animations using LED controller.
+
+    Looping animations take an end_time on the time.monotonic() clock and are
+    paced by a FrameClock at the animation's target frame rate. The sun, fog,
+    rainbow and theater chase animations render whole frames through
+    render_kernels, vectorized with NumPy when it is installed. Deterministic
+    animations (color wipe, theater chase, rainbow, flash) are written as frame
+    generators so they can be compiled into a FrameCache and replayed.
+
+    With a Compositor, the calendar, the weather animations and the
+    temperature digits draw into their own layers and are blended into one
+    frame, so e.g. rain falls over the calendar. The startup animations
+    always draw on the whole strip.
+    """
+
+    def __init__(
+        self,
+        led_controller: LEDController,
+        frame_rates: Optional[dict] = None,
+        use_numpy: bool = True,
+        frame_cache: Optional[FrameCache] = None,
+        compositor: Optional[Compositor] = None,
+    ):
         self.led = led_controller
+        self.compositor = compositor
+        self.use_numpy = use_numpy and render_kernels.HAVE_NUMPY
+        self.frame_cache = frame_cache
         self.num_leds = led_controller.num_leds
+        self.frame_rates = dict(DEFAULT_FRAME_RATES)
+        for name, fps in (frame_rates or {}).items():
+            if isinstance(fps, (int, float)) and not isinstance(fps, bool) and fps > 0:
+                self.frame_rates[name] = fps
+            else:
+                print(f"[ERROR] Ignoring invalid frame rate for '{name}': {fps!r}")
+        self.clocks = {}
 
     def display_number(
         self, number: int, color: Tuple[int, int, int] = (255, 255, 255)
     ):
-        """Display a number using the LED controller."""
-        self.led.display_number(number, color)
-        self.led.show()
+        """Display a number using the LED controller, or on the text layer."""
+        led = self._surface("text")
+        if self.compositor is not None:
+            led.clear()
+        led.display_number(number, color)
+        led.show()
 
     def turn_all_off(self):
         """Turn off all LEDs."""
-        self.led.turn_all_off()
+        if self.compositor is not None:
+            self.compositor.clear()
+            self.compositor.show()
+        else:
+            self.led.turn_all_off()
+
+    def _surface(self, layer: str):
+        """Where an animation draws: its compositor layer, or the whole strip."""
+        if self.compositor is not None:
+            return self.compositor.layer(layer)
+        return self.led
+
+    def _use_brightness(self, brightness: Optional[float], surface=None):
+        """
+        Hand an animation's brightness argument to the LED controller (or
+        the layer it draws on), which applies it once per frame. Animations
+        only deal in relative levels.
+        """
+        if brightness is not None:
+            (surface or self.led).set_brightness(brightness)
+
+    def _frame_clock(self, name: str, fps: Optional[float] = None) -> FrameClock:
+        """Return the started FrameClock for an animation, keeping its counters."""
+        fps = fps or self.frame_rates.get(name, DEFAULT_FRAME_RATES["default"])
+        clock = self.clocks.get(name)
+        if clock is None or clock.fps != fps:
+            clock = FrameClock(fps)
+            self.clocks[name] = clock
+        clock.start()
+        return clock
+
+    def frame_stats(self) -> dict:
+        """Frame, late and dropped counts per animation."""
+        return {name: clock.stats() for name, clock in self.clocks.items()}
+
+    def collect_metrics(self):
+        """
+        Copy the frame clock counters into the metrics registry. Registered
+        as a collector, so the render loops themselves record nothing extra.
+        """
+        for name, stats in self.frame_stats().items():
+            ANIMATION_FRAMES.set(stats["frames"], animation=name)
+            ANIMATION_FRAMES_LATE.set(stats["late"], animation=name)
+            ANIMATION_FRAMES_DROPPED.set(stats["dropped"], animation=name)
 
     def sun_animation_loop(self, end_time: float, brightness: Optional[float] = None):
         """Run sun animation until end_time."""
+        led = self._surface("weather")
         colors = [(255, 255, 0), (255, 255, 50), (255, 255, 20)]
-        ray_pattern = [0, 1, 2] * ((self.num_leds // 3) + 1)
+        kernel = SunKernel(self.num_leds, colors, use_numpy=self.use_numpy)
+        self._use_brightness(brightness, led)
+        clock = self._frame_clock("sun")
 
-        while time.time() < end_time:
-            cycle_time = time.time()
-            cycle_progress = (cycle_time % 2) / 2
-            core_brightness = 0.3 + 0.7 * (
-                0.5 + 0.5 * math.sin(cycle_progress * math.pi)
-            )
-            wave_pos = int(cycle_progress * 3) % 3
-
-            for i in range(self.num_leds):
-                dist_from_center = abs(i - self.num_leds // 2)
-                color_idx = ray_pattern[i]
-                wave_effect = (3 - (dist_from_center + wave_pos) % 3) * 0.3
-                led_brightness = min(1.0, core_brightness + wave_effect)
-                self.led.set_pixel(
-                    i,
-                    colors[color_idx],
-                    brightness * led_brightness if brightness else led_brightness,
-                )
-
-            self.led.show()
-            time.sleep(0.05)
+        while time.monotonic() < end_time:
+            led.set_frame(kernel.render(time.monotonic()))
+            led.show()
+            clock.tick()
 
     def cloud_animation_loop(self, end_time: float, brightness: Optional[float] = None):
         """Run cloud animation until end_time."""
+        led = self._surface("weather")
         cloud_colors = [(180, 180, 180), (220, 220, 220), (255, 255, 255)]
         cloud = [12, 11, 20, 19, 18, 17]
 
-        self.turn_all_off()
-        while time.time() < end_time:
+        self._use_brightness(brightness, led)
+        led.turn_all_off()
+        clock = self._frame_clock("cloud")
+        while time.monotonic() < end_time:
             for i in range(0, 4):
                 for pixel in cloud:
                     led_index = pixel - i
                     if 0 <= led_index < self.num_leds:
-                        self.led.set_pixel(led_index, cloud_colors[0], brightness)
-                self.led.show()
-                time.sleep(0.5)
-                self.turn_all_off()
+                        led.set_pixel(led_index, cloud_colors[0])
+                led.show()
+                clock.tick()
+                led.clear()
+
+    def _grid_cols(self, rows: int) -> int:
+        """Columns needed to lay num_leds out over the given number of rows."""
+        cols = self.num_leds // rows
+        if self.num_leds % rows != 0:
+            cols += 1
+        return cols
+
+    def _precipitation_step(self, led, particles: ParticleSystem, palette, speed: float, drop_chance: float):
+        """Clear the frame, spawn new particles and draw/advance all of them."""
+        led.clear()
+        particles.spawn_random(drop_chance, speed, len(palette))
+        particles.step(led, palette)
 
     def rain_animation_loop(
         self,
@@ -73,43 +184,22 @@ class AnimationRunner:
         drop_chance: float = 0.4,
         brightness: Optional[float] = None,
     ):
-        """Run rain animation until end_time."""
+        """
+        Run rain animation until end_time.
+        drop_chance above 1.0 spawns that many drops per frame on average.
+        """
+        led = self._surface("weather")
         rain_colors = [(0, 128, 255), (0, 0, 255)]
         rows = 4
-        cols = self.num_leds // rows
-        if self.num_leds % rows != 0:
-            cols += 1
-        drops = []
-
-        while time.time() < end_time:
-            self.turn_all_off()
-            if random.random() < drop_chance:
-                new_col = random.randint(0, cols - 1)
-                drop_brightness = (
-                    random.uniform(brightness * 0.6, brightness * 0.9)
-                    if brightness
-                    else random.uniform(0.6, 0.9)
-                )
-                drops.append(
-                    {
-                        "row": 0,
-                        "col": new_col,
-                        "speed": speed,
-                        "color": random.choice(rain_colors),
-                        "brightness": drop_brightness,
-                    }
-                )
-
-            for drop in drops[:]:
-                led_index = drop["col"] + (int(drop["row"]) * cols)
-                if 0 <= led_index < self.num_leds:
-                    self.led.set_pixel(led_index, drop["color"], drop["brightness"])
-                drop["row"] += drop["speed"]
-                if drop["row"] >= rows:
-                    drops.remove(drop)
+        cols = self._grid_cols(rows)
+        particles = ParticleSystem.for_rate(rows, cols, speed, drop_chance)
+        self._use_brightness(brightness, led)
+        clock = self._frame_clock("rain")
 
-            self.led.show()
-            time.sleep(0.1)
+        while time.monotonic() < end_time:
+            self._precipitation_step(led, particles, rain_colors, speed, drop_chance)
+            led.show()
+            clock.tick()
 
     def snow_animation_loop(
         self,
@@ -119,6 +209,7 @@ class AnimationRunner:
         brightness: Optional[float] = None,
     ):
         """Run snow animation until end_time."""
+        led = self._surface("weather")
         snow_colors = [
             (255, 255, 255),  # white (G,R,B)
             (220, 200, 255),  # light blueish (G,R,B)
@@ -126,97 +217,52 @@ class AnimationRunner:
         ]
 
         rows = 4
-        cols = self.num_leds // rows
-        if self.num_leds % rows != 0:
-            cols += 1
-        drops = []
-
-        while time.time() < end_time:
-            self.turn_all_off()
-            if random.random() < drop_chance:
-                new_col = random.randint(0, cols - 1)
-                drop_brightness = (
-                    random.uniform(brightness * 0.6, brightness * 0.9)
-                    if brightness
-                    else random.uniform(0.6, 0.9)
-                )
-                drops.append(
-                    {
-                        "row": 0,
-                        "col": new_col,
-                        "speed": speed,
-                        "color": random.choice(snow_colors),
-                        "brightness": drop_brightness,
-                    }
-                )
+        cols = self._grid_cols(rows)
+        particles = ParticleSystem.for_rate(rows, cols, speed, drop_chance)
+        self._use_brightness(brightness, led)
+        clock = self._frame_clock("snow")
 
-            for drop in drops[:]:
-                led_index = drop["col"] + (int(drop["row"]) * cols)
-                if 0 <= led_index < self.num_leds:
-                    self.led.set_pixel(led_index, drop["color"], drop["brightness"])
-                drop["row"] += drop["speed"]
-                if drop["row"] >= rows:
-                    drops.remove(drop)
-
-            self.led.show()
-            time.sleep(0.1)
+        while time.monotonic() < end_time:
+            self._precipitation_step(led, particles, snow_colors, speed, drop_chance)
+            led.show()
+            clock.tick()
 
     def thunderstorm_animation_loop(
         self, end_time: float, brightness: Optional[float] = None
     ):
         """Run thunderstorm animation until end_time."""
+        led = self._surface("weather")
         rain_colors = [(0, 128, 255), (0, 0, 255), (0, 128, 255)]
         rows = 4
-        cols = self.num_leds // rows
-        drops = []
-        last_lightning = time.time()
-
-        while time.time() < end_time:
-            self.turn_all_off()
-            if random.random() < 0.7:
-                new_col = random.randint(0, cols - 1)
-                drop_brightness = (
-                    random.uniform(brightness * 0.6, brightness * 0.9)
-                    if brightness
-                    else random.uniform(0.6, 0.9)
-                )
-                drops.append(
-                    {
-                        "row": 0,
-                        "col": new_col,
-                        "speed": 1.0,
-                        "color": random.choice(rain_colors),
-                        "brightness": drop_brightness,
-                    }
-                )
+        cols = self._grid_cols(rows)
+        particles = ParticleSystem.for_rate(rows, cols, 1.0, 0.7)
+        last_lightning = time.monotonic()
+        self._use_brightness(brightness, led)
+        clock = self._frame_clock("thunderstorm")
 
-            for drop in drops[:]:
-                led_index = drop["col"] + (int(drop["row"]) * cols)
-                if 0 <= led_index < self.num_leds:
-                    self.led.set_pixel(led_index, drop["color"], drop["brightness"])
-                drop["row"] += drop["speed"]
-                if drop["row"] >= rows:
-                    drops.remove(drop)
+        while time.monotonic() < end_time:
+            self._precipitation_step(led, particles, rain_colors, 1.0, 0.7)
 
-            if time.time() - last_lightning > random.uniform(3.0, 8.0):
-                last_lightning = time.time()
+            if time.monotonic() - last_lightning > random.uniform(3.0, 8.0):
+                last_lightning = time.monotonic()
                 for _ in range(random.randint(1, 3)):
                     flash_color = (255, 255, 200)
-                    self.led.fill(flash_color, brightness)
-                    self.led.show()
+                    led.fill(flash_color)
+                    led.show()
                     time.sleep(0.05)
-                    self.turn_all_off()
+                    led.turn_all_off()
                     time.sleep(0.05)
+                # The flash is a deliberate pause, not a late frame
+                clock.resync()
 
-            self.led.show()
-            time.sleep(0.1)
+            led.show()
+            clock.tick()
 
     def fog_animation_loop(self, end_time: float, brightness: Optional[float] = None):
         """Drifting, gradient fog: multiple moving patches with white/grey gradients."""
+        led = self._surface("weather")
         rows = 4
-        cols = self.num_leds // rows
-        if self.num_leds % rows != 0:
-            cols += 1
+        cols = self._grid_cols(rows)
 
         # Define several fog patches
         num_patches = 3
@@ -239,42 +285,23 @@ class AnimationRunner:
                 }
             )
 
-        min_brightness = brightness * 0.07 if brightness else 0.07
-        max_brightness = brightness * 0.18 if brightness else 0.18
-
-        while time.time() < end_time:
-            led_map = [min_brightness for _ in range(self.num_leds)]
-            color_map = [fog_colors[1] for _ in range(self.num_leds)]
-
-            for patch in patches:
-                patch["pos"] = (patch["pos"] + patch["speed"]) % cols
-                for col in range(cols):
-                    dist = min(abs(col - patch["pos"]), cols - abs(col - patch["pos"]))
-                    if dist < patch["width"] / 2:
-                        t = dist / (patch["width"] / 2)
-                        smooth = 1 - (3 * t * t - 2 * t * t * t)
-                        patch_brightness = (
-                            min_brightness + (max_brightness - min_brightness) * smooth
-                        )
-
-                        row = patch["row"]
-                        if row % 2 == 0:
-                            led_idx = row * cols + (cols - 1 - col)
-                        else:
-                            led_idx = row * cols + col
-
-                        if (
-                            led_idx < self.num_leds
-                            and patch_brightness > led_map[led_idx]
-                        ):
-                            led_map[led_idx] = patch_brightness
-                            color_map[led_idx] = patch["color"]
-
-            for i in range(self.num_leds):
-                self.led.set_pixel(i, color_map[i], led_map[i])
-
-            self.led.show()
-            time.sleep(0.01)
+        self._use_brightness(brightness, led)
+        kernel = FogKernel(
+            self.num_leds,
+            rows,
+            cols,
+            patches,
+            base_color=fog_colors[1],
+            min_brightness=0.07,
+            max_brightness=0.18,
+            use_numpy=self.use_numpy,
+        )
+        clock = self._frame_clock("fog")
+
+        while time.monotonic() < end_time:
+            led.set_frame(kernel.step())
+            led.show()
+            clock.tick()
 
     def default_animation_loop(
         self, end_time: float, brightness: Optional[float] = None
@@ -282,16 +309,61 @@ class AnimationRunner:
         """Run default animation until end_time."""
         colors = [(255, 255, 255), (200, 200, 200), (180, 180, 180)]
         color_index = 0
-        last_change = time.time()
+        last_change = time.monotonic()
+        self._use_brightness(brightness)
+        clock = self._frame_clock("default")
 
-        while time.time() < end_time:
-            if time.time() - last_change > 0.5:
+        while time.monotonic() < end_time:
+            if time.monotonic() - last_change > 0.5:
                 color_index = (color_index + 1) % len(colors)
-                last_change = time.time()
+                last_change = time.monotonic()
+
+            self.led.fill(colors[color_index])
+            self.led.show()
+            clock.tick()
 
-            self.led.fill(colors[color_index], brightness)
+    def _play(self, name: str, frames):
+        """Show each frame drawn by a frame generator for the hold time it yields."""
+        clock = self._frame_clock(name)
+        for hold in frames:
             self.led.show()
-            time.sleep(0.05)
+            clock.hold(hold)
+
+    def _replay(self, name: str, cached: CachedAnimation):
+        """Transmit compiled frames straight from the memory-mapped file."""
+        clock = self._frame_clock(name)
+        for frame, hold in cached:
+            self.led.commit_raw(frame)
+            clock.hold(hold)
+
+    def _play_deterministic(self, name: str, params: dict, frames):
+        """
+        Play an animation whose frames depend only on its parameters.
+        frames(runner) returns the animation's frame generator bound to runner.
+        With a frame cache configured the frames are compiled once per
+        parameter set and replayed from disk on every later run.
+        """
+        if self.frame_cache is not None:
+            use_numpy = self.use_numpy
+            try:
+                cached = self.frame_cache.load_or_compile(
+                    name,
+                    params,
+                    self.led,
+                    lambda led: frames(AnimationRunner(led, use_numpy=use_numpy)),
+                )
+            except (OSError, ValueError) as exc:
+                print(f"[ERROR] Frame cache unavailable for {name}: {exc}")
+            else:
+                with cached:
+                    self._replay(name, cached)
+                return
+        self._play(name, frames(self))
+
+    def _color_wipe_frames(self, color: Tuple[int, int, int], wait: float):
+        for i in range(self.num_leds):
+            self.led.set_pixel(i, color)
+            yield wait
 
     def color_wipe(
         self,
@@ -300,12 +372,25 @@ class AnimationRunner:
         brightness: Optional[float] = None,
     ):
         """Wipe color across display one LED at a time."""
-        for i in range(self.num_leds):
-            self.led.set_pixel(i, color, brightness)
-            self.led.show()
-            time.sleep(wait)
+        self._use_brightness(brightness)
+        self._play_deterministic(
+            "color_wipe",
+            {"color": list(color), "wait": wait},
+            lambda runner: runner._color_wipe_frames(color, wait),
+        )
         self.turn_all_off()
 
+    def _theater_chase_frames(self, color: Tuple[int, int, int], wait: float):
+        spacing = 3
+        cycles = 15
+        kernel = TheaterChaseKernel(self.num_leds, color, spacing, use_numpy=self.use_numpy)
+
+        for phase in range(spacing):
+            frame = kernel.render(phase)
+            for _ in range(cycles):
+                self.led.set_frame(frame)
+                yield wait
+
     def theater_chase(
         self,
         color: Tuple[int, int, int],
@@ -313,48 +398,37 @@ class AnimationRunner:
         brightness: Optional[float] = None,
     ):
         """Improved theater chase: moving dots with configurable spacing."""
-        spacing = 3
-        cycles = 15
-
-        for phase in range(spacing):
-            for _ in range(cycles):
-                for i in range(self.num_leds):
-                    if (i + phase) % spacing == 0:
-                        self.led.set_pixel(i, color, brightness)
-                    else:
-                        self.led.set_pixel(i, (0, 0, 0), brightness)
-                self.led.show()
-                time.sleep(wait)
+        self._use_brightness(brightness)
+        self._play_deterministic(
+            "theater_chase",
+            {"color": list(color), "wait": wait},
+            lambda runner: runner._theater_chase_frames(color, wait),
+        )
 
     def wheel(self, pos: int) -> Tuple[int, int, int]:
         """Generate rainbow colors across 0-255 positions."""
-        if pos < 85:
-            return (int(pos * 3), int(255 - pos * 3), 0)
-        if pos < 170:
-            pos -= 85
-            return (int(255 - pos * 3), 0, int(pos * 3))
-        pos -= 170
-        return (0, int(pos * 3), int(255 - pos * 3))
-
-    def rainbow_cycle(self, wait: float, brightness: float = 1.0):
-        """Draw rainbow that uniformly distributes itself across all pixels."""
+        return render_kernels.wheel(pos)
+
+    def _rainbow_frames(self, wait: float):
+        kernel = RainbowKernel(self.num_leds, use_numpy=self.use_numpy)
         for j in range(256):
-            for i in range(self.num_leds):
-                pixel_index = (i * 256 // self.num_leds) + j
-                color = self.wheel(pixel_index & 255)
-                self.led.set_pixel(i, color, brightness)
-            self.led.show()
-            time.sleep(wait)
+            self.led.set_frame(kernel.render(j))
+            yield wait
+
+    def rainbow_cycle(self, wait: float, brightness: Optional[float] = None):
+        """Draw rainbow that uniformly distributes itself across all pixels."""
+        self._use_brightness(brightness)
+        self._play_deterministic(
+            "rainbow", {"wait": wait}, lambda runner: runner._rainbow_frames(wait)
+        )
         self.turn_all_off()
 
-    def flash(self, brightness: Optional[float] = None):
-        """Flash all LEDs with white and pastel colors."""
+    def _flash_frames(self):
         for _ in range(2):
-            self.led.fill((255, 255, 255), brightness)
-            self.led.show()
-            time.sleep(0.10)
-            self.turn_all_off()
-            time.sleep(0.07)
+            self.led.fill((255, 255, 255))
+            yield 0.10
+            self.led.clear()
+            yield 0.07
 
         pastel_colors = [
             (255, 200, 200),
@@ -386,13 +460,18 @@ class AnimationRunner:
                                 led = indices[tail_idx]
                                 fade = max(0.15, 0.5 - 0.1 * tail)
                                 faded_color = tuple(int(c * fade) for c in color)
-                                self.led.set_pixel(led, faded_color, brightness)
-                        time.sleep(0.03)
+                                self.led.set_pixel(led, faded_color)
+                        yield 0.03
 
                 for i in indices:
                     if i < self.num_leds:
-                        self.led.set_pixel(i, (0, 0, 0), brightness)
-                self.led.show()
+                        self.led.set_pixel(i, (0, 0, 0))
+                yield 0
+
+    def flash(self, brightness: Optional[float] = None):
+        """Flash all LEDs with white and pastel colors."""
+        self._use_brightness(brightness)
+        self._play_deterministic("flash", {}, lambda runner: runner._flash_frames())
 
     def run_weather_animation(
         self,
@@ -402,7 +481,7 @@ class AnimationRunner:
     ):
         """Run appropriate animation based on weather condition."""
         condition = weather.get("weather", [{}])[0].get("main", "").lower()
-        end_time = time.time() + duration_sec
+        end_time = deadline(duration_sec)
 
         if condition == "clear":
             self.sun_animation_loop(end_time, brightness)
@@ -425,7 +504,9 @@ class AnimationRunner:
         else:
             pass
 
-        self.turn_all_off()
+        # Clear without transmitting; the temperature frame replaces it in one show()
+        weather_layer = self._surface("weather")
+        weather_layer.clear()
         temp = weather.get("main", {}).get("temp")
         if temp is not None:
             if temp <= 5:
@@ -435,6 +516,8 @@ class AnimationRunner:
             else:
                 color = (255, 255, 255)  # white for normal
             self.display_number(int(round(temp)), color)
+        else:
+            weather_layer.show()
 
     def run_startup_animation(
         self,
@@ -455,7 +538,7 @@ class AnimationRunner:
             brightness (float, optional): LED brightness.
         """
 
-        end_time = time.time() + duration_sec
+        end_time = deadline(duration_sec)
 
         if animation_type == 0:
             pass
@@ -464,7 +547,7 @@ class AnimationRunner:
         elif animation_type == 2:
             self.theater_chase((0, 0, 255), wait=0.05, brightness=brightness)
         elif animation_type == 3:
-            self.rainbow_cycle(wait=0.01, brightness=brightness or 1.0)
+            self.rainbow_cycle(wait=0.01, brightness=brightness)
         elif animation_type == 4:
             self.flash(brightness=brightness)
         else:
@@ -481,29 +564,37 @@ class AnimationRunner:
             brightness (float): Base brightness level for LEDs. Optional.
 
         This should be used by all activity integrations to display activity.
+        Event days are lit by their activity level alone; only the no-event
+        days follow the brightness argument.
         """
         if not activityCounts:
             return
 
         self.event_color = colors.get("event", (0, 255, 0))
         self.none_color = colors.get("no_events", (30, 30, 30))
+        led = self._surface("calendar")
+        if self.compositor is not None:
+            # The temperature readout ends when the calendar comes back
+            self.compositor.layer("text").clear()
+        # Levels below are absolute, so the pipeline runs at full scale here
+        self._use_brightness(1.0, led)
 
         max_count = max(activityCounts)
         if max_count == 0:
             for day in range(min(self.num_leds, len(activityCounts))):
-                self.led.set_pixel(day, self.none_color, (brightness) * 0.5)
-            self.led.show()
+                led.set_pixel(day, self.none_color, brightness * 0.5)
+            led.show()
             return
 
         updates = []
         for day in range(min(self.num_leds, len(activityCounts))):
             count = activityCounts[day]
             if count > 0:
-                led_brightness = (count / max_count) + 0.05 # Ensure min brightness
+                led_brightness = min(1.0, (count / max_count) + 0.05) # Ensure min brightness
                 updates.append((day, self.event_color, led_brightness))
             else:
                 updates.append((day, self.none_color, brightness * 1))
 
         for day, color, led_brightness in updates:
-            self.led.set_pixel(day, color, led_brightness)
-        self.led.show()
+            led.set_pixel(day, color, led_brightness)
+        led.show()
@@ -0,0 +1,102 @@
+"""
+Color pipeline for the LED strip.
+
+Global brightness, gamma correction and white balance are folded into one
+256-entry lookup table per channel. The tables are rebuilt only when one of
+those settings changes, and are applied to a whole frame at commit time with
+bytearray.translate() so the hot animation loops never do the float math.
+"""
+
+from typing import Tuple
+
+
+def _clamp01(value) -> float:
+    return max(0.0, min(1.0, float(value)))
+
+
+class ColorPipeline:
+    """Per-channel brightness/gamma/white-balance lookup tables."""
+
+    def __init__(
+        self,
+        brightness: float = 1.0,
+        gamma: float = 1.0,
+        white_balance: Tuple[float, float, float] = (1.0, 1.0, 1.0),
+    ):
+        if gamma <= 0:
+            raise ValueError("gamma must be positive")
+        if len(white_balance) != 3:
+            raise ValueError("white_balance must have three channels (R, G, B)")
+
+        self.gamma = float(gamma)
+        self.white_balance = tuple(_clamp01(c) for c in white_balance)
+        self._brightness = None
+        self._table_cache = {}
+        self.tables = None
+        self.set_brightness(brightness)
+
+    @property
+    def brightness(self) -> float:
+        return self._brightness
+
+    def set_brightness(self, brightness: float) -> bool:
+        """Set global brightness. Returns True if the tables were rebuilt."""
+        brightness = _clamp01(brightness)
+        if self.tables is not None and brightness == self._brightness:
+            return False
+        self._brightness = brightness
+        self._rebuild()
+        return True
+
+    def _build_table(self, scale: float) -> bytes:
+        """
+        Build one channel's table. Any non-zero input stays at least 1 so low
+        brightness settings dim the strip instead of switching pixels off.
+        """
+        table = bytearray(256)
+        if scale <= 0:
+            return bytes(table)
+        gamma = self.gamma
+        for v in range(1, 256):
+            out = int(round(255.0 * ((v / 255.0) ** gamma) * scale))
+            table[v] = max(1, min(255, out))
+        return bytes(table)
+
+    def _rebuild(self):
+        """Rebuild the R, G and B tables for the current settings."""
+        # Keep recently used tables so switching between the calendar's
+        # full-scale output and an animation's brightness costs nothing.
+        cache = self._table_cache
+        if len(cache) > 16:
+            cache.clear()
+        tables = []
+        for wb in self.white_balance:
+            scale = self._brightness * wb
+            if scale not in cache:
+                cache[scale] = self._build_table(scale)
+            tables.append(cache[scale])
+        self.tables = tuple(tables)
+        self._uniform = len(set(self.white_balance)) == 1
+
+    @staticmethod
+    def scale(color: Tuple[int, int, int], level: float) -> Tuple[int, int, int]:
+        """Scale a color by a relative 0.0-1.0 level using integer math."""
+        if level >= 1.0:
+            return (int(color[0]), int(color[1]), int(color[2]))
+        k = int(max(0.0, level) * 256)
+        return ((color[0] * k) >> 8, (color[1] * k) >> 8, (color[2] * k) >> 8)
+
+    def apply(self, color: Tuple[int, int, int]) -> Tuple[int, int, int]:
+        """Map a single RGB color through the tables."""
+        r, g, b = self.tables
+        return (r[color[0]], g[color[1]], b[color[2]])
+
+    def render(self, frame) -> bytearray:
+        """Return a new bytearray with the tables applied to a FrameBuffer."""
+        src = frame.buf
+        if self._uniform:
+            return src.translate(self.tables[0])
+        out = bytearray(len(src))
+        for offset, table in zip(frame.offsets, self.tables):
+            out[offset::3] = src[offset::3].translate(table)
+        return out
@@ -0,0 +1,330 @@
+"""
+Layered compositor for the LED display.
+
+The calendar, the weather effects, the temperature digits and
+notifications each draw into their own layer instead of wiping the strip.
+The compositor blends the layers bottom to top into one frame and hands
+it to the LEDController, once per show().
+
+Features:
+- Ordered layers: calendar (bottom), weather, text, notifications (top)
+- Pixels that were not drawn in a layer are transparent, so e.g. rain
+  drops fall over the calendar instead of replacing it
+- Per-layer brightness, opacity and blend mode (normal, add, multiply,
+  screen, lighten), set from the LAYERS config key
+- Only what changed is re-composited: the blend of all layers below the
+  lowest changed layer is cached, and empty or hidden layers are skipped,
+  so an animating overlay costs one blend per frame however many layers
+  sit below it
+- Layers have the LEDController drawing API (set_pixel, set_frame, fill,
+  clear, show, ...), so animations draw into them unchanged
+"""
+
+from typing import List, Optional, Tuple
+
+from led_control.core import metrics
+from led_control.core.color_pipeline import ColorPipeline
+from led_control.core.led_controller import LEDController
+
+LAYER_ORDER = ("calendar", "weather", "text", "notifications")
+
+LAYERS_BLENDED = metrics.counter(
+    "ccal_compositor_layers_blended_total", "Layers blended into a composite frame", ("layer",)
+)
+
+
+def _normal(base, top):
+    return top
+
+
+def _add(base, top):
+    return min(255, base + top)
+
+
+def _multiply(base, top):
+    return base * top // 255
+
+
+def _screen(base, top):
+    return 255 - (255 - base) * (255 - top) // 255
+
+
+def _lighten(base, top):
+    return max(base, top)
+
+
+# Per channel, on 0-255 values; opacity then mixes the result with the base
+BLEND_MODES = {
+    "normal": _normal,
+    "add": _add,
+    "multiply": _multiply,
+    "screen": _screen,
+    "lighten": _lighten,
+}
+
+
+def _check_settings(name, opacity=None, blend=None):
+    """Raise ValueError for an opacity or blend mode a layer cannot use."""
+    if opacity is not None and (isinstance(opacity, bool) or not isinstance(opacity, (int, float))
+                                or not 0.0 <= opacity <= 1.0):
+        raise ValueError(f"Layer '{name}' opacity must be 0.0-1.0, got {opacity!r}")
+    if blend is not None and blend not in BLEND_MODES:
+        raise ValueError(
+            f"Unknown blend mode '{blend}' for layer '{name}', "
+            f"expected one of {', '.join(sorted(BLEND_MODES))}"
+        )
+
+
+class Layer:
+    """
+    One drawing surface of the compositor.
+
+    Colors are RGB tuples. A drawn pixel is opaque within the layer (black
+    included); clear() makes the whole layer transparent again. brightness
+    scales the layer's colors and opacity how much of the blended result
+    covers the layers below.
+    """
+
+    def __init__(self, name: str, num_leds: int, compositor: "Compositor"):
+        self.name = name
+        self.num_leds = num_leds
+        self.compositor = compositor
+        self.pixels = bytearray(num_leds * 3)
+        # 255 where a pixel was drawn, 0 where the layers below show through
+        self.alpha = bytearray(num_leds)
+        self._opaque = b"\xff" * num_leds
+        self._empty = True
+        self.brightness = 1.0
+        self.opacity = 1.0
+        self.blend = "normal"
+        self.visible = True
+        self._table = None
+        self._table_level = None
+        # Bumped on every change, so the compositor knows what to redo
+        self.version = 0
+
+    def _changed(self):
+        self.version += 1
+
+    @property
+    def is_empty(self) -> bool:
+        return self._empty
+
+    def configure(
+        self,
+        opacity: Optional[float] = None,
+        blend: Optional[str] = None,
+        visible: Optional[bool] = None,
+    ):
+        """Change how the layer is blended. Raises ValueError for bad values."""
+        _check_settings(self.name, opacity, blend)
+        if opacity is not None:
+            self.opacity = float(opacity)
+        if blend is not None:
+            self.blend = blend
+        if visible is not None:
+            self.visible = bool(visible)
+        self._changed()
+
+    def set_brightness(self, brightness: float) -> bool:
+        """Set the layer's brightness. Returns False if it did not change."""
+        brightness = max(0.0, min(1.0, float(brightness)))
+        if brightness == self.brightness:
+            return False
+        self.brightness = brightness
+        self._changed()
+        return True
+
+    def set_pixel(
+        self, idx: int, color: Tuple[int, int, int], brightness: Optional[float] = None
+    ):
+        """Draw one pixel, with an optional relative brightness."""
+        if 0 <= idx < self.num_leds:
+            if brightness is not None:
+                color = ColorPipeline.scale(color, brightness)
+            base = idx * 3
+            self.pixels[base:base + 3] = bytes(color[:3])
+            self.alpha[idx] = 255
+            self._empty = False
+            self._changed()
+
+    def set_pixels(
+        self, pixels: List[Tuple[int, int, int]], brightness: Optional[float] = None
+    ):
+        for i, color in enumerate(pixels):
+            if i < self.num_leds:
+                self.set_pixel(i, color, brightness)
+
+    def set_frame(self, frame):
+        """
+        Replace the whole layer with opaque RGB colors, either an (N, 3)
+        uint8 NumPy array or a list of RGB tuples.
+        """
+        if hasattr(frame, "tobytes"):
+            if frame.shape != (self.num_leds, 3):
+                raise ValueError(
+                    f"Frame shape mismatch: expected ({self.num_leds}, 3), got {frame.shape}"
+                )
+            self.pixels[:] = frame.tobytes()
+            self.alpha[:] = self._opaque
+            self._empty = self.num_leds == 0
+            self._changed()
+            return
+        for i, color in enumerate(frame):
+            if i < self.num_leds:
+                self.set_pixel(i, color)
+
+    def fill(self, color: Tuple[int, int, int], brightness: Optional[float] = None):
+        if brightness is not None:
+            color = ColorPipeline.scale(color, brightness)
+        self.pixels[:] = bytes(color[:3]) * self.num_leds
+        self.alpha[:] = self._opaque
+        self._empty = self.num_leds == 0
+        self._changed()
+
+    def clear(self):
+        """Make the layer transparent. Nothing is transmitted."""
+        if self._empty:
+            return
+        self.alpha[:] = bytes(self.num_leds)
+        self._empty = True
+        self._changed()
+
+    # Same digit layout as on the LEDController; it only needs set_pixel
+    display_number = LEDController.display_number
+
+    def show(self):
+        """Composite all layers and send the frame."""
+        return self.compositor.show()
+
+    def turn_all_off(self):
+        """Clear this layer and show the layers below."""
+        self.clear()
+        return self.compositor.show()
+
+    def _scaled_pixels(self):
+        """The layer's pixels with its brightness applied."""
+        if self.brightness >= 1.0:
+            return self.pixels
+        k = int(self.brightness * 256)
+        if self._table_level != k:
+            self._table = bytes((v * k) >> 8 for v in range(256))
+            self._table_level = k
+        return self.pixels.translate(self._table)
+
+    def blend_onto(self, base: bytes) -> bytes:
+        """This layer blended over a composite of the layers below, as RGB bytes."""
+        if self._empty or not self.visible or self.opacity <= 0.0:
+            return base
+        LAYERS_BLENDED.inc(layer=self.name)
+        top = self._scaled_pixels()
+        alpha = self.alpha
+        # Opacity as a 0-256 weight so the mix stays in integer math
+        weight = int(self.opacity * 256)
+
+        if self.blend == "normal" and weight >= 256:
+            # Drawn pixels simply replace the ones below
+            if alpha == self._opaque:
+                return bytes(top)
+            out = bytearray(base)
+            for i in range(self.num_leds):
+                if alpha[i]:
+                    j = i * 3
+                    out[j:j + 3] = top[j:j + 3]
+            return bytes(out)
+
+        mode = BLEND_MODES[self.blend]
+        out = bytearray(base)
+        for i in range(self.num_leds):
+            a = alpha[i]
+            if not a:
+                continue
+            a = a * weight // 255
+            for j in range(i * 3, i * 3 + 3):
+                below = base[j]
+                value = mode(below, top[j])
+                out[j] = value if a >= 256 else below + (((value - below) * a) >> 8)
+        return bytes(out)
+
+class Compositor:
+    """
+    Blends the layers into the LEDController's framebuffer.
+
+    Usage:
+        compositor = Compositor(led_controller)
+        calendar = compositor.layer("calendar")
+        calendar.set_pixel(0, (0, 255, 0))
+        compositor.layer("weather").configure(opacity=0.6, blend="screen")
+        compositor.show()
+    """
+
+    def __init__(self, led_controller: LEDController, layers=LAYER_ORDER):
+        self.led = led_controller
+        self.num_leds = led_controller.num_leds
+        self.layers = [Layer(name, self.num_leds, self) for name in layers]
+        self._by_name = {layer.name: layer for layer in self.layers}
+        self._black = bytes(self.num_leds * 3)
+        # Composite of layers[:i + 1] and the layer versions it was made from
+        self._cache = [None] * len(self.layers)
+        self._cached_versions = [None] * len(self.layers)
+
+    def layer(self, name: str) -> Layer:
+        try:
+            return self._by_name[name]
+        except KeyError:
+            raise ValueError(
+                f"Unknown layer '{name}', expected one of {', '.join(self._by_name)}"
+            ) from None
+
+    def configure(self, settings: dict):
+        """
+        Apply {layer name: {"opacity", "blend", "visible"}}. Layers left out
+        go back to normal blending at full opacity. Raises ValueError for
+        unknown layers or settings; nothing is changed then.
+        """
+        if not isinstance(settings, dict):
+            raise ValueError(f"Layer settings must be an object, got {settings!r}")
+        for name, options in settings.items():
+            self.layer(name)
+            if not isinstance(options, dict) or options.keys() - {"opacity", "blend", "visible"}:
+                raise ValueError(f"Invalid settings for layer '{name}': {options!r}")
+            _check_settings(name, options.get("opacity"), options.get("blend"))
+        for layer in self.layers:
+            options = settings.get(layer.name, {})
+            layer.configure(
+                opacity=options.get("opacity", 1.0),
+                blend=options.get("blend", "normal"),
+                visible=options.get("visible", True),
+            )
+
+    def clear(self):
+        """Make every layer transparent."""
+        for layer in self.layers:
+            layer.clear()
+
+    def compose(self) -> bytes:
+        """
+        The blended frame as RGB bytes, 3 per LED. Layers are only blended
+        again from the lowest one that changed since the last call.
+        """
+        composite = self._black
+        stale = False
+        for i, layer in enumerate(self.layers):
+            if not stale and self._cached_versions[i] == layer.version:
+                composite = self._cache[i]
+                continue
+            stale = True
+            composite = layer.blend_onto(composite)
+            self._cache[i] = composite
+            self._cached_versions[i] = layer.version
+        return composite
+
+    def show(self) -> bool:
+        """
+        Composite and send one frame. Returns False if it is identical to
+        the last frame sent.
+        """
+        self.led.frame.load_rgb_bytes(self.compose())
+        # Layer brightness is already applied; only gamma and white balance remain
+        self.led.set_brightness(1.0)
+        return self.led.commit()
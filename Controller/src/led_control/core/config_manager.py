@@ -1,9 +1,52 @@
+"""
+Configuration file access for the LED control system.
+
+The parsed configuration is published as a read-only snapshot in `conf`.
+A reload builds a complete new snapshot and swaps it in with one assignment,
+so readers always see either the old or the new configuration, never a mix.
+
+The file can be watched for changes (a stat every interval, no read unless
+its mtime, size or inode changed). Subscribers are called with the new
+snapshot and a diff of the keys that changed, so settings edited in the
+WebGUI apply without restarting the service.
+
+Writes are durable and atomic: the new file is written next to the old one,
+fsync'd and renamed over it, under an fcntl lock that other processes can
+take too. With a write delay, updates are applied to the snapshot at once
+and bursts of them are coalesced into one write per delay window; call
+flush() or close() before exiting so the last update is not lost.
+"""
+
 import os
 import json
 import logging
 import tempfile
 import shutil
 import threading
+from contextlib import contextmanager
+from types import MappingProxyType
+
+from led_control.core import metrics
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; fall back to the thread lock
+    fcntl = None
+
+STORAGE_WRITE_SECONDS = metrics.histogram(
+    "ccal_storage_write_seconds", "Time spent writing files and databases", ("target",)
+)
+
+
+def diff_configs(old, new) -> dict:
+    """Changed keys mapped to (old value, new value); missing keys are None."""
+    old = old or {}
+    new = new or {}
+    return {
+        key: (old.get(key), new.get(key))
+        for key in set(old) | set(new)
+        if old.get(key) != new.get(key)
+    }
 
 
 class ConfigManager:
@@ -11,16 +54,32 @@ class ConfigManager:
 
     _lock = threading.Lock()
 
-    def __init__(self, config_file: str):
+    def __init__(self, config_file: str, write_delay: float = 0.0):
         self._config_file = config_file
+        self._write_delay = write_delay
+        self._pending = None
+        self._write_timer = None
+        self._pending_lock = threading.Lock()
         self.conf = None
+        self._signature = None
+        self._subscribers = []
+        self._watch_thread = None
+        self._stop_watching = threading.Event()
         self._load_config()
 
+    def _file_signature(self):
+        try:
+            st = os.stat(self._config_file)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
     def _load_config(self) -> None:
         """Load configuration from a JSON file."""
         if not os.path.isfile(self._config_file):
             raise FileNotFoundError(f"Config file '{self._config_file}' not found.")
         try:
+            signature = self._file_signature()
             with open(self._config_file, "r", encoding="utf-8") as f:
                 config = json.load(f)
                 if not isinstance(config, dict):
@@ -28,7 +87,8 @@ class ConfigManager:
                         f"Config file '{self._config_file}' is not valid JSON."
                     )
                     raise ValueError("Config file is not a valid JSON object.")
-                self.conf = config
+                self.conf = MappingProxyType(config)
+                self._signature = signature
         except json.JSONDecodeError as exc:
             logging.error(f"Failed to parse config file '{self._config_file}': {exc}")
             raise ValueError("Config file is not a valid JSON object.")
@@ -39,23 +99,88 @@ class ConfigManager:
             logging.exception(f"Unexpected error loading config: {exc}")
             raise ValueError("Failed to load config file.")
 
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock on a sidecar file, so writers in other processes wait."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            # The config file itself is replaced on every write, so its inode
+            # can't carry the lock
+            with open(self._config_file + ".lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_file(self, config: dict) -> None:
+        """Write, fsync and rename over the config file; readers never see a partial file."""
+        dir_name = os.path.dirname(self._config_file) or "."
+        with STORAGE_WRITE_SECONDS.time(target="config"), self._file_lock():
+            with tempfile.NamedTemporaryFile(
+                "w", dir=dir_name, delete=False, encoding="utf-8"
+            ) as tf:
+                tempname = tf.name
+                try:
+                    json.dump(config, tf, indent=4)
+                    tf.flush()
+                    os.fsync(tf.fileno())
+                except BaseException:
+                    tf.close()
+                    os.unlink(tempname)
+                    raise
+            try:
+                if os.path.exists(self._config_file):
+                    shutil.copymode(self._config_file, tempname)
+                os.replace(tempname, self._config_file)
+            except BaseException:
+                try:
+                    os.unlink(tempname)
+                except OSError:
+                    pass
+                raise
+            self._signature = self._file_signature()
+        # Make the rename itself durable
+        try:
+            dir_fd = os.open(dir_name, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
     def update_config(self, new_config: dict) -> bool:
-        """Safely save the current configuration to the JSON file and reload it."""
+        """
+        Save a new configuration and publish it as the current snapshot.
+        With a write delay the file is written later, together with any
+        further updates made in the meantime.
+        """
         if not isinstance(new_config, dict):
             logging.error("Provided new_config is not a dictionary.")
             return False
         try:
-            with self._lock:
-                dir_name = os.path.dirname(self._config_file)
-                with tempfile.NamedTemporaryFile(
-                    "w", dir=dir_name, delete=False, encoding="utf-8"
-                ) as tf:
-                    json.dump(new_config, tf, indent=4)
-                    tempname = tf.name
-                shutil.move(tempname, self._config_file)
-            self._load_config()
+            # Round trip so the snapshot matches what a reload would give
+            config = json.loads(json.dumps(new_config))
+        except (TypeError, ValueError) as exc:
+            logging.error(f"Config is not JSON serialisable: {exc}")
+            return False
+
+        if self._write_delay > 0:
+            with self._pending_lock:
+                self._pending = config
+                if self._write_timer is None:
+                    self._write_timer = threading.Timer(self._write_delay, self.flush)
+                    self._write_timer.daemon = True
+                    self._write_timer.start()
+            self._publish(config)
             return True
-        except (OSError, ValueError, json.JSONDecodeError) as exc:
+
+        try:
+            self._write_file(config)
+        except (OSError, ValueError) as exc:
             logging.error(f"Failed to save config file '{self._config_file}': {exc}")
             return False
         except Exception as exc:
@@ -63,3 +188,96 @@ class ConfigManager:
                 f"Unexpected error saving config file '{self._config_file}': {exc}"
             )
             return False
+        self._publish(config)
+        return True
+
+    def flush(self) -> bool:
+        """Write a delayed update now. Returns False if the write failed."""
+        with self._pending_lock:
+            config, self._pending = self._pending, None
+            timer, self._write_timer = self._write_timer, None
+        if timer is not None:
+            timer.cancel()
+        if config is None:
+            return True
+        try:
+            self._write_file(config)
+            return True
+        except Exception as exc:
+            logging.error(f"Failed to save config file '{self._config_file}': {exc}")
+            with self._pending_lock:
+                # Keep it for the next flush unless a newer update replaced it
+                if self._pending is None:
+                    self._pending = config
+            return False
+
+    def close(self) -> None:
+        """Stop watching and write any delayed update."""
+        self.stop_watching()
+        self.flush()
+
+    def subscribe(self, callback):
+        """
+        Call callback(conf, changes) after every reload that changed the
+        configuration. changes maps each changed key to (old, new).
+        Returns a function that removes the subscription.
+        """
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def reload(self) -> dict:
+        """Load the file, swap in the new snapshot and notify subscribers."""
+        old = self.conf
+        self._load_config()
+        return self._notify(old)
+
+    def _publish(self, config: dict) -> dict:
+        old = self.conf
+        self.conf = MappingProxyType(config)
+        return self._notify(old)
+
+    def _notify(self, old) -> dict:
+        changes = diff_configs(old, self.conf)
+        if changes:
+            for callback in list(self._subscribers):
+                try:
+                    callback(self.conf, changes)
+                except Exception as exc:
+                    logging.exception(f"Config subscriber failed: {exc}")
+        return changes
+
+    def check_for_changes(self) -> dict:
+        """
+        Reload the file if its mtime, size or inode changed. Returns the
+        changed keys; a file that fails to load keeps the current snapshot.
+        """
+        if self._file_signature() == self._signature:
+            return {}
+        if self._pending is not None:
+            # Our delayed write replaces the file anyway; last writer wins
+            return {}
+        try:
+            return self.reload()
+        except (OSError, ValueError) as exc:
+            # Often a half-written file; it is retried on the next check
+            logging.error(f"Keeping previous config, reload failed: {exc}")
+            return {}
+
+    def watch(self, interval: float = 1.0) -> None:
+        """Check the file for changes every interval seconds in the background."""
+        if self._watch_thread is not None and self._watch_thread.is_alive():
+            return
+        self._stop_watching.clear()
+
+        def run():
+            while not self._stop_watching.wait(interval):
+                self.check_for_changes()
+
+        self._watch_thread = threading.Thread(target=run, name="config-watch", daemon=True)
+        self._watch_thread.start()
+
+    def stop_watching(self) -> None:
+        self._stop_watching.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join()
+            self._watch_thread = None
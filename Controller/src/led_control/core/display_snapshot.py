@@ -0,0 +1,109 @@
+"""
+Snapshot of what the calendar last displayed.
+
+The IntegrationManager saves each tracker's activity window and colors
+after every display cycle. On boot the calendar is drawn straight from the
+snapshot, and fresh fetches replace it as they complete, so a restart
+shows the same calendar again without waiting on the network.
+
+Features:
+- One small JSON file, replaced atomically so a power cut leaves either the
+  old or the new snapshot
+- Windows are stored today-first with the day they were saved and shifted
+  on load, so a snapshot from yesterday lines up with today
+- A missing, corrupt or outdated snapshot loads as empty; the display then
+  waits for the first fetches as before
+
+The weather reading is not part of the snapshot; WeatherTracker persists
+its own (see weather_tracker.WEATHER_CACHE_PATH).
+"""
+
+import json
+import os
+import tempfile
+from datetime import date
+
+from led_control.core import metrics
+
+DEFAULT_SNAPSHOT_PATH = os.path.expanduser("~/.cache/ccal_snapshot.json")
+SNAPSHOT_VERSION = 1
+
+STORAGE_WRITE_SECONDS = metrics.histogram(
+    "ccal_storage_write_seconds", "Time spent writing files and databases", ("target",)
+)
+
+
+def shift_window(activity, days):
+    """Move a today-first window days forward; the new days are 0."""
+    if days <= 0:
+        return list(activity)
+    return ([0] * min(days, len(activity)) + list(activity))[:len(activity)]
+
+
+class DisplaySnapshot:
+    """
+    Last displayed activity and colors per tracker, in one JSON file.
+
+    Usage:
+        snapshot = DisplaySnapshot()
+        snapshot.save({"github:octocat": {"activity": [3, 0, 1], "colors": colors}})
+        entries = snapshot.load()
+    """
+
+    def __init__(self, path=DEFAULT_SNAPSHOT_PATH):
+        self.path = path
+
+    def load(self, today=None):
+        """
+        {tracker key: {"activity": [...], "colors": {...}}}, shifted to today.
+        Returns {} if there is no usable snapshot.
+        """
+        today = today or date.today()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != SNAPSHOT_VERSION:
+                return {}
+            age = (today - date.fromisoformat(data["day"])).days
+            trackers = data["trackers"]
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+            print(f"[ERROR] Ignoring unreadable display snapshot {self.path}: {exc}")
+            return {}
+        if age < 0 or not isinstance(trackers, dict):
+            # age < 0: saved "in the future", the clock was wrong at some point
+            return {}
+        return {
+            key: {"activity": shift_window(entry["activity"], age), "colors": entry.get("colors")}
+            for key, entry in trackers.items()
+            if isinstance(entry, dict) and isinstance(entry.get("activity"), list)
+        }
+
+    def save(self, trackers, today=None):
+        """Replace the snapshot with {tracker key: {"activity", "colors"}}. Returns success."""
+        data = {
+            "version": SNAPSHOT_VERSION,
+            "day": (today or date.today()).isoformat(),
+            "trackers": trackers,
+        }
+        dir_name = os.path.dirname(os.path.abspath(self.path))
+        tempname = None
+        try:
+            with STORAGE_WRITE_SECONDS.time(target="snapshot"):
+                os.makedirs(dir_name, exist_ok=True)
+                with tempfile.NamedTemporaryFile(
+                    "w", dir=dir_name, delete=False, encoding="utf-8"
+                ) as tf:
+                    tempname = tf.name
+                    json.dump(data, tf)
+                os.replace(tempname, self.path)
+        except (OSError, TypeError, ValueError) as exc:
+            print(f"[ERROR] Failed to save display snapshot to {self.path}: {exc}")
+            if tempname is not None:
+                try:
+                    os.unlink(tempname)
+                except OSError:
+                    pass
+            return False
+        return True
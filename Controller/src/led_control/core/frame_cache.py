@@ -0,0 +1,184 @@
+"""
+Precompiled frame cache for deterministic animations.
+
+Animations such as the color wipe, theater chase, rainbow cycle and flash
+produce the same frames every time for a given set of parameters. The first
+run renders them offscreen into a compact binary file; later runs replay the
+file through mmap, handing zero-copy slices straight to the strip buffer.
+
+File layout (little-endian):
+    header   magic b"CCF1", num_leds (u16), bytes per pixel (u16), frame count (u32)
+    holds    one float32 per frame: seconds to hold the frame after showing it
+    frames   frame count * num_leds * bpp bytes of output in native strip order
+
+The file name encodes a digest of every parameter that affects the output
+(animation arguments, brightness, gamma, white balance, LED count and pixel
+order), so changing any of them compiles a fresh file and evicts the old one.
+"""
+
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+from led_control.core import metrics
+
+DEFAULT_CACHE_DIR = os.path.expanduser("~/.cache/ccal_frames")
+
+_MAGIC = b"CCF1"
+_HEADER = struct.Struct("<4sHHI")
+_VERSION = 1
+
+CACHE_REQUESTS = metrics.counter(
+    "ccal_cache_requests_total", "Cache lookups by cache and result (hit, stale or miss)",
+    ("cache", "result"),
+)
+STORAGE_WRITE_SECONDS = metrics.histogram(
+    "ccal_storage_write_seconds", "Time spent writing files and databases", ("target",)
+)
+
+
+class CachedAnimation:
+    """Read-only, memory-mapped view of a compiled frame file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        try:
+            self._parse()
+        except ValueError:
+            self.close()
+            raise
+
+    def _parse(self):
+        if len(self._mm) < _HEADER.size:
+            raise ValueError(f"Frame file '{self.path}' is truncated.")
+        magic, num_leds, bpp, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"Frame file '{self.path}' has an unknown format.")
+
+        self.num_leds = num_leds
+        self.frame_size = num_leds * bpp
+        self.holds = struct.unpack_from(f"<{count}f", self._mm, _HEADER.size)
+        self._data_offset = _HEADER.size + 4 * count
+        if len(self._mm) != self._data_offset + count * self.frame_size:
+            raise ValueError(f"Frame file '{self.path}' is truncated.")
+        self._view = memoryview(self._mm)
+
+    def __len__(self):
+        return len(self.holds)
+
+    def __iter__(self):
+        """Yield (frame, hold) pairs. Frames are memoryview slices of the file."""
+        size = self.frame_size
+        offset = self._data_offset
+        for hold in self.holds:
+            frame = self._view[offset : offset + size]
+            try:
+                yield frame, hold
+            finally:
+                frame.release()
+            offset += size
+
+    def close(self):
+        view = getattr(self, "_view", None)
+        if view is not None:
+            view.release()
+            self._view = None
+        if not self._mm.closed:
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FrameCache:
+    """Compiles deterministic animations to frame files and replays them."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def path_for(self, name: str, params: dict, led) -> str:
+        """Cache file path for an animation rendered on the given controller."""
+        pipeline = led.pipeline
+        key = {
+            "version": _VERSION,
+            "name": name,
+            "params": params,
+            "num_leds": led.num_leds,
+            "pixel_order": led.frame.pixel_order,
+            "brightness": pipeline.brightness,
+            "gamma": pipeline.gamma,
+            "white_balance": pipeline.white_balance,
+        }
+        digest = hashlib.sha1(
+            json.dumps(key, sort_keys=True, default=list).encode("utf-8")
+        ).hexdigest()[:12]
+        filename = f"{name}-{led.num_leds}-{pipeline.brightness:.3f}-{digest}.frames"
+        return os.path.join(self.cache_dir, filename)
+
+    def load_or_compile(self, name: str, params: dict, led, render) -> CachedAnimation:
+        """
+        Return the cached animation, compiling it first if needed.
+        render(offscreen_led) must return an iterator that draws each frame
+        into offscreen_led and then yields how long to hold it.
+        """
+        path = self.path_for(name, params, led)
+        if os.path.isfile(path):
+            try:
+                cached = CachedAnimation(path)
+                CACHE_REQUESTS.inc(cache="frames", result="hit")
+                return cached
+            except ValueError:
+                os.remove(path)
+        CACHE_REQUESTS.inc(cache="frames", result="miss")
+        with STORAGE_WRITE_SECONDS.time(target="frame_cache"):
+            self.compile(path, led, render)
+        self._evict(name, keep=path)
+        return CachedAnimation(path)
+
+    def compile(self, path: str, led, render):
+        """Render an animation offscreen and write it atomically to path."""
+        offscreen = led.offscreen()
+        holds = []
+        frames = bytearray()
+        for hold in render(offscreen):
+            frames += offscreen.output_frame()
+            holds.append(float(hold or 0.0))
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tf = tempfile.NamedTemporaryFile("wb", dir=os.path.dirname(path), delete=False)
+        try:
+            with tf:
+                tf.write(_HEADER.pack(_MAGIC, offscreen.num_leds, offscreen.frame.bpp, len(holds)))
+                tf.write(struct.pack(f"<{len(holds)}f", *holds))
+                tf.write(frames)
+            os.replace(tf.name, path)
+        except BaseException:
+            # Don't leave half-written temp files behind in the cache dir
+            try:
+                os.unlink(tf.name)
+            except OSError:
+                pass
+            raise
+
+    def _evict(self, name: str, keep: str):
+        """Remove frame files for the same animation compiled with old parameters."""
+        for stale in glob.glob(os.path.join(self.cache_dir, f"{name}-*.frames")):
+            if stale != keep:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
@@ -0,0 +1,94 @@
+"""
+Deadline-based frame scheduler for animations.
+
+Frames are paced against absolute deadlines on time.monotonic(), so render
+cost does not add to the frame period and wall-clock adjustments (NTP, RTC
+sync at boot) do not disturb the animation. When a frame finishes after its
+deadline the clock counts it as late; whole frame periods that were missed
+are skipped and counted as dropped instead of being rendered back-to-back.
+"""
+
+import time
+
+
+class FrameClock:
+    """Paces a render loop at a fixed target frame rate."""
+
+    def __init__(self, fps: float):
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+        self.fps = float(fps)
+        self.frame_time = 1.0 / self.fps
+        self.frames = 0
+        self.late = 0
+        self.dropped = 0
+        self._prev = None
+        self._next = None
+
+    def start(self) -> float:
+        """Anchor the first deadline one frame period from now."""
+        now = time.monotonic()
+        self._prev = now
+        self._next = now + self.frame_time
+        return now
+
+    def tick(self) -> int:
+        """
+        Wait until the next frame deadline.
+        Returns the number of frames dropped to catch up (0 if on time).
+        """
+        if self._next is None:
+            self.start()
+        self.frames += 1
+        now = time.monotonic()
+        if now < self._next:
+            time.sleep(self._next - now)
+            self._prev = self._next
+            self._next += self.frame_time
+            return 0
+
+        self.late += 1
+        missed = int((now - self._next) // self.frame_time)
+        self.dropped += missed
+        self._prev = self._next + missed * self.frame_time
+        self._next = self._prev + self.frame_time
+        return missed
+
+    def hold(self, seconds: float):
+        """
+        Wait until seconds after the previous deadline, for sequences where
+        every frame has its own hold time. A late frame restarts the schedule
+        from now rather than rushing the frames that follow.
+        """
+        if self._next is None:
+            self.start()
+        self.frames += 1
+        if seconds <= 0:
+            return
+        target = self._prev + seconds
+        now = time.monotonic()
+        if now < target:
+            time.sleep(target - now)
+            self._prev = target
+        else:
+            self.late += 1
+            self._prev = now
+        self._next = self._prev + self.frame_time
+
+    def resync(self):
+        """Restart the deadline sequence, e.g. after a deliberate pause."""
+        self.start()
+
+    def stats(self) -> dict:
+        """Frame counters since the clock was created."""
+        return {
+            "fps": self.fps,
+            "frames": self.frames,
+            "late": self.late,
+            "dropped": self.dropped,
+        }
+
+
+def deadline(duration_sec: float) -> float:
+    """Monotonic end time for an animation that should run duration_sec."""
+    return time.monotonic() + duration_sec
@@ -0,0 +1,97 @@
+"""
+In-memory framebuffer for the LED strip.
+
+Animations draw into a FrameBuffer and the LEDController commits the whole
+frame to the hardware in one bulk copy. Pixels are stored in the strip's
+native byte order (GRB for our WS2812 parts) so no per-pixel conversion is
+needed when the frame is handed to the pixel buffer.
+"""
+
+from typing import Tuple
+
+
+class FrameBuffer:
+    """Fixed-size bytearray frame in the strip's native byte order."""
+
+    def __init__(self, num_leds: int, pixel_order: str = "GRB"):
+        if num_leds < 0:
+            raise ValueError("num_leds must be non-negative")
+        pixel_order = pixel_order.upper()
+        if sorted(pixel_order) != ["B", "G", "R"]:
+            raise ValueError(f"Unsupported pixel order '{pixel_order}'")
+
+        self.num_leds = num_leds
+        self.pixel_order = pixel_order
+        self.bpp = 3
+        self._r = pixel_order.index("R")
+        self._g = pixel_order.index("G")
+        self._b = pixel_order.index("B")
+        self.offsets = (self._r, self._g, self._b)
+        # RGB channel stored at each native byte position, for array frames
+        self._channels = ["RGB".index(c) for c in pixel_order]
+        self.buf = bytearray(num_leds * self.bpp)
+        self._blank = bytes(len(self.buf))
+
+    def __len__(self):
+        return self.num_leds
+
+    def set_pixel(self, idx: int, color: Tuple[int, int, int]):
+        """Write an RGB color to a single pixel. Out of range indices are ignored."""
+        if 0 <= idx < self.num_leds:
+            base = idx * 3
+            buf = self.buf
+            buf[base + self._r] = color[0]
+            buf[base + self._g] = color[1]
+            buf[base + self._b] = color[2]
+
+    def get_pixel(self, idx: int) -> Tuple[int, int, int]:
+        """Read a pixel back as an RGB tuple."""
+        base = idx * 3
+        buf = self.buf
+        return (buf[base + self._r], buf[base + self._g], buf[base + self._b])
+
+    def _native(self, color: Tuple[int, int, int]) -> bytes:
+        """Convert an RGB tuple into the strip's native byte order."""
+        native = [0, 0, 0]
+        native[self._r] = color[0]
+        native[self._g] = color[1]
+        native[self._b] = color[2]
+        return bytes(native)
+
+    def fill(self, color: Tuple[int, int, int]):
+        """Fill every pixel with one RGB color."""
+        self.buf[:] = self._native(color) * self.num_leds
+
+    def clear(self):
+        """Blank the frame. Nothing is transmitted."""
+        self.buf[:] = self._blank
+
+    def load(self, data):
+        """Replace the whole frame from a bytes-like object in native order."""
+        if len(data) != len(self.buf):
+            raise ValueError(
+                f"Frame size mismatch: expected {len(self.buf)} bytes, got {len(data)}"
+            )
+        self.buf[:] = data
+
+    def load_rgb(self, frame):
+        """Replace the whole frame from an (N, 3) uint8 RGB NumPy array."""
+        if frame.shape != (self.num_leds, 3):
+            raise ValueError(
+                f"Frame shape mismatch: expected ({self.num_leds}, 3), got {frame.shape}"
+            )
+        self.buf[:] = frame[:, self._channels].tobytes()
+
+    def load_rgb_bytes(self, data):
+        """Replace the whole frame from RGB bytes, 3 per pixel."""
+        if len(data) != len(self.buf):
+            raise ValueError(
+                f"Frame size mismatch: expected {len(self.buf)} bytes, got {len(data)}"
+            )
+        buf = self.buf
+        for pos, channel in enumerate(self._channels):
+            buf[pos::3] = data[channel::3]
+
+    def is_blank(self) -> bool:
+        """Return True if every pixel is off."""
+        return self.buf == self._blank
@@ -4,63 +4,341 @@ Integration manager for handling all external service integrations.
 Centralizes the logic for fetching and displaying data from GitHub, Strava,
 Weather, and other integrations. Uses OOP so each integration is encapsulated
 in its own class with a common interface.
+
+Tracker fetches run in a bounded thread pool. Each cycle refreshes every
+tracker in parallel and waits at most for the slowest per-tracker deadline;
+the display rotation only reads the latest completed results, so a slow or
+retrying service never holds up the others.
+
+With an activity store, trackers record each successful fetch in it and the
+display reads the window it shows back with one range query, so a tracker
+whose fetch failed, or has not finished since a restart, still shows its
+history.
+
+With a display snapshot, the windows and colors shown are saved after
+every calendar rotation. After a restart the calendar is drawn from the
+snapshot right away (show_snapshot), and the first cycle does not wait on
+the fetches of restored trackers: their snapshot stays on display until
+a fresh fetch replaces it.
+
+Display settings can be changed while a cycle runs (apply_settings); the
+pauses between display steps wake up within a second and redraw the current
+tracker with the new settings.
 """
 
+import copy
+import math
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from led_control.core import metrics
+
+FETCH_SECONDS = metrics.histogram(
+    "ccal_tracker_fetch_seconds", "Tracker fetch latency", ("tracker",)
+)
+FETCHES = metrics.counter(
+    "ccal_tracker_fetches_total", "Tracker fetches by outcome (ok or error)", ("tracker", "outcome")
+)
+DEADLINE_MISSES = metrics.counter(
+    "ccal_tracker_deadline_misses_total", "Fetches still running at their deadline", ("tracker",)
+)
+CYCLE_SECONDS = metrics.histogram(
+    "ccal_cycle_seconds", "Duration of a full integration cycle, display pauses included",
+    buckets=(5, 15, 30, 60, 90, 120, 180, 300, 600, 1200),
+)
 
 
 class IntegrationManager:
     """Manages all external service integrations and their display logic."""
-    
-    def __init__(self, animation_runner, trackers=[], weather_tracker=[]):
+
+    def __init__(self, animation_runner, trackers=[], weather_tracker=[],
+                 max_workers=4, fetch_timeout=30, activity_store=None, window_days=28,
+                 snapshot=None):
         self.animation_runner = animation_runner
         self.trackers = trackers
         self.weather_tracker = weather_tracker
         self.iterations_per_cycle = 2
-        
-    def update_calendar_display(self, brightness=0.8, poll_time=90):
+        # max_workers=0 fetches serially on the display thread
+        self.max_workers = max_workers
+        self.fetch_timeout = fetch_timeout
+        self.activity_store = activity_store
+        self.window_days = window_days
+        self._executor = None
+        self._pending = {}
+        self._latest = {}
+        self._lock = threading.Lock()
+        self.snapshot = snapshot
+        # Trackers showing snapshot data that no fetch has replaced yet
+        self._restored = set()
+        self._snapshot_colors = {}
+        self._saved = None
+        self.brightness = 0.8
+        self.poll_time = 90
+        self.weather_display_time = 4
+        self._settings_version = 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="tracker-fetch"
+            )
+        return self._executor
+
+    def _tracker_timeout(self, tracker):
+        """Per-tracker fetch deadline in seconds; trackers may set fetch_timeout."""
+        return getattr(tracker, "fetch_timeout", None) or self.fetch_timeout
+
+    def _fetch(self, tracker):
+        """Call tracker.get_activity, recording its latency and outcome."""
+        name = tracker.__class__.__name__
+        try:
+            with FETCH_SECONDS.time(tracker=name):
+                activity = tracker.get_activity()
+        except Exception:
+            FETCHES.inc(tracker=name, outcome="error")
+            raise
+        FETCHES.inc(tracker=name, outcome="ok")
+        return activity
+
+    def _store_result(self, tracker, future):
+        with self._lock:
+            if self._pending.get(tracker) is future:
+                del self._pending[tracker]
+        try:
+            activity = future.result()
+        except Exception as exc:
+            print(f"[ERROR] Failed to fetch data from {tracker.__class__.__name__}: {exc}")
+            return
+        with self._lock:
+            self._latest[tracker] = activity
+            self._restored.discard(tracker)
+
+    def refresh_all(self):
+        """
+        Refresh every tracker in parallel and wait until each one completes or
+        hits its deadline. The wait, and so the delay before the display
+        rotation starts, is bounded by the slowest per-tracker deadline
+        (fetch_timeout, 30 s by default), not the sum of all fetches. Fetches
+        that miss the deadline keep running and their result is picked up by
+        a later display rotation. Trackers still showing restored snapshot
+        data are not waited for.
+        """
+        executor = self._get_executor()
+        started = time.monotonic()
+        waits = []
+        for tracker in self.trackers:
+            submitted = False
+            with self._lock:
+                future = self._pending.get(tracker)
+                if future is None:
+                    future = executor.submit(self._fetch, tracker)
+                    self._pending[tracker] = future
+                    submitted = True
+            # Registered outside the lock: a fetch that has already finished
+            # runs the callback immediately on this thread.
+            if submitted:
+                future.add_done_callback(lambda f, t=tracker: self._store_result(t, f))
+            with self._lock:
+                if tracker in self._restored:
+                    continue
+            waits.append((started + self._tracker_timeout(tracker), tracker, future))
+
+        for deadline, tracker, future in sorted(waits, key=lambda w: w[0]):
+            remaining = max(0, deadline - time.monotonic())
+            try:
+                activity = future.result(timeout=remaining)
+            except Exception:
+                # Errors are reported by _store_result; timeouts just move on
+                if not future.done():
+                    DEADLINE_MISSES.inc(tracker=tracker.__class__.__name__)
+                    print(f"[WARN] {tracker.__class__.__name__} fetch exceeded its deadline")
+                continue
+            # result() can return before the done callback has stored it
+            with self._lock:
+                self._latest[tracker] = activity
+                self._restored.discard(tracker)
+
+    def latest_activity(self, tracker):
+        """The most recent completed activity for a tracker, or None."""
+        with self._lock:
+            return self._latest.get(tracker)
+
+    def display_activity(self, tracker):
+        """The activity window to show for a tracker."""
+        activity = None
+        if self.max_workers:
+            activity = self.latest_activity(tracker)
+        else:
+            try:
+                activity = self._fetch(tracker)
+                with self._lock:
+                    self._latest[tracker] = activity
+                    self._restored.discard(tracker)
+            except Exception as exc:
+                print(f"[ERROR] Failed to fetch data from {tracker.__class__.__name__}: {exc}")
+                activity = self.latest_activity(tracker)
+        return self._with_history(tracker, activity)
+
+    def _with_history(self, tracker, activity):
+        """The stored window for a tracker, falling back to activity."""
+        if self.activity_store is not None and hasattr(tracker, "store_key"):
+            stored = self.activity_store.window(tracker.store_key(), self.window_days)
+            if stored is not None:
+                return stored
+        return activity
+
+    def _snapshot_key(self, tracker):
+        if hasattr(tracker, "store_key"):
+            return tracker.store_key()
+        return tracker.__class__.__name__
+
+    def restore_snapshot(self):
+        """
+        Seed the latest activity of every tracker from the snapshot.
+        Returns how many trackers were restored.
+        """
+        if self.snapshot is None:
+            return 0
+        entries = self.snapshot.load()
+        with self._lock:
+            for tracker in self.trackers:
+                entry = entries.get(self._snapshot_key(tracker))
+                if entry is None or tracker in self._latest:
+                    continue
+                self._latest[tracker] = entry["activity"]
+                self._snapshot_colors[tracker] = entry["colors"]
+                self._restored.add(tracker)
+            return len(self._restored)
+
+    def show_snapshot(self):
+        """
+        Draw the first restored tracker with the colors it was saved with.
+        Returns False if nothing was restored.
+        """
+        for tracker in self.trackers:
+            with self._lock:
+                if tracker not in self._restored:
+                    continue
+                activity = self._latest[tracker]
+                colors = self._snapshot_colors.get(tracker) or tracker.get_colors()
+            if activity and sum(activity) > 0:
+                self.animation_runner.update_calendar(
+                    activity, brightness=self.brightness, colors=colors
+                )
+                return True
+        return False
+
+    def save_snapshot(self):
+        """Save what the calendar shows now, if it changed since the last save."""
+        if self.snapshot is None:
+            return False
+        trackers = {}
+        for tracker in self.trackers:
+            activity = self._with_history(tracker, self.latest_activity(tracker))
+            if activity:
+                trackers[self._snapshot_key(tracker)] = {
+                    "activity": list(activity),
+                    # Copied: colors are updated in place on config reloads
+                    "colors": copy.deepcopy(tracker.get_colors()),
+                }
+        if not trackers or trackers == self._saved:
+            return False
+        if self.snapshot.save(trackers):
+            self._saved = trackers
+            return True
+        return False
+
+    def apply_settings(self, **settings):
+        """
+        Change brightness, poll_time or weather_display_time, including for
+        the cycle that is currently running.
+        """
+        for name, value in settings.items():
+            if name not in ("brightness", "poll_time", "weather_display_time"):
+                raise ValueError(f"Unknown display setting '{name}'")
+            setattr(self, name, value)
+        self._settings_version += 1
+
+    def pause(self, seconds):
+        """
+        Sleep for seconds, in steps of at most one second. Returns True early
+        if the display settings changed meanwhile.
+        """
+        version = self._settings_version
+        steps = max(1, math.ceil(seconds))
+        for _ in range(steps):
+            time.sleep(seconds / steps)
+            if self._settings_version != version:
+                return True
+        return False
+
+    def update_calendar_display(self, brightness=None, poll_time=None):
         """
         Update the calendar display with activity data.
         """
-        sleepDuration = (poll_time / (len(self.trackers))) / self.iterations_per_cycle
+        if not self.trackers:
+            return False
+        if brightness is not None:
+            self.brightness = brightness
+        if poll_time is not None:
+            self.poll_time = poll_time
+
+        if self.max_workers:
+            self.refresh_all()
 
         for _ in range(self.iterations_per_cycle):
             for tracker in self.trackers:
-                try:
-                    activity = tracker.get_activity()
-                    if sum(activity) > 0:
-                        self.animation_runner.update_calendar(
-                            activity, brightness=brightness, colors=tracker.get_colors()
-                        )
-                    time.sleep(sleepDuration)
-                except Exception as exc:
-                    print(f"[ERROR] Failed to fetch data from {tracker.__class__.__name__}: {exc}")                
+                redraw = True
+                while redraw:
+                    try:
+                        activity = self.display_activity(tracker)
+                        if activity and sum(activity) > 0:
+                            self.animation_runner.update_calendar(
+                                activity, brightness=self.brightness, colors=tracker.get_colors()
+                            )
+                    except Exception as exc:
+                        print(f"[ERROR] Failed to fetch data from {tracker.__class__.__name__}: {exc}")
+                    sleepDuration = (self.poll_time / len(self.trackers)) / self.iterations_per_cycle
+                    # Redraw right away with the new settings if they change
+                    redraw = self.pause(sleepDuration)
 
+        self.save_snapshot()
         return True
-    
-    def handle_weather_animation(self, brightness=0.8):
+
+    def handle_weather_animation(self, brightness=None):
         """Handle weather animation display."""
         if not self.weather_tracker:
             return False
-            
+        if brightness is not None:
+            self.brightness = brightness
+
         try:
             weather = self.weather_tracker.get_weather()
             if weather is not None:
                 self.animation_runner.run_weather_animation(
-                    weather, brightness=brightness
+                    weather, brightness=self.brightness
                 )
                 return True
         except Exception as exc:
             print(f"[ERROR] Failed to fetch weather: {exc}")
-        
+
         return False
-    
-    def run_integration_cycle(self, brightness=0.8, poll_time=90, weather_display_time=4):
+
+    def run_integration_cycle(self, brightness=None, poll_time=None, weather_display_time=None):
         """
         Run a complete cycle of all integrations.
         """
-        
-        self.update_calendar_display(brightness=brightness, poll_time=poll_time)
-        self.handle_weather_animation(brightness=brightness)
-        time.sleep(weather_display_time)
+        if weather_display_time is not None:
+            self.weather_display_time = weather_display_time
+
+        with CYCLE_SECONDS.time():
+            self.update_calendar_display(brightness=brightness, poll_time=poll_time)
+            self.handle_weather_animation()
+            self.pause(self.weather_display_time)
 
+    def close(self):
+        """Stop the fetch pool without waiting for in-flight requests."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
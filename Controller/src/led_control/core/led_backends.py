@@ -0,0 +1,195 @@
+"""
+Output backends for the LEDController.
+
+The controller renders every frame into a native-order bytearray and hands
+it to a backend, which decides where the frame goes.
+
+Features:
+- NeoPixelBackend drives the real strip; board and neopixel are only
+  imported when the first frame is written, so the package imports and runs
+  on machines without the Raspberry Pi libraries
+- MemoryBackend keeps the written frames, for tests and benchmarks
+- TerminalBackend draws the calendar grid with 24-bit colour escapes
+- The backend is chosen by name, from the LED_BACKEND config key or the
+  CCAL_LED_BACKEND environment variable (which wins)
+"""
+
+import os
+import sys
+from collections import deque
+
+LED_BACKEND_ENV = "CCAL_LED_BACKEND"
+DEFAULT_BACKEND = "neopixel"
+
+
+def _rgb_offsets(pixel_order):
+    return tuple(pixel_order.index(c) for c in "RGB")
+
+
+class LEDBackend:
+    """
+    Receives finished frames from the LEDController.
+
+    Frames are bytes-like, 3 bytes per LED in pixel_order, with the color
+    pipeline already applied.
+    """
+
+    pixel_order = "GRB"
+
+    def __init__(self, num_leds: int):
+        self.num_leds = num_leds
+
+    def write(self, frame) -> None:
+        """Transmit one frame."""
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def close(self) -> None:
+        """Release the output. The controller calls this from cleanup()."""
+
+    def pixels(self, frame):
+        """A native-order frame as a list of RGB tuples."""
+        r, g, b = _rgb_offsets(self.pixel_order)
+        return [
+            (frame[i + r], frame[i + g], frame[i + b])
+            for i in range(0, len(frame), 3)
+        ]
+
+
+class NeoPixelBackend(LEDBackend):
+    """WS2812 strip on a Raspberry Pi GPIO pin."""
+
+    def __init__(self, num_leds: int, pin_num: int = 18, strip=None):
+        super().__init__(num_leds)
+        self.pin_num = pin_num
+        self._strip = strip
+
+    @property
+    def strip(self):
+        """The neopixel.NeoPixel object, created on first use."""
+        if self._strip is None:
+            self._strip = self._open_strip()
+        return self._strip
+
+    def _open_strip(self):
+        try:
+            import board
+            import neopixel
+        except ImportError as exc:
+            raise ImportError(
+                "The neopixel LED backend needs the board and neopixel modules "
+                f"(Raspberry Pi only); set LED_BACKEND or {LED_BACKEND_ENV} to "
+                "'memory' or 'terminal' elsewhere"
+            ) from exc
+        if not -1 < self.pin_num < 28:
+            raise ValueError(f"Invalid GPIO pin {self.pin_num}")
+        return neopixel.NeoPixel(
+            getattr(board, f"D{self.pin_num}"),
+            self.num_leds,
+            brightness=1.0,
+            auto_write=False,
+            pixel_order=neopixel.GRB,
+        )
+
+    def write(self, frame) -> None:
+        """Copy a native-order frame into the NeoPixel pixel buffer and show it."""
+        strip = self.strip
+        # With brightness=1.0 the pixelbuf keeps a single output buffer in
+        # the strip's byte order, so the frame can be copied in one slice.
+        # These are private attributes of adafruit_pixelbuf, checked against
+        # adafruit-circuitpython-pixelbuf 2.0.x; anything else falls back to
+        # per-pixel assignment.
+        target = getattr(strip, "_post_brightness_buffer", None)
+        if target is not None and getattr(strip, "_pre_brightness_buffer", None) is None:
+            offset = getattr(strip, "_offset", 0)
+            target[offset : offset + len(frame)] = frame
+        else:
+            for i, color in enumerate(self.pixels(frame)):
+                strip[i] = color
+        strip.show()
+
+
+class MemoryBackend(LEDBackend):
+    """
+    Keeps written frames in memory; nothing is displayed.
+
+    frames holds the last max_frames frames (None keeps all of them) and
+    frame_count counts every write, so benchmarks can run for a long time
+    without growing memory.
+    """
+
+    def __init__(self, num_leds: int, max_frames=1000, pixel_order: str = "GRB"):
+        super().__init__(num_leds)
+        self.pixel_order = pixel_order
+        self.frames = deque(maxlen=max_frames)
+        self.frame_count = 0
+
+    def write(self, frame) -> None:
+        self.frames.append(bytes(frame))
+        self.frame_count += 1
+
+    @property
+    def last_frame(self):
+        return self.frames[-1] if self.frames else None
+
+
+class TerminalBackend(LEDBackend):
+    """
+    Draws each frame as a grid of coloured blocks, columns LEDs per row
+    (7 for the calendar: one row per week). On a terminal the grid is
+    redrawn in place.
+    """
+
+    def __init__(self, num_leds: int, stream=None, columns: int = 7, pixel_order: str = "GRB"):
+        super().__init__(num_leds)
+        self.pixel_order = pixel_order
+        self.stream = stream or sys.stdout
+        self.columns = columns
+        self._drawn_rows = 0
+
+    def render(self, frame) -> str:
+        """The escape sequences for one frame, one line per row."""
+        cells = [f"\x1b[38;2;{r};{g};{b}m██" for r, g, b in self.pixels(frame)]
+        rows = [
+            "".join(cells[i : i + self.columns]) + "\x1b[0m"
+            for i in range(0, len(cells), self.columns)
+        ]
+        return "\n".join(rows) + "\n"
+
+    def write(self, frame) -> None:
+        out = self.render(frame)
+        if self._drawn_rows and self.stream.isatty():
+            # Move back up over the previous frame
+            out = f"\x1b[{self._drawn_rows}F" + out
+        self.stream.write(out)
+        self.stream.flush()
+        self._drawn_rows = out.count("\n")
+
+    def close(self) -> None:
+        self.stream.write("\x1b[0m")
+        self.stream.flush()
+
+
+BACKENDS = {
+    "neopixel": NeoPixelBackend,
+    "memory": MemoryBackend,
+    "terminal": TerminalBackend,
+}
+
+
+def backend_name(configured=None) -> str:
+    """The backend to use: the environment variable, then the config, then neopixel."""
+    name = os.environ.get(LED_BACKEND_ENV) or configured or DEFAULT_BACKEND
+    return name.strip().lower()
+
+
+def create_backend(name, num_leds: int, pin_num: int = 18) -> LEDBackend:
+    """Build a backend by name. Raises ValueError for unknown names."""
+    try:
+        backend_cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown LED backend '{name}', expected one of {', '.join(sorted(BACKENDS))}"
+        ) from None
+    if backend_cls is NeoPixelBackend:
+        return NeoPixelBackend(num_leds, pin_num=pin_num)
+    return backend_cls(num_leds)
@@ -1,25 +1,61 @@
-import board
-import neopixel
 from typing import List, Tuple, Optional
+from led_control.core.framebuffer import FrameBuffer
+from led_control.core.color_pipeline import ColorPipeline
+from led_control.core.led_backends import LEDBackend, MemoryBackend, NeoPixelBackend
+from led_control.core import metrics
+
+SHOW_SECONDS = metrics.histogram(
+    "ccal_show_seconds", "Time to hand a frame to the LED backend",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+FRAMES_COMMITTED = metrics.counter(
+    "ccal_frames_committed_total", "Frames committed, by whether they were sent or unchanged",
+    ("result",),
+)
 
 
 class LEDController:
-    """Low-level hardware interface for NeoPixel LEDs."""
+    """
+    Low-level interface for the LED strip.
+
+    Drawing calls write into an in-memory FrameBuffer. Nothing reaches the
+    strip until show()/commit(), which copies the whole frame into the pixel
+    buffer at once and skips the transfer if the frame has not changed.
+
+    Frames go to an LEDBackend: the NeoPixel strip by default, or an
+    in-memory or terminal backend off the Pi (see led_backends). strip= wraps
+    an existing NeoPixel-like object.
 
-    def __init__(self, pin_num: int = 18, num_leds: int = 28, brightness: float = 1.0):
+    Global brightness, gamma and white balance are applied once per frame by
+    the ColorPipeline. The optional per-call brightness on set_pixel()/fill()
+    is a relative level on top of the global brightness.
+    """
+
+    def __init__(
+        self,
+        pin_num: int = 18,
+        num_leds: int = 28,
+        brightness: float = 1.0,
+        gamma: float = 1.0,
+        white_balance: Tuple[float, float, float] = (1.0, 1.0, 1.0),
+        strip=None,
+        backend: Optional[LEDBackend] = None,
+    ):
         self.num_leds = num_leds
-        self.brightness = max(0.0, min(1.0, float(brightness)))
+        self.pin_num = pin_num
+        self.pipeline = ColorPipeline(brightness, gamma=gamma, white_balance=white_balance)
 
-        if -1 < pin_num < 28:
-            gpio_pin = getattr(board, f"D{pin_num}")
+        if backend is None:
+            # The strip itself is only opened when the first frame is sent
+            backend = NeoPixelBackend(num_leds, pin_num=pin_num, strip=strip)
+        self.backend = backend
+        self.frame = FrameBuffer(self.num_leds, pixel_order=backend.pixel_order)
+        self._last_frame = None
 
-        self.strip = neopixel.NeoPixel(
-            gpio_pin,
-            self.num_leds,
-            brightness=1.0,
-            auto_write=False,
-            pixel_order=neopixel.GRB,
-        )
+    @property
+    def strip(self):
+        """The NeoPixel strip object, for backends that have one."""
+        return getattr(self.backend, "strip", None)
 
     def display_number(self, number, color=(255, 255, 255)):
         """Display a number using predefined digit patterns."""
@@ -56,14 +92,36 @@ class LEDController:
             if 0 <= idx2 < self.num_leds:
                 self.set_pixel(idx2, color)
 
+    @property
+    def brightness(self) -> float:
+        return self.pipeline.brightness
+
+    def set_brightness(self, brightness: float) -> bool:
+        """Set the global brightness. Tables are only rebuilt if it changed."""
+        return self.pipeline.set_brightness(brightness)
+
+    def set_color_correction(
+        self, gamma: float, white_balance: Tuple[float, float, float]
+    ) -> bool:
+        """
+        Replace the gamma and white balance and re-send the current frame.
+        Returns False if neither changed.
+        """
+        current = self.pipeline
+        new = ColorPipeline(current.brightness, gamma=gamma, white_balance=white_balance)
+        if new.gamma == current.gamma and new.white_balance == current.white_balance:
+            return False
+        self.pipeline = new
+        self.commit()
+        return True
+
     def _apply_brightness(
         self, color: Tuple[int, int, int], brightness: Optional[float] = None
     ) -> Tuple[int, int, int]:
-        """Apply brightness scaling to a color tuple."""
+        """Apply a relative brightness level to a color tuple."""
         if brightness is None:
-            brightness = self.brightness
-        brightness = max(0.0, min(1.0, float(brightness)))
-        return tuple(int(c * brightness) for c in color)
+            return color
+        return self.pipeline.scale(color, brightness)
 
     def set_pixel(
         self, idx: int, color: Tuple[int, int, int], brightness: Optional[float] = None
@@ -71,7 +129,7 @@ class LEDController:
         """Set a single LED to a color with optional brightness."""
         if 0 <= idx < self.num_leds:
             color = self._apply_brightness(color, brightness)
-            self.strip[idx] = color
+            self.frame.set_pixel(idx, color)
 
     def set_pixels(
         self, pixels: List[Tuple[int, int, int]], brightness: Optional[float] = None
@@ -81,20 +139,81 @@ class LEDController:
             if i < self.num_leds:
                 self.set_pixel(i, color, brightness)
 
+    def set_frame(self, frame):
+        """
+        Replace the whole frame with already-scaled RGB colors, either an
+        (N, 3) uint8 NumPy array or a list of RGB tuples.
+        """
+        if hasattr(frame, "tobytes"):
+            self.frame.load_rgb(frame)
+            return
+        for i, color in enumerate(frame):
+            if i < self.num_leds:
+                self.frame.set_pixel(i, color)
+
     def fill(self, color: Tuple[int, int, int], brightness: Optional[float] = None):
         """Fill all LEDs with a color and optional brightness."""
         color = self._apply_brightness(color, brightness)
-        self.strip.fill(color)
+        self.frame.fill(color)
+
+    def clear(self):
+        """Blank the framebuffer without transmitting anything."""
+        self.frame.clear()
+
+    def output_frame(self) -> bytearray:
+        """The framebuffer after the color pipeline, in native strip order."""
+        return self.pipeline.render(self.frame)
+
+    def commit_raw(self, frame):
+        """
+        Transmit an already-processed native-order frame (e.g. a slice of a
+        compiled frame file). The framebuffer is left untouched.
+        """
+        with SHOW_SECONDS.time():
+            self.backend.write(frame)
+        FRAMES_COMMITTED.inc(result="sent")
+        self._last_frame = None
+
+    def offscreen(self) -> "LEDController":
+        """A controller with the same size and color settings that never transmits."""
+        pipeline = self.pipeline
+        return LEDController(
+            pin_num=self.pin_num,
+            num_leds=self.num_leds,
+            brightness=pipeline.brightness,
+            gamma=pipeline.gamma,
+            white_balance=pipeline.white_balance,
+            backend=MemoryBackend(
+                self.num_leds, max_frames=0, pixel_order=self.backend.pixel_order
+            ),
+        )
+
+    def commit(self, force: bool = False) -> bool:
+        """
+        Push the framebuffer through the color pipeline to the strip.
+        Returns False if the output is byte-identical to the last one sent.
+        """
+        frame = self.output_frame()
+        if not force and self._last_frame == frame:
+            FRAMES_COMMITTED.inc(result="unchanged")
+            return False
+        with SHOW_SECONDS.time():
+            self.backend.write(frame)
+        FRAMES_COMMITTED.inc(result="sent")
+        self._last_frame = frame
+        return True
 
     def show(self):
         """Update the LED strip with current colors."""
-        self.strip.show()
+        self.commit()
 
     def turn_all_off(self):
         """Turn off all LEDs."""
-        self.strip.fill((0, 0, 0))
-        self.strip.show()
+        self.frame.clear()
+        self.commit()
 
     def cleanup(self):
         """Clean up resources."""
-        self.turn_all_off()
+        self.frame.clear()
+        self.commit(force=True)
+        self.backend.close()
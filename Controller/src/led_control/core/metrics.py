@@ -0,0 +1,321 @@
+"""
+Runtime metrics for the LED control daemon.
+
+A small in-process registry of counters and histograms, exported in the
+Prometheus text format over HTTP on a local port and/or to a file (for the
+node_exporter textfile collector).
+
+Features:
+- No dependencies; recording a value is a dict lookup and an add under a
+  lock, cheap enough to leave on in production on a Pi Zero
+- Histograms with fixed buckets, so memory does not grow with samples
+- Collectors: counts that are already kept elsewhere (like the per-animation
+  frame clocks) are read at export time instead of on the hot path
+- Exporting runs on a daemon thread and never blocks the display loop
+
+Instrumented modules create their metrics at import time with counter() and
+histogram(); they are recorded whether or not anything exports them.
+"""
+
+import bisect
+import os
+import tempfile
+import threading
+import time
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; suits network fetches and file writes
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    pairs += [f'{n}="{_escape(v)}"' for n, v in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """A count that only goes up, per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set(self, value, **labels):
+        """Set the total directly, for counts kept elsewhere and read by a collector."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = self._header()
+        for key, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_labels", "_start")
+
+    def __init__(self, histogram, labels):
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._histogram.observe(time.perf_counter() - self._start, **self._labels)
+        return False
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets, per label combination."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (last is +Inf), sum, count]
+        self._values = {}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def time(self, **labels):
+        """Context manager that observes the seconds spent inside it."""
+        return _Timer(self, labels)
+
+    def count(self, **labels):
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return entry[2] if entry else 0
+
+    def render(self):
+        with self._lock:
+            values = sorted((key, (list(e[0]), e[1], e[2])) for key, e in self._values.items())
+        lines = self._header()
+        bounds = [_format_value(b) for b in self.buckets] + ["+Inf"]
+        for key, (counts, total, count) in values:
+            cumulative = 0
+            for bound, n in zip(bounds, counts):
+                cumulative += n
+                labels = _format_labels(self.labelnames, key, [("le", bound)])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds every metric and renders them in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, help_text, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered differently")
+            return metric
+
+    def counter(self, name, help_text, labelnames=()) -> Counter:
+        return self._register(Counter, name, help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def add_collector(self, callback):
+        """Call callback() before every export, to copy in counts kept elsewhere."""
+        self._collectors.append(callback)
+
+    def render(self) -> str:
+        for callback in list(self._collectors):
+            try:
+                callback()
+            except Exception as exc:
+                print(f"[ERROR] Metrics collector failed: {exc}")
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        lines = []
+        for _, metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def counter(name, help_text, labelnames=()) -> Counter:
+    """A counter in the default registry; the same name returns the same metric."""
+    return REGISTRY.counter(name, help_text, labelnames)
+
+
+def histogram(name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+    """A histogram in the default registry; the same name returns the same metric."""
+    return REGISTRY.histogram(name, help_text, labelnames, buckets)
+
+
+def write_textfile(path, registry=REGISTRY):
+    """Write the metrics to path atomically, so a scraper never reads half a file."""
+    dir_name = os.path.dirname(os.path.abspath(path))
+    os.makedirs(dir_name, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=dir_name, delete=False, encoding="utf-8") as tf:
+        tf.write(registry.render())
+        tempname = tf.name
+    try:
+        os.chmod(tempname, 0o644)
+        os.replace(tempname, path)
+    except BaseException:
+        try:
+            os.unlink(tempname)
+        except OSError:
+            pass
+        raise
+
+
+class MetricsExporter:
+    """
+    Serves /metrics on a local port and/or rewrites a file every interval.
+
+    Usage:
+        exporter = MetricsExporter(port=9101, path="/var/lib/node_exporter/ccal.prom")
+        exporter.start()
+        ...
+        exporter.stop()
+    """
+
+    def __init__(self, port=None, path=None, interval=15.0, host="127.0.0.1", registry=REGISTRY):
+        self.port = port
+        self.path = path
+        self.interval = interval
+        self.host = host
+        self.registry = registry
+        self._server = None
+        self._threads = []
+        self._stop = threading.Event()
+
+    def _handler(self):
+        # http.server is slow to import on a Pi Zero; only load it when serving
+        from http.server import BaseHTTPRequestHandler
+
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """Start the HTTP server and/or file writer. Returns the bound port, if any."""
+        self._stop.clear()
+        if self.port is not None:
+            from http.server import ThreadingHTTPServer
+
+            self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+            self._server.daemon_threads = True
+            self.port = self._server.server_port
+            thread = threading.Thread(target=self._server.serve_forever, name="metrics-http",
+                                      daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if self.path:
+            self._write()
+            thread = threading.Thread(target=self._write_loop, name="metrics-file", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self.port
+
+    def _write(self):
+        try:
+            write_textfile(self.path, self.registry)
+        except OSError as exc:
+            print(f"[ERROR] Failed to write metrics to {self.path}: {exc}")
+
+    def _write_loop(self):
+        while not self._stop.wait(self.interval):
+            self._write()
+        self._write()
+
+    def stop(self):
+        """Stop exporting; the file gets a final write."""
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
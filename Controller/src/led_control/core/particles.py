@@ -0,0 +1,105 @@
+"""
+Fixed-capacity particle system for the precipitation animations.
+
+Particles are stored as parallel preallocated arrays (struct-of-arrays)
+rather than a list of dicts, so spawning allocates nothing and a dead
+particle is removed by swapping the last live particle into its slot.
+One pass per frame both moves every particle and draws it.
+"""
+
+import math
+import random
+from array import array
+from typing import List, Tuple
+
+
+class ParticleSystem:
+    """Particles falling down the columns of a rows x cols LED grid."""
+
+    def __init__(self, rows: int, cols: int, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.rows = rows
+        self.cols = cols
+        self.capacity = capacity
+        self.count = 0
+        self.rejected = 0
+        self.row = array("f", bytes(4 * capacity))
+        self.col = array("H", bytes(2 * capacity))
+        self.speed = array("f", bytes(4 * capacity))
+        self.color = array("B", bytes(capacity))
+        self.brightness = array("f", bytes(4 * capacity))
+
+    @classmethod
+    def for_rate(cls, rows: int, cols: int, speed: float, per_frame: float) -> "ParticleSystem":
+        """Size a system for particles spawned at per_frame falling at speed."""
+        lifetime = math.ceil(rows / speed) if speed > 0 else rows
+        # One extra frame of lifetime: rows are float32, and rounding in the
+        # accumulated position can keep a particle alive a frame longer.
+        return cls(rows, cols, max(1, (lifetime + 1) * max(1, math.ceil(per_frame))))
+
+    def spawn(self, col: int, speed: float, color: int, brightness: float) -> bool:
+        """Add a particle at the top row. Returns False if the system is full."""
+        n = self.count
+        if n >= self.capacity:
+            self.rejected += 1
+            return False
+        self.row[n] = 0.0
+        self.col[n] = col
+        self.speed[n] = speed
+        self.color[n] = color
+        self.brightness[n] = brightness
+        self.count = n + 1
+        return True
+
+    def spawn_random(
+        self,
+        rate: float,
+        speed: float,
+        num_colors: int,
+        brightness_range: Tuple[float, float] = (0.6, 0.9),
+    ):
+        """
+        Spawn particles in random columns. rate is the expected number per
+        frame; values below 1 are a per-frame spawn probability.
+        """
+        spawns = int(rate)
+        if random.random() < rate - spawns:
+            spawns += 1
+        for _ in range(spawns):
+            self.spawn(
+                random.randint(0, self.cols - 1),
+                speed,
+                random.randrange(num_colors),
+                random.uniform(*brightness_range),
+            )
+
+    def _remove(self, i: int):
+        """Swap-remove particle i."""
+        last = self.count - 1
+        if i != last:
+            self.row[i] = self.row[last]
+            self.col[i] = self.col[last]
+            self.speed[i] = self.speed[last]
+            self.color[i] = self.color[last]
+            self.brightness[i] = self.brightness[last]
+        self.count = last
+
+    def step(self, led, palette: List[Tuple[int, int, int]]):
+        """Draw every particle into the LED framebuffer, then advance it."""
+        rows = self.rows
+        cols = self.cols
+        num_leds = led.num_leds
+        row, col, speed = self.row, self.col, self.speed
+        color, brightness = self.color, self.brightness
+
+        i = 0
+        while i < self.count:
+            led_index = col[i] + int(row[i]) * cols
+            if 0 <= led_index < num_leds:
+                led.set_pixel(led_index, palette[color[i]], brightness[i])
+            row[i] += speed[i]
+            if row[i] >= rows:
+                self._remove(i)
+            else:
+                i += 1
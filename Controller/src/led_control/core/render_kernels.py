@@ -0,0 +1,217 @@
+"""
+Whole-frame render kernels for the heavier animations.
+
+Each kernel produces a complete RGB frame per call instead of setting pixels
+one at a time. With NumPy installed the frame is an (N, 3) uint8 array built
+from array expressions; without it the same math runs in plain Python and
+returns a list of RGB tuples. LEDController.set_frame() accepts either.
+"""
+
+import math
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+
+    HAVE_NUMPY = True
+except ImportError:  # NumPy is optional on the Pi
+    np = None
+    HAVE_NUMPY = False
+
+
+def wheel(pos: int) -> Tuple[int, int, int]:
+    """Generate rainbow colors across 0-255 positions."""
+    if pos < 85:
+        return (int(pos * 3), int(255 - pos * 3), 0)
+    if pos < 170:
+        pos -= 85
+        return (int(255 - pos * 3), 0, int(pos * 3))
+    pos -= 170
+    return (0, int(pos * 3), int(255 - pos * 3))
+
+
+WHEEL_TABLE = [wheel(pos) for pos in range(256)]
+
+
+def _scaled(color: Sequence[int], level: float) -> Tuple[int, int, int]:
+    return (int(color[0] * level), int(color[1] * level), int(color[2] * level))
+
+
+class _Kernel:
+    """Base for kernels that can run with or without NumPy."""
+
+    def __init__(self, use_numpy: bool = True):
+        self.use_numpy = use_numpy and HAVE_NUMPY
+
+
+class SunKernel(_Kernel):
+    """Pulsing sun with rays rippling out from the center of the strip."""
+
+    def __init__(self, num_leds: int, colors: List[Tuple[int, int, int]], use_numpy: bool = True):
+        super().__init__(use_numpy)
+        self.num_leds = num_leds
+        center = num_leds // 2
+        self._dist = [abs(i - center) for i in range(num_leds)]
+        self._colors = [colors[i % 3] for i in range(num_leds)]
+        if self.use_numpy:
+            self._dist_np = np.array(self._dist, dtype=np.int32)
+            self._colors_np = np.array(self._colors, dtype=np.float32)
+
+    def render(self, now: float):
+        cycle_progress = (now % 2) / 2
+        core_brightness = 0.3 + 0.7 * (0.5 + 0.5 * math.sin(cycle_progress * math.pi))
+        wave_pos = int(cycle_progress * 3) % 3
+
+        if self.use_numpy:
+            wave_effect = (3 - (self._dist_np + wave_pos) % 3) * 0.3
+            level = np.minimum(1.0, core_brightness + wave_effect)
+            return (self._colors_np * level[:, None]).astype(np.uint8)
+
+        frame = []
+        for dist, color in zip(self._dist, self._colors):
+            wave_effect = (3 - (dist + wave_pos) % 3) * 0.3
+            frame.append(_scaled(color, min(1.0, core_brightness + wave_effect)))
+        return frame
+
+
+class FogKernel(_Kernel):
+    """Drifting fog patches blended over a dim base layer on a serpentine grid."""
+
+    def __init__(
+        self,
+        num_leds: int,
+        rows: int,
+        cols: int,
+        patches: List[dict],
+        base_color: Tuple[int, int, int],
+        min_brightness: float,
+        max_brightness: float,
+        use_numpy: bool = True,
+    ):
+        super().__init__(use_numpy)
+        self.num_leds = num_leds
+        self.rows = rows
+        self.cols = cols
+        self.patches = patches
+        self.base_color = base_color
+        self.min_brightness = min_brightness
+        self.max_brightness = max_brightness
+
+        if self.use_numpy:
+            self._pos = np.array([p["pos"] for p in patches], dtype=np.float64)
+            self._speed = np.array([p["speed"] for p in patches], dtype=np.float64)
+            self._half = np.array([p["width"] / 2 for p in patches], dtype=np.float64)
+            self._patch_colors = np.array([p["color"] for p in patches], dtype=np.float64)
+            col_idx = np.arange(cols)
+            self._cols = col_idx.astype(np.float64)
+            # LED index of every (patch, col) cell, following the serpentine wiring
+            led_idx = np.empty((len(patches), cols), dtype=np.int64)
+            for n, patch in enumerate(patches):
+                row = patch["row"]
+                if row % 2 == 0:
+                    led_idx[n] = row * cols + (cols - 1 - col_idx)
+                else:
+                    led_idx[n] = row * cols + col_idx
+            self._led_idx = led_idx
+            self._base = np.array(base_color, dtype=np.float64)
+
+    def _led_index(self, row: int, col: int) -> int:
+        if row % 2 == 0:
+            return row * self.cols + (self.cols - 1 - col)
+        return row * self.cols + col
+
+    def step(self):
+        """Advance every patch by its speed and render the next frame."""
+        if self.use_numpy:
+            return self._step_numpy()
+        return self._step_python()
+
+    def _step_numpy(self):
+        cols = self.cols
+        self._pos = (self._pos + self._speed) % cols
+        for patch, pos in zip(self.patches, self._pos):
+            patch["pos"] = float(pos)
+
+        diff = np.abs(self._cols[None, :] - self._pos[:, None])
+        dist = np.minimum(diff, cols - diff)
+        t = dist / self._half[:, None]
+        smooth = 1 - (3 * t * t - 2 * t * t * t)
+        patch_level = self.min_brightness + (self.max_brightness - self.min_brightness) * smooth
+        inside = dist < self._half[:, None]
+
+        level = np.full(self.num_leds, self.min_brightness)
+        colors = np.broadcast_to(self._base, (self.num_leds, 3)).copy()
+        for n in range(len(self.patches)):
+            mask = inside[n] & (self._led_idx[n] < self.num_leds)
+            idx = self._led_idx[n][mask]
+            vals = patch_level[n][mask]
+            brighter = vals > level[idx]
+            idx = idx[brighter]
+            level[idx] = vals[brighter]
+            colors[idx] = self._patch_colors[n]
+
+        return (colors * level[:, None]).astype(np.uint8)
+
+    def _step_python(self):
+        cols = self.cols
+        led_map = [self.min_brightness] * self.num_leds
+        color_map = [self.base_color] * self.num_leds
+
+        for patch in self.patches:
+            patch["pos"] = (patch["pos"] + patch["speed"]) % cols
+            half = patch["width"] / 2
+            for col in range(cols):
+                dist = min(abs(col - patch["pos"]), cols - abs(col - patch["pos"]))
+                if dist < half:
+                    t = dist / half
+                    smooth = 1 - (3 * t * t - 2 * t * t * t)
+                    patch_brightness = (
+                        self.min_brightness
+                        + (self.max_brightness - self.min_brightness) * smooth
+                    )
+                    led_idx = self._led_index(patch["row"], col)
+                    if led_idx < self.num_leds and patch_brightness > led_map[led_idx]:
+                        led_map[led_idx] = patch_brightness
+                        color_map[led_idx] = patch["color"]
+
+        return [_scaled(color_map[i], led_map[i]) for i in range(self.num_leds)]
+
+
+class RainbowKernel(_Kernel):
+    """Rainbow spread evenly across the strip, rotated by a 0-255 phase."""
+
+    def __init__(self, num_leds: int, use_numpy: bool = True):
+        super().__init__(use_numpy)
+        self.num_leds = num_leds
+        self._offsets = [(i * 256 // num_leds) for i in range(num_leds)]
+        if self.use_numpy:
+            self._offsets_np = np.array(self._offsets, dtype=np.int32)
+            self._table_np = np.array(WHEEL_TABLE, dtype=np.uint8)
+
+    def render(self, phase: int):
+        if self.use_numpy:
+            return self._table_np[(self._offsets_np + phase) & 255]
+        return [WHEEL_TABLE[(offset + phase) & 255] for offset in self._offsets]
+
+
+class TheaterChaseKernel(_Kernel):
+    """Every spacing-th pixel lit, shifted by phase."""
+
+    def __init__(self, num_leds: int, color: Tuple[int, int, int], spacing: int = 3, use_numpy: bool = True):
+        super().__init__(use_numpy)
+        self.num_leds = num_leds
+        self.spacing = spacing
+        self.color = tuple(color)
+        if self.use_numpy:
+            self._index = np.arange(num_leds)
+            self._color_np = np.array(color, dtype=np.uint8)
+
+    def render(self, phase: int):
+        if self.use_numpy:
+            lit = (self._index + phase) % self.spacing == 0
+            return np.where(lit[:, None], self._color_np, np.uint8(0)).astype(np.uint8)
+        off = (0, 0, 0)
+        return [
+            self.color if (i + phase) % self.spacing == 0 else off
+            for i in range(self.num_leds)
+        ]
@@ -1,12 +1,26 @@
 class BaseTracker:
     """Base class for all trackers."""
-    def __init__(self, colors=None):
+    def __init__(self, colors=None, activity_store=None):
         self.colors = colors if colors is not None else []
-    
+        self.activity_store = activity_store
+
     def get_colors(self):
         """Returns the colors used for display."""
         return self.colors
-    
+
     def get_activity(self):
         """Fetch activity data. To be implemented by subclasses."""
-        raise NotImplementedError("Subclasses must implement this method.")
\ No newline at end of file
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def store_key(self):
+        """Name this tracker's rows are kept under in the activity store."""
+        return self.__class__.__name__
+
+    def record_activity(self, counts, today=None):
+        """
+        Write freshly fetched counts (today first) to the activity store.
+        Only call this after a successful fetch, so a failed one never
+        overwrites the stored history with zeros.
+        """
+        if self.activity_store is not None:
+            self.activity_store.record_window(self.store_key(), counts, today)
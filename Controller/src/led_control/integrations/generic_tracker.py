@@ -7,57 +7,143 @@ Features:
 - Defines color for activity tracker
 - Users define this tracker themselves in the web gui
 - Web gui writes the config file for this tracker including adding new activity data
+- The parsed file is kept in memory and only re-read when its mtime, size or
+  inode changes; a file that fails to parse keeps the last good state
+- Data is stored as a date-anchored ring buffer, so a new day (or a gap of
+  several days) needs no rewrite of the file
+
+Ring buffer layout:
+    "ring" holds one value per day; the value for a date lives in slot
+    (days since 1970-01-01) % len(ring). "anchor" is the newest date that
+    has been written. A slot is only valid for dates in
+    (anchor - len(ring), anchor]; later dates have no data yet and earlier
+    ones have expired, so both read as 0. The web gui clears the slots
+    between the old and new anchor when it records a value for a new day.
 """
 
-import time
-import sys
+import os
+from datetime import date, timedelta
 
+from led_control.core import metrics
 from led_control.core.config_manager import ConfigManager
 from led_control.integrations.base_tracker import BaseTracker
 
+RING_DAYS = 28
+_EPOCH = date(1970, 1, 1)
+
+CACHE_REQUESTS = metrics.counter(
+    "ccal_cache_requests_total", "Cache lookups by cache and result (hit, stale or miss)",
+    ("cache", "result"),
+)
+
+
+def epoch_day(day: date) -> int:
+    """Days since 1970-01-01; shared with the web gui to pick ring slots."""
+    return (day - _EPOCH).days
+
+
 class GenericTracker(BaseTracker):
     """
     Default tracker users can use to track anything.
-    The only way this should update the data array is the new day shifting.
+    The tracker only reads the ring buffer; the web gui records new values.
     """
 
-    def __init__(self, configPath, colors=None):
+    def __init__(self, configPath, colors=None, activity_store=None):
         """
         All this takes is a path to a config file.
         The config file should be a JSON file with the following structure:
         {
             "name": "My Generic Tracker",
-            "data": [0, 1, 0, 2, ..., 0],  # 28 days of data
+            "anchor": "2025-01-31",        # newest day written
+            "ring": [0, 1, 0, 2, ..., 0],  # 28 days of data, by date slot
             "event": [R, G, B],
             "no_events": [R, G, B]
         }
+        Older files with a "data" array (today first) are converted once.
         """
-        super().__init__(colors=colors)
-        self.currDay = time.localtime().tm_mday
+        super().__init__(colors=colors, activity_store=activity_store)
         self.configPath = configPath
-        self._get_config()
+        self.config_manager = None
+        self._signature = None
+        if not self._get_config():
+            raise ValueError(f"Could not load tracker config '{configPath}'")
 
+    def store_key(self):
+        return f"generic:{os.path.basename(self.configPath)}"
+
+    def _file_signature(self):
+        """Cheap change check: a stat, no read of the file contents."""
+        try:
+            st = os.stat(self.configPath)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
 
     def _get_config(self):
+        """
+        Reload the tracker file if it changed since the last successful load.
+        Returns False if it could not be loaded; the previous state is kept.
+        """
+        signature = self._file_signature()
+        if signature is not None and signature == self._signature:
+            CACHE_REQUESTS.inc(cache="generic_tracker", result="hit")
+            return True
+        CACHE_REQUESTS.inc(cache="generic_tracker", result="miss")
+
         try:
-            self.config_manager = ConfigManager(self.configPath)
+            if self.config_manager is None:
+                self.config_manager = ConfigManager(self.configPath)
+            else:
+                self.config_manager.reload()
             config = self.config_manager.conf
         except Exception as exc:
             print(f"[ERROR] Failed to load config: {exc}")
-            sys.exit(1)
+            return False
 
         if not config:
-            print("Config Empty")
-            sys.exit(1)
+            print(f"[ERROR] Tracker config '{self.configPath}' is empty")
+            return False
 
+        try:
+            if "ring" in config:
+                ring = list(config["ring"])
+                anchor = date.fromisoformat(config["anchor"])
+                if not ring:
+                    raise ValueError("ring is empty")
+                migrate = False
+            else:
+                ring, anchor = self._ring_from_data(config.get("data", [0] * RING_DAYS))
+                migrate = True
+        except Exception as exc:
+            print(f"[ERROR] Invalid data in tracker config '{self.configPath}': {exc}")
+            return False
+
+        self._signature = signature
+        self.ring = ring
+        self.anchor = anchor
         self.name = config.get("name", "Generic Tracker")
-        self.data = config.get("data", [0] * 28)
         self.metric = config.get("metric", "units")
 
         event_color = config.get("event", [0, 255, 0])
         no_event_color = config.get("no_events", [0, 0, 0])
         self.color = {"event": event_color, "no_events": no_event_color}
 
+        if migrate:
+            self._save_config()
+        today = date.today()
+        self.record_activity(
+            [self.value_for(today - timedelta(days=i)) for i in range(len(self.ring))], today
+        )
+        return True
+
+    @staticmethod
+    def _ring_from_data(data):
+        """Convert a legacy today-first data array into a ring anchored today."""
+        today = date.today()
+        ring = [0] * RING_DAYS
+        for days_ago, value in enumerate(data[:RING_DAYS]):
+            ring[epoch_day(today - timedelta(days=days_ago)) % RING_DAYS] = value
+        return ring, today
 
     def _save_config(self):
         """
@@ -65,43 +151,36 @@ class GenericTracker(BaseTracker):
         """
         new_config = {
             "name": self.name,
-            "data": self.data,
+            "anchor": self.anchor.isoformat(),
+            "ring": self.ring,
             "event": self.color["event"],
             "no_events": self.color["no_events"],
             "metric": self.metric
         }
         try:
-            self.config_manager = ConfigManager(self.configPath)
-            self.config_manager.update_config(new_config)
+            if self.config_manager.update_config(new_config):
+                # Our own write is already in memory; don't re-read it
+                self._signature = self._file_signature()
         except Exception as exc:
             print(f"[ERROR] Failed to save config: {exc}")
 
-    def _is_new_day(self):
-        """
-        Check if a new day has started.
-        """
-        newDay = time.localtime().tm_mday
-        if newDay != self.currDay:
-            self.currDay = newDay
-            return True
-        return False
-    
-    def _shift_data(self):
-        """
-        Shift the data array to account for a new day.
-        """
-        self.data = [0] + self.data[:-1]
-        self._save_config()
+    def value_for(self, day: date):
+        """The recorded value for a date, 0 if it has no data or has expired."""
+        offset = (self.anchor - day).days
+        if offset < 0 or offset >= len(self.ring):
+            return 0
+        return self.ring[epoch_day(day) % len(self.ring)]
 
     def get_activity(self):
         """
         Get the frequency array of activity data.
         28 days of data, with the most recent day at index 0.
-        When a new day is detected, shift the array and add a new day with 0 activity.
+        The day offsets are derived from the anchor date when read, so
+        nothing is shifted or written when the day changes.
         """
         self._get_config()
-        if self._is_new_day(): self._shift_data()
-        return self.data
+        today = date.today()
+        return [self.value_for(today - timedelta(days=i)) for i in range(len(self.ring))]
 
     def get_colors(self):
         """
@@ -114,4 +193,3 @@ class GenericTracker(BaseTracker):
         Get the name of the tracker.
         """
         return self.name
-
@@ -0,0 +1,125 @@
+"""
+GitHubGraphQLTracker integration module.
+
+Provides the GitHubGraphQLTracker class, an alternative GitHub backend that
+reads the user's contribution calendar through the GraphQL API.
+
+Features:
+- One request per poll instead of paging through the REST events feed
+- Exact daily contribution counts, as shown on the GitHub profile
+- Not limited to the 300 events / 90 days the events endpoint returns
+- Keeps the last good counts when a request fails
+"""
+
+from datetime import date, timedelta
+import requests
+from led_control.integrations.base_tracker import BaseTracker
+from led_control.integrations.http_transport import get_transport
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+CALENDAR_QUERY = """
+query($login: String!, $from: DateTime!, $to: DateTime!) {
+  user(login: $login) {
+    contributionsCollection(from: $from, to: $to) {
+      contributionCalendar {
+        weeks {
+          contributionDays {
+            date
+            contributionCount
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+class GitHubGraphQLTracker(BaseTracker):
+    """
+    Tracks a GitHub user's daily contributions via the GraphQL API.
+    """
+
+    def __init__(self, github_username, api_key, colors=None, num_days=28, api_url=GRAPHQL_URL,
+                 transport=None, activity_store=None):
+        super().__init__(colors=colors, activity_store=activity_store)
+
+        if not github_username or not isinstance(github_username, str):
+            raise ValueError("github_username must be a non-empty string")
+        if not api_key or not isinstance(api_key, str):
+            raise ValueError("api_key must be a non-empty string")
+
+        self._auth_info = (github_username, api_key)
+        self._num_days = num_days
+        self.api_url = api_url
+        self._http = transport or get_transport()
+        self._stored_counts = [0] * self._num_days
+        self._headers = {
+            "Authorization": f"Bearer {self._auth_info[1]}",
+        }
+
+    def store_key(self):
+        return f"github-contributions:{self._auth_info[0]}"
+
+    def _query_variables(self, today):
+        start = today - timedelta(days=self._num_days - 1)
+        return {
+            "login": self._auth_info[0],
+            "from": f"{start.isoformat()}T00:00:00Z",
+            "to": f"{today.isoformat()}T23:59:59Z",
+        }
+
+    def _fetch_calendar(self, today):
+        """
+        Fetch the contribution calendar covering the last num_days.
+        Returns:
+            list: contributionDays dicts, or None if the request failed.
+        """
+        payload = {"query": CALENDAR_QUERY, "variables": self._query_variables(today)}
+        try:
+            # The query only reads, so it is safe to retry like a GET
+            resp = self._http.post(self.api_url, json=payload, headers=self._headers,
+                                   attempts=self._http.attempts)
+            if resp.status_code != 200:
+                print(f"API Error {resp.status_code}: {resp.text[:200]}")
+                return None
+            body = resp.json() or {}
+            if body.get("errors"):
+                print(f"GraphQL Error: {body['errors'][0].get('message', body['errors'][0])}")
+                return None
+            user = (body.get("data") or {}).get("user")
+            if user is None:
+                print(f"GitHub user '{self._auth_info[0]}' not found.")
+                return None
+            weeks = user["contributionsCollection"]["contributionCalendar"]["weeks"]
+            return [day for week in weeks for day in week["contributionDays"]]
+        except requests.RequestException as exc:
+            print(f"Request failed: {exc}")
+        except (KeyError, TypeError, ValueError) as exc:
+            print(f"Unexpected GraphQL response: {exc}")
+        return None
+
+    def get_activity(self):
+        """
+        Contribution counts per day for the last num_days, today first.
+        Returns:
+            list: Contribution counts per day.
+        """
+        today = date.today()
+        days = self._fetch_calendar(today)
+        if days is None:
+            return self._stored_counts
+
+        counts = [0] * self._num_days
+        for day in days:
+            try:
+                days_ago = (today - date.fromisoformat(day["date"])).days
+                if 0 <= days_ago < self._num_days:
+                    counts[days_ago] = int(day["contributionCount"])
+            except (KeyError, TypeError, ValueError) as exc:
+                print(f"Error processing contribution day: {exc}")
+
+        self._stored_counts = counts
+        self.record_activity(counts, today)
+        return counts
@@ -6,12 +6,35 @@ analyzing recent GitHub events for a user.
 
 Features:
 - Fetches events with pagination, retry, and rate limit handling
+- Incremental ingestion: paging stops at the first already-known event and
+  events are deduplicated by id, so page shifts never double count
+- Keeps only compact (id, day) records in a rolling per-day counter
+- Conditional requests: the first page's ETag is sent back as If-None-Match
+  and a 304 means nothing new happened (304s do not count against the rate
+  limit)
+- Never polls faster than the X-Poll-Interval the API asks for
+- The validator and the counter persist across restarts
 - Counts events per day for a configurable window
 """
 
+import json
+import os
 import time
+from datetime import date
 import requests
+from led_control.core import metrics
 from led_control.integrations.base_tracker import BaseTracker
+from led_control.integrations.http_transport import get_transport
+
+DEFAULT_CACHE_PATH = os.path.expanduser("~/.cache/ccal_github_events")
+
+CACHE_REQUESTS = metrics.counter(
+    "ccal_cache_requests_total", "Cache lookups by cache and result (hit, stale or miss)",
+    ("cache", "result"),
+)
+RATE_LIMITED = metrics.counter(
+    "ccal_rate_limited_total", "Requests held back or refused by an API rate limit", ("service",)
+)
 
 
 class GitHubTracker(BaseTracker):
@@ -19,8 +42,9 @@ class GitHubTracker(BaseTracker):
     Tracks and analyzes recent GitHub events for a user.
     """
 
-    def __init__(self, github_username, api_key, colors=None):
-        super().__init__(colors=colors)
+    def __init__(self, github_username, api_key, colors=None, cache_path=None, transport=None,
+                 activity_store=None):
+        super().__init__(colors=colors, activity_store=activity_store)
 
         if not github_username or not isinstance(github_username, str):
             raise ValueError("github_username must be a non-empty string")
@@ -33,43 +57,104 @@ class GitHubTracker(BaseTracker):
         self.max_events = 200
         self._per_page = 30
         self._max_retries = 3
-        self._every_other = True
-        self._stored_events = []
-        self._seconds_per_day = 86400
+        self._http = transport or get_transport()
         self._headers = {
             "Authorization": f"Bearer {self._auth_info[1]}",
-            "User-Agent": "PiZero",
         }
+        # event id -> day ordinal, and day ordinal -> event count
+        self._event_days = {}
+        self._day_counts = {}
+        self._etag = None
+        self._poll_interval = 60
+        self._next_poll = 0.0
+        self.cache_path = cache_path or DEFAULT_CACHE_PATH
+        self._load_cache()
+
+    def _load_cache(self):
+        """Load the validator and counter persisted by a previous run."""
+        try:
+            if os.path.exists(self.cache_path):
+                with open(self.cache_path, 'r') as f:
+                    data = json.load(f)
+                if data.get("user") == self._auth_info[0]:
+                    self._etag = data.get("etag")
+                    self._poll_interval = data.get("poll_interval", self._poll_interval)
+                    self._last_event_id = data.get("last_event_id")
+                    for event_id, day in data.get("events", {}).items():
+                        self._add_event(event_id, day)
+        except Exception as e:
+            print(f"Failed to load cached GitHub events: {e}")
+
+    def _save_cache(self):
+        """Persist the validator and counter so a restart can start with 304s."""
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    "user": self._auth_info[0],
+                    "etag": self._etag,
+                    "poll_interval": self._poll_interval,
+                    "last_event_id": self._last_event_id,
+                    "events": self._event_days,
+                }, f)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            print(f"Failed to save GitHub event cache: {e}")
+
+    def _update_poll_interval(self, resp):
+        try:
+            self._poll_interval = max(1, int(resp.headers.get("X-Poll-Interval", self._poll_interval)))
+        except (TypeError, ValueError):
+            pass
+
+    def _is_known(self, event_id):
+        return event_id == self._last_event_id or event_id in self._event_days
 
     def _fetch_events(self):
         """
-        Fetch recent GitHub events for the configured user,
-        handling pagination, retries, and rate limits.
+        Fetch GitHub events newer than the last ingested one, handling
+        pagination and rate limits. Network errors and 5xx responses are
+        retried by the shared transport.
         Returns:
-            list: List of GitHub event dicts.
+            list: New GitHub event dicts, newest first, without duplicates.
         """
-        # Serve cached results every other call to reduce API usage
-        if not self._every_other and self._stored_events:
-            self._every_other = True
-            return self._stored_events
+        # Nothing can have changed until the server's poll interval has passed
+        if time.monotonic() < self._next_poll:
+            return []
 
-        self._every_other = False
-        all_events = []
+        new_events = []
+        seen = set()
         page = 1
+        etag = self._etag
+        complete = False
 
-        while len(all_events) < self.max_events:
+        while len(new_events) < self.max_events:
             url = f"https://api.github.com/users/{self._auth_info[0]}/events"
             params = {"page": page, "per_page": self._per_page}
+            headers = dict(self._headers)
+            # Later pages are only fetched when all of page 1 was new, so
+            # only the first page's validator is worth keeping.
+            if page == 1 and self._etag:
+                headers["If-None-Match"] = self._etag
             retries = 0
-            last_page = False
+            events = None
 
             while retries < self._max_retries:
                 try:
-                    resp = requests.get(url, headers=self._headers, params=params, timeout=10)
+                    resp = self._http.get(url, headers=headers, params=params)
+                    if resp.status_code == 304:
+                        CACHE_REQUESTS.inc(cache="github_etag", result="hit")
+                        self._update_poll_interval(resp)
+                        events = []
+                        break
+
                     if resp.status_code == 200:
+                        self._update_poll_interval(resp)
                         events = resp.json() or []
-                        all_events.extend(events)
-                        last_page = len(events) < self._per_page
+                        if page == 1:
+                            CACHE_REQUESTS.inc(cache="github_etag", result="miss")
+                            etag = resp.headers.get("ETag")
                         break
 
                     # Rate limit handling
@@ -79,6 +164,7 @@ class GitHubTracker(BaseTracker):
                             reset_time = int(reset_hdr) if reset_hdr else int(time.time()) + 60
                         except ValueError:
                             reset_time = int(time.time()) + 60
+                        RATE_LIMITED.inc(service="github")
                         wait_seconds = max(0, reset_time - int(time.time()))
                         print(f"Rate limit exceeded. Waiting {wait_seconds} seconds...")
                         time.sleep(wait_seconds + 1)
@@ -86,55 +172,108 @@ class GitHubTracker(BaseTracker):
                         continue
 
                     print(f"API Error {resp.status_code}: {resp.text[:200]}")
-                    retries += 1
-                    time.sleep(2 ** retries)
+                    break
 
                 except requests.RequestException as exc:
                     print(f"Request failed: {exc}")
-                    retries += 1
-                    time.sleep(2 ** retries)
+                    break
             else:
-                print(f"Failed to fetch page {page} after {self._max_retries} retries.")
+                print(f"Failed to fetch page {page}: still rate limited after {self._max_retries} retries.")
+
+            if events is None:
                 break
 
-            if last_page:
+            reached_known = False
+            for event in events:
+                event_id = event.get("id")
+                if self._is_known(event_id):
+                    reached_known = True
+                    break
+                # Events shift down a page when new ones arrive mid-pagination
+                if event_id in seen:
+                    continue
+                seen.add(event_id)
+                new_events.append(event)
+
+            if reached_known or len(events) < self._per_page:
+                complete = True
                 break
 
             page += 1
             time.sleep(1)
+        else:
+            complete = True
 
-        limited = all_events[: self.max_events]
-        if limited:
-            self._stored_events = limited
-            return limited
+        self._next_poll = time.monotonic() + self._poll_interval
+        if not complete:
+            # Ingesting part of the gap would make the next poll stop at
+            # those ids and skip the pages that failed; retry it whole.
+            return []
+        self._etag = etag
+        return new_events[: self.max_events]
 
-        return self._stored_events
+    def _add_event(self, event_id, day):
+        self._event_days[event_id] = day
+        self._day_counts[day] = self._day_counts.get(day, 0) + 1
 
-
-    def get_activity(self):
-        """
-        Count events per day for the last num_days.
-        Returns:
-            list: Event counts per day.
-        """
-        events = self._fetch_events()
-        event_counts = [0] * self._num_days
-        now = time.time()
+    def _ingest(self, events):
+        """Record new events as (id, day) pairs. Returns how many were counted."""
+        oldest = date.today().toordinal() - self._num_days + 1
+        added = 0
         for event in events:
             try:
+                event_id = event.get("id")
                 created_at = event.get("created_at")
 
-                if not created_at or len(created_at) < 10:
+                if event_id is None or not created_at or len(created_at) < 10:
                     continue
 
-                year, month, day = int(created_at[0:4]), int(created_at[5:7]), int(created_at[8:10])
-                event_time = time.mktime((year, month, day, 0, 0, 0, 0, 0, -1))
-                days_ago = int((now - event_time) // self._seconds_per_day)
-
-                if 0 <= days_ago < self._num_days:
-                    event_counts[days_ago] += 1
+                day = date(int(created_at[0:4]), int(created_at[5:7]), int(created_at[8:10])).toordinal()
+                if day >= oldest and event_id not in self._event_days:
+                    self._add_event(event_id, day)
+                    added += 1
 
             except Exception as exc:
                 print(f"Error processing event: {exc}")
 
+        if events and events[0].get("id") is not None:
+            self._last_event_id = events[0]["id"]
+        return added
+
+    def _expire(self, oldest):
+        """Drop days, and the ids on them, that left the window."""
+        expired = [day for day in self._day_counts if day < oldest]
+        if not expired:
+            return False
+        for day in expired:
+            del self._day_counts[day]
+        self._event_days = {
+            event_id: day for event_id, day in self._event_days.items() if day >= oldest
+        }
+        return True
+
+    def store_key(self):
+        return f"github:{self._auth_info[0]}"
+
+    def get_activity(self):
+        """
+        Count events per day for the last num_days.
+        Returns:
+            list: Event counts per day.
+        """
+        etag = self._etag
+        added = self._ingest(self._fetch_events())
+
+        today = date.today().toordinal()
+        expired = self._expire(today - self._num_days + 1)
+        if added or expired or etag != self._etag:
+            self._save_cache()
+
+        event_counts = [0] * self._num_days
+        for day, count in self._day_counts.items():
+            days_ago = today - day
+            if 0 <= days_ago < self._num_days:
+                event_counts[days_ago] += count
+        # The counter is persisted history, not just the latest response
+        self.record_activity(event_counts)
         return event_counts
@@ -0,0 +1,131 @@
+"""
+Shared HTTP transport for the integrations.
+
+All trackers send their requests through one pooled requests.Session, so the
+TCP connection and TLS session to each host are set up once and then kept
+alive between polls instead of being renegotiated on every request. On a Pi
+Zero W the handshake is the most expensive part of a poll.
+
+Features:
+- Keep-alive connection pool per host, safe to share between fetch threads
+- gzip/deflate negotiation
+- One default timeout and one retry-with-backoff policy for every tracker
+- Timing of every request, summarized per host by stats()
+"""
+
+import threading
+import time
+from collections import deque, namedtuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = 10
+DEFAULT_ATTEMPTS = 3
+RETRY_STATUSES = (500, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+
+RequestTiming = namedtuple("RequestTiming", "method host status elapsed attempt")
+
+
+class HttpTransport:
+    """Pooled keep-alive session with shared timeout and retry settings."""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, attempts=DEFAULT_ATTEMPTS, backoff=1.0,
+                 pool_size=4, user_agent="PiZero", history=256):
+        self.timeout = timeout
+        self.attempts = attempts
+        self.backoff = backoff
+        self._session = requests.Session()
+        self._session.headers.update({
+            "User-Agent": user_agent,
+            "Accept-Encoding": "gzip, deflate",
+        })
+        # One pool per host; pool_size covers the fetch thread pool
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self.timings = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def request(self, method, url, attempts=None, timeout=None, **kwargs):
+        """
+        Send a request, retrying connection errors and 5xx responses with
+        exponential backoff. Only idempotent methods are retried unless
+        attempts is given. Returns the last response, or raises the last
+        requests.RequestException if no response was received.
+        """
+        method = method.upper()
+        if attempts is None:
+            attempts = self.attempts if method in IDEMPOTENT_METHODS else 1
+        timeout = self.timeout if timeout is None else timeout
+        host = urlsplit(url).netloc
+
+        for attempt in range(1, attempts + 1):
+            started = time.monotonic()
+            try:
+                resp = self._session.request(method, url, timeout=timeout, **kwargs)
+            except requests.RequestException:
+                self._record(method, host, None, started, attempt)
+                if attempt == attempts:
+                    raise
+            else:
+                self._record(method, host, resp.status_code, started, attempt)
+                if resp.status_code not in RETRY_STATUSES or attempt == attempts:
+                    return resp
+            time.sleep(self.backoff * 2 ** (attempt - 1))
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def _record(self, method, host, status, started, attempt):
+        timing = RequestTiming(method, host, status, time.monotonic() - started, attempt)
+        with self._lock:
+            self.timings.append(timing)
+
+    def stats(self):
+        """Per-host request count, failures and latency over the recent history."""
+        with self._lock:
+            timings = list(self.timings)
+        hosts = {}
+        for t in timings:
+            entry = hosts.setdefault(
+                t.host, {"requests": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            entry["requests"] += 1
+            if t.status is None or t.status >= 500:
+                entry["errors"] += 1
+            entry["total_seconds"] += t.elapsed
+            entry["max_seconds"] = max(entry["max_seconds"], t.elapsed)
+        for entry in hosts.values():
+            entry["avg_seconds"] = entry["total_seconds"] / entry["requests"]
+        return hosts
+
+    def close(self):
+        self._session.close()
+
+
+_default_transport = None
+_default_lock = threading.Lock()
+
+
+def get_transport():
+    """The process-wide transport shared by every tracker."""
+    global _default_transport
+    with _default_lock:
+        if _default_transport is None:
+            _default_transport = HttpTransport()
+        return _default_transport
+
+
+def close_transport():
+    """Close the shared transport's pooled connections."""
+    global _default_transport
+    with _default_lock:
+        if _default_transport is not None:
+            _default_transport.close()
+            _default_transport = None
@@ -0,0 +1,139 @@
+"""
+Registry of the integrations the display can show.
+
+Maps the config that turns each integration on to its tracker class. The
+classes are named by import path and only imported when their config is
+present, so the tracker modules (and requests, which every network tracker
+pulls in) stay out of startup until they are needed.
+
+Features:
+- An integration is enabled when all of its config values are set and its
+  condition (like GITHUB_BACKEND) matches
+- The tracker's constructor arguments and display colors are read from the
+  same config dict as everything else (see cli.main.extract_config_values)
+- integration_for() finds the entry a running tracker was built from,
+  without importing any other tracker module
+"""
+
+import importlib
+
+
+def load_class(class_path):
+    """Import a "module:ClassName" path."""
+    module_name, _, class_name = class_path.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+class Integration:
+    """
+    One tracker type and the config that turns it on.
+
+    Args:
+        name: Short name, used in log and profile output.
+        class_path: "module:ClassName" of the tracker.
+        config_keys: Config values that must all be set.
+        options: cfg -> constructor keyword arguments.
+        color_keys: (event, no_events) config keys for the display colors.
+        when: Extra cfg -> bool condition.
+        role: "activity" trackers are shown on the calendar and record
+            into the activity store; "weather" is the weather tracker.
+    """
+
+    def __init__(self, name, class_path, config_keys, options, color_keys=None, when=None,
+                 role="activity"):
+        self.name = name
+        self.class_path = class_path
+        self.config_keys = tuple(config_keys)
+        self.options = options
+        self.color_keys = color_keys
+        self.when = when
+        self.role = role
+
+    def enabled(self, cfg) -> bool:
+        if not all(cfg.get(key) for key in self.config_keys):
+            return False
+        return self.when is None or self.when(cfg)
+
+    def colors(self, cfg):
+        """The tracker's display colors from the config, or None."""
+        if self.color_keys is None:
+            return None
+        event, no_events = self.color_keys
+        return {"event": cfg[event], "no_events": cfg[no_events]}
+
+    def load(self):
+        """Import and return the tracker class."""
+        return load_class(self.class_path)
+
+    def create(self, cfg, activity_store=None):
+        """Import the tracker class and build a tracker from the config."""
+        kwargs = self.options(cfg)
+        if self.color_keys is not None:
+            kwargs["colors"] = self.colors(cfg)
+        if self.role == "activity":
+            kwargs["activity_store"] = activity_store
+        return self.load()(**kwargs)
+
+    def built(self, tracker) -> bool:
+        """True if tracker is an instance of exactly this integration's class."""
+        cls = type(tracker)
+        return f"{cls.__module__}:{cls.__qualname__}" == self.class_path
+
+
+GITHUB_BACKENDS = ("events", "graphql")
+
+INTEGRATIONS = [
+    Integration(
+        "github",
+        "led_control.integrations.github_tracker:GitHubTracker",
+        ("github_username", "github_token"),
+        lambda cfg: {"github_username": cfg["github_username"], "api_key": cfg["github_token"]},
+        color_keys=("github_event_color", "github_no_events_color"),
+        when=lambda cfg: cfg["github_backend"] != "graphql",
+    ),
+    Integration(
+        "github-graphql",
+        "led_control.integrations.github_graphql_tracker:GitHubGraphQLTracker",
+        ("github_username", "github_token"),
+        lambda cfg: {"github_username": cfg["github_username"], "api_key": cfg["github_token"]},
+        color_keys=("github_event_color", "github_no_events_color"),
+        when=lambda cfg: cfg["github_backend"] == "graphql",
+    ),
+    Integration(
+        "strava",
+        "led_control.integrations.strava:StravaTracker",
+        ("strava_client_id", "strava_client_secret"),
+        lambda cfg: {
+            "client_id": cfg["strava_client_id"],
+            "client_secret": cfg["strava_client_secret"],
+            "num_days": cfg["num_leds"],
+        },
+        color_keys=("strava_events_color", "strava_no_events_color"),
+    ),
+    Integration(
+        "weather",
+        "led_control.integrations.weather_tracker:WeatherTracker",
+        ("weather_api_key", "weather_lat", "weather_lon"),
+        lambda cfg: {
+            "api_key": cfg["weather_api_key"],
+            "location": (cfg["weather_lat"], cfg["weather_lon"]),
+            "max_staleness": cfg["weather_max_staleness"],
+        },
+        role="weather",
+    ),
+]
+
+GENERIC_TRACKER = "led_control.integrations.generic_tracker:GenericTracker"
+
+
+def enabled_integrations(cfg, integrations=INTEGRATIONS):
+    """The integrations whose config is present, in display order."""
+    return [integration for integration in integrations if integration.enabled(cfg)]
+
+
+def integration_for(tracker, integrations=INTEGRATIONS):
+    """The integration a tracker was built from, or None (e.g. for GenericTrackers)."""
+    for integration in integrations:
+        if integration.built(tracker):
+            return integration
+    return None
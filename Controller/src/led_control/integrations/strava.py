@@ -3,23 +3,95 @@ Strava integration module for tracking fitness activities.
 
 Provides the StravaTracker class for retrieving and analyzing 
 recent Strava activities for a user.
+
+Activities are synced incrementally into a local cache keyed by activity
+id: each sync only asks for activities that started after the newest cached
+one (minus a short overlap to pick up edits and deletions), and entries that
+fall out of the window are evicted. The cache is persisted so a restart does
+not download the whole window again.
+
+Strava's 15-minute and daily request budgets are tracked from the
+X-RateLimit-Limit / X-RateLimit-Usage headers. When a budget is spent, or
+a 429 comes back, the tracker schedules its next fetch for the start of the
+next window and serves cached counts until then instead of sleeping.
 """
 
 import os
 import time
 import json
 import requests
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from led_control.core import metrics
 from led_control.integrations.base_tracker import BaseTracker
+from led_control.integrations.http_transport import get_transport
+
+ACTIVITY_CACHE_PATH = os.path.expanduser("~/.cache/ccal_strava_activities")
+
+RATE_LIMITED = metrics.counter(
+    "ccal_rate_limited_total", "Requests held back or refused by an API rate limit", ("service",)
+)
+
+
+class RateLimitBudget:
+    """
+    Strava's request budgets, as reported by the last response. Usage resets
+    at every quarter hour and at midnight UTC.
+    """
+
+    def __init__(self):
+        self.limits = None
+        self.usage = None
+        self.next_allowed = 0.0
+
+    @staticmethod
+    def _parse_pair(value):
+        try:
+            short, daily = (int(v) for v in value.split(","))
+            return short, daily
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _next_quarter_hour(now):
+        return (now // 900 + 1) * 900
+
+    @staticmethod
+    def _next_utc_midnight(now):
+        day = datetime.fromtimestamp(now, tz=timezone.utc).date() + timedelta(days=1)
+        return datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp()
+
+    def update(self, headers, now=None, throttled=False):
+        """
+        Record the budget from a response's headers. throttled marks a 429,
+        which holds fetches until the next window even without headers.
+        """
+        now = time.time() if now is None else now
+        limits = self._parse_pair(headers.get("X-RateLimit-Limit"))
+        usage = self._parse_pair(headers.get("X-RateLimit-Usage"))
+        if limits and usage:
+            self.limits, self.usage = limits, usage
+
+        if self.limits and self.usage and self.usage[1] >= self.limits[1]:
+            self.next_allowed = self._next_utc_midnight(now)
+        elif throttled or (self.limits and self.usage and self.usage[0] >= self.limits[0]):
+            self.next_allowed = self._next_quarter_hour(now)
+
+    def allows_fetch(self, now=None):
+        now = time.time() if now is None else now
+        return now >= self.next_allowed
+
 
 class StravaTracker(BaseTracker):
     """Tracks and analyzes recent Strava activities for a user."""
     
-    def __init__(self, client_id=None, client_secret=None, num_days=28, colors=None):
-        super().__init__(colors=colors)
+    def __init__(self, client_id=None, client_secret=None, num_days=28, colors=None, transport=None,
+                 activity_store=None):
+        super().__init__(colors=colors, activity_store=activity_store)
+        self._http = transport or get_transport()
         self.client_id = client_id
         self.client_secret = client_secret
         self.cache_path = os.path.expanduser("~/.cache/ccal_strava_token")
+        self.activity_cache_path = ACTIVITY_CACHE_PATH
         self.num_days = num_days
         self.access_token = None
         self.refresh_token = None
@@ -27,6 +99,11 @@ class StravaTracker(BaseTracker):
         self.auth_url = "https://www.strava.com/oauth/authorize"
         self.token_url = "https://www.strava.com/oauth/token"
         self.activities_url = "https://www.strava.com/api/v3/athlete/activities"
+        self.sync_overlap = 24 * 60 * 60
+        self.rate_limit = RateLimitBudget()
+        # activity id -> {"start": epoch seconds, "date": local date, "type": str}
+        self._activities = {}
+        self._load_activity_cache()
         
         if self._load_cached_token():
             pass
@@ -74,7 +151,7 @@ class StravaTracker(BaseTracker):
                 'grant_type': 'refresh_token'
             }
             
-            response = requests.post(self.token_url, data=data, timeout=10)
+            response = self._http.post(self.token_url, data=data)
             if response.status_code == 200:
                 token_data = response.json()
                 self._save_token(token_data)
@@ -134,7 +211,7 @@ class StravaTracker(BaseTracker):
                 'grant_type': 'authorization_code'
             }
             
-            response = requests.post(self.token_url, data=token_data, timeout=10)
+            response = self._http.post(self.token_url, data=token_data)
             
             if response.status_code == 200:
                 token_response = response.json()
@@ -150,22 +227,21 @@ class StravaTracker(BaseTracker):
             print(f"Authentication failed: {e}")
             return False
     
-    def _fetch_activities(self):
+    def _fetch_activities(self, after):
         """
-        Fetch recent Strava activities with pagination and rate limiting.
-        Returns list of activity dictionaries.
+        Fetch Strava activities that started after the given epoch time, with
+        pagination and rate limiting.
+        Returns list of activity dictionaries, or None if the fetch failed.
         """
         if not self.access_token:
             if not self.setup_authentication():
-                return []
+                return None
         
         activities = []
         page = 1
         per_page = 50
         max_activities = 200
         
-        after = int((datetime.now() - timedelta(days=self.num_days)).timestamp())
-        
         while len(activities) < max_activities:
             try:
                 headers = {'Authorization': f'Bearer {self.access_token}'}
@@ -175,18 +251,21 @@ class StravaTracker(BaseTracker):
                     'after': after
                 }
                 
-                response = requests.get(
+                response = self._http.get(
                     self.activities_url, 
                     headers=headers, 
-                    params=params,
-                    timeout=10
+                    params=params
                 )
+                self.rate_limit.update(response.headers, throttled=response.status_code == 429)
                 
                 if response.status_code == 200:
                     page_activities = response.json()
-                    if not page_activities: 
+                    activities.extend(page_activities or [])
+                    if len(page_activities or []) < per_page:
                         break
-                    activities.extend(page_activities)
+                    if not self.rate_limit.allows_fetch():
+                        # Budget spent mid-sync; the next window finishes it
+                        return None
                     page += 1
                     time.sleep(0.5)
                     
@@ -195,42 +274,107 @@ class StravaTracker(BaseTracker):
                         continue 
                     else:
                         print("Authentication expired. Please run setup again.")
-                        break
+                        return None
                         
                 elif response.status_code == 429:
-                    print("Rate limited, waiting...")
-                    time.sleep(60)
-                    continue
+                    RATE_LIMITED.inc(service="strava")
+                    retry_at = datetime.fromtimestamp(self.rate_limit.next_allowed)
+                    print(f"Rate limited, next Strava fetch at {retry_at:%H:%M}")
+                    return None
                     
                 else:
                     print(f"API Error {response.status_code}: {response.text[:200]}")
-                    break
+                    return None
                     
             except requests.RequestException as e:
                 print(f"Request failed: {e}")
-                break
+                return None
         
         return activities[:max_activities]
     
+    def _load_activity_cache(self):
+        """Load activities cached by a previous run."""
+        try:
+            if os.path.exists(self.activity_cache_path):
+                with open(self.activity_cache_path, 'r') as f:
+                    self._activities = json.load(f)
+        except Exception as e:
+            print(f"Failed to load cached activities: {e}")
+            self._activities = {}
+
+    def _save_activity_cache(self):
+        """Save the activity cache, replacing the old file atomically."""
+        try:
+            os.makedirs(os.path.dirname(self.activity_cache_path), exist_ok=True)
+            tmp_path = self.activity_cache_path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self._activities, f)
+            os.replace(tmp_path, self.activity_cache_path)
+        except Exception as e:
+            print(f"Failed to save activity cache: {e}")
+
+    @staticmethod
+    def _compact(activity):
+        """Keep only what the calendar and summary need from an activity."""
+        start = datetime.fromisoformat(activity['start_date'].replace('Z', '+00:00'))
+        local = activity.get('start_date_local') or activity['start_date']
+        return {
+            "start": start.timestamp(),
+            "date": local[:10],
+            "type": activity.get('type', 'Unknown'),
+        }
+
+    def _sync_activities(self):
+        """
+        Bring the activity cache up to date. Returns False if the sync failed
+        or the rate limit budget is spent, in which case the cache is left as
+        it was.
+        """
+        if not self.rate_limit.allows_fetch():
+            RATE_LIMITED.inc(service="strava")
+            return False
+
+        window_start = (datetime.now() - timedelta(days=self.num_days)).timestamp()
+        after = window_start
+        if self._activities:
+            newest = max(entry["start"] for entry in self._activities.values())
+            after = max(window_start, newest - self.sync_overlap)
+        after = int(after)
+
+        fetched = self._fetch_activities(after)
+        if fetched is None:
+            return False
+
+        # The fetch covers everything after `after`, so cached entries in that
+        # range that were not returned have been deleted on Strava.
+        activities = {
+            key: entry for key, entry in self._activities.items()
+            if window_start <= entry["start"] <= after
+        }
+        for activity in fetched:
+            try:
+                activities[str(activity['id'])] = self._compact(activity)
+            except Exception as e:
+                print(f"Error processing activity: {e}")
+
+        if activities != self._activities:
+            self._activities = activities
+            self._save_activity_cache()
+        return True
+
     def get_activity(self):
         """
         Count activities per day for the last num_days.
         Returns list of activity counts per day (0 = today, 1 = yesterday, etc.)
         """
-        activities = self._fetch_activities()
+        synced = self._sync_activities()
         activity_counts = [0] * self.num_days
         
-        now = datetime.now()
+        today = datetime.now().date()
         
-        for activity in activities:
+        for entry in self._activities.values():
             try:
-                start_date = activity.get('start_date_local', activity.get('start_date', ''))
-                if not start_date:
-                    continue
-                
-                activity_date = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-                
-                days_ago = (now.date() - activity_date.date()).days
+                days_ago = (today - datetime.fromisoformat(entry["date"]).date()).days
                 
                 if 0 <= days_ago < self.num_days:
                     activity_counts[days_ago] += 1
@@ -239,23 +383,28 @@ class StravaTracker(BaseTracker):
                 print(f"Error processing activity: {e}")
                 continue
         
+        if synced:
+            self.record_activity(activity_counts, today)
         return activity_counts
     
+    def store_key(self):
+        return "strava"
+
     def is_authenticated(self):
         """Check if we have valid Strava authentication."""
         return self.access_token is not None
     
     def get_recent_activity_summary(self):
         """Get a summary of recent activities for debugging."""
-        activities = self._fetch_activities()
-        if not activities:
+        self._sync_activities()
+        if not self._activities:
             return "No recent activities found"
         
         activity_types = {}
-        for activity in activities[:50]:
-            activity_type = activity.get('type', 'Unknown')
+        for entry in self._activities.values():
+            activity_type = entry.get('type', 'Unknown')
             activity_types[activity_type] = activity_types.get(activity_type, 0) + 1
         
-        summary = f"Last {len(activities)} activities: "
+        summary = f"Last {len(self._activities)} activities: "
         summary += ", ".join([f"{count} {type_}" for type_, count in activity_types.items()])
         return summary
@@ -6,14 +6,30 @@ from the OpenWeatherMap API for a specified location.
 
 Features:
 - Fetches weather data using an API key and geographic coordinates
-- Caches results for a configurable duration to minimize API calls
-- Handles network errors and retries failed requests
+- Stale-while-revalidate: once the cached reading is older than the cache
+  duration it is still returned immediately while a background thread
+  refreshes it, so showing the weather never waits on the API
+- Readings older than the maximum staleness are not shown
+- The last reading is persisted with its timestamp, so the first weather
+  animation after boot needs no network
+- Handles network errors; retries go through the shared HTTP transport
 - Designed for integration with LED control and other systems
 """
 
+import json
+import os
+import threading
 import time
-import requests
+from led_control.core import metrics
 from led_control.integrations.base_tracker import BaseTracker
+from led_control.integrations.http_transport import get_transport
+
+WEATHER_CACHE_PATH = os.path.expanduser("~/.cache/ccal_weather")
+
+CACHE_REQUESTS = metrics.counter(
+    "ccal_cache_requests_total", "Cache lookups by cache and result (hit, stale or miss)",
+    ("cache", "result"),
+)
 
 
 class WeatherTracker(BaseTracker):
@@ -26,7 +42,7 @@ class WeatherTracker(BaseTracker):
         weather = wt.get_weather()
     """
 
-    def __init__(self, api_key: str, location: tuple):
+    def __init__(self, api_key: str, location: tuple, transport=None, max_staleness=3 * 60 * 60):
         if api_key is None:
             raise ValueError("A valid API key must be provided.")
         if location is None:
@@ -35,25 +51,91 @@ class WeatherTracker(BaseTracker):
         self._url = f"https://api.openweathermap.org/data/2.5/weather?lat={location[0]}&lon={location[1]}&appid={api_key}&units=metric"
         self._current_weather = None
         self._cache_duration = 5 * 60  # 5 minutes
+        self._max_staleness = max_staleness
         self._cache_time = None
+        self._http = transport or get_transport()
+        self.cache_path = WEATHER_CACHE_PATH
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+        self._load_cache()
 
     def get_location(self):
         """Returns the location."""
         return self._location
 
+    def _load_cache(self):
+        """Load the last reading saved for this location."""
+        try:
+            if os.path.exists(self.cache_path):
+                with open(self.cache_path, 'r') as f:
+                    data = json.load(f)
+                if list(data.get("location", [])) == list(self._location):
+                    self._current_weather = data["weather"]
+                    self._cache_time = data["time"]
+        except Exception as e:
+            print(f"Failed to load cached weather: {e}")
+
+    def _save_cache(self):
+        """Persist the current reading and when it was taken."""
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    "location": list(self._location),
+                    "time": self._cache_time,
+                    "weather": self._current_weather,
+                }, f)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            print(f"Failed to save weather cache: {e}")
+
+    def _age(self):
+        if self._cache_time is None:
+            return None
+        return time.time() - self._cache_time
+
     def _cache_expired(self):
         """Checks if the cached data has expired."""
-        if self._cache_time is None:
-            return True
-        return (time.time() - self._cache_time) > self._cache_duration
+        age = self._age()
+        return age is None or age > self._cache_duration
+
+    def _too_stale(self):
+        """Checks if the cached data is too old to show at all."""
+        age = self._age()
+        return age is None or age > self._max_staleness
 
     # Really the only method that should be used externally
     def get_weather(self):
-        """Returns the current weather, updating if necessary."""
-        if self._current_weather is None or self._cache_expired():
-            weather = self._update_weather()
-            return weather
-        return self._current_weather
+        """
+        Returns the current weather. An expired reading is returned as is
+        while it is refreshed in the background; only a missing or too stale
+        reading is fetched before returning.
+        """
+        if self._current_weather is None or self._too_stale():
+            CACHE_REQUESTS.inc(cache="weather", result="miss")
+            self._update_weather()
+            if self._too_stale():
+                return None
+            return self._current_weather
+        weather = self._current_weather
+        if self._cache_expired():
+            CACHE_REQUESTS.inc(cache="weather", result="stale")
+            self.refresh_async()
+        else:
+            CACHE_REQUESTS.inc(cache="weather", result="hit")
+        return weather
+
+    def refresh_async(self):
+        """Start a background refresh unless one is already running."""
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return self._refresh_thread
+            self._refresh_thread = threading.Thread(
+                target=self._update_weather, name="weather-refresh", daemon=True
+            )
+            self._refresh_thread.start()
+            return self._refresh_thread
 
     def run(self, animation_runner, brightness=0.8, colors=None):
         """Run weather animation on the provided animation runner."""
@@ -65,15 +147,14 @@ class WeatherTracker(BaseTracker):
 
     def _update_weather(self):
         """Fetches the current weather from the API."""
-        retries = 3
-        timeout = 5
-        for _ in range(retries):
-            try:
-                response = requests.get(self._url, timeout=timeout)
-                if response.status_code == 200:
-                    self._current_weather = response.json()
-                    self._cache_time = time.time()
-                    return self._current_weather
-            except Exception:
-                continue
+        try:
+            # Retries with backoff are handled by the shared transport
+            response = self._http.get(self._url, timeout=5)
+            if response.status_code == 200:
+                self._current_weather = response.json()
+                self._cache_time = time.time()
+                self._save_cache()
+                return self._current_weather
+        except Exception:
+            pass
         return self._current_weather
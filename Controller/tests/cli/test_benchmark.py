@@ -0,0 +1,60 @@
+"""
+Unit tests for the animation render benchmark.
+
+This test suite covers:
+- Every case running against the in-memory backend without sleeping
+- The fields of a result and the JSON report
+- Regression detection against a baseline report
+"""
+
+import json
+
+import pytest
+
+from led_control.cli import benchmark
+
+
+@pytest.mark.parametrize("name", benchmark.CASES)
+def test_every_case_renders_frames(name):
+    result = benchmark.run_case(name, 28, duration=0.02, max_frames=50)
+    assert result["animation"] == name
+    assert 0 < result["frames"] <= 50
+    assert result["fps"] > 0
+    assert 0 < result["p50_ms"] <= result["p99_ms"]
+    assert result["alloc_bytes_per_frame"] >= 0
+
+
+def test_looping_animation_is_not_paced():
+    # At 20 fps a paced sun loop could not render 20 frames in 0.2 s
+    result = benchmark.run_case("sun", 28, duration=0.2, max_frames=20)
+    assert result["frames"] == 20
+
+
+def report(p50_by_case):
+    return {
+        "results": [
+            {"animation": name, "num_leds": leds, "p50_ms": p50}
+            for (name, leds), p50 in p50_by_case.items()
+        ]
+    }
+
+
+def test_find_regressions():
+    baseline = report({("sun", 28): 1.0, ("fog", 28): 1.0, ("rain", 28): 1.0})
+    current = report({("sun", 28): 1.2, ("fog", 28): 1.5, ("snow", 28): 9.0})
+    regressions = benchmark.find_regressions(current, baseline, threshold=0.25)
+    assert [(r["animation"], r["change"]) for r in regressions] == [("fog", 0.5)]
+
+
+def test_main_writes_report_and_fails_on_regression(tmp_path):
+    output = tmp_path / "bench.json"
+    args = ["--sizes", "28", "--animations", "default", "--duration", "0.02",
+            "--max-frames", "20"]
+    assert benchmark.main(args + ["--output", str(output)]) == 0
+    saved = json.loads(output.read_text())
+    assert saved["results"][0]["animation"] == "default"
+    assert "python" in saved["meta"]
+
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(report({("default", 28): 1e-6})))
+    assert benchmark.main(args + ["--baseline", str(baseline)]) == 1
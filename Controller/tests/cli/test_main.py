@@ -0,0 +1,111 @@
+"""
+Unit tests for the daemon entry point's startup.
+
+This test suite covers:
+- Importing the entry point without requests, http.server or any tracker module
+- The startup timeline: steps, instants and the first frame written
+- main() drawing the startup animation and printing the timeline
+  with --startup-profile
+"""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from unittest.mock import MagicMock, patch
+
+import led_control
+from led_control.cli import main as cli_main
+from led_control.cli.startup_profile import StartupProfile
+from led_control.core.led_backends import MemoryBackend
+
+
+def test_entry_point_import_defers_integrations():
+    code = textwrap.dedent("""
+        import sys
+        import led_control.cli.main
+        heavy = ["requests", "http.server", "concurrent.futures"]
+        print(" ".join(m for m in sys.modules
+                       if m in heavy or m.startswith("led_control.integrations.")))
+    """)
+    src = os.path.dirname(os.path.dirname(led_control.__file__))
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            check=True, env=dict(os.environ, PYTHONPATH=src))
+    # Only the registry itself, which imports no tracker
+    assert result.stdout.split() == ["led_control.integrations.registry"]
+
+
+def test_profile_orders_steps_and_marks():
+    profile = StartupProfile()
+    with profile.step("second"):
+        profile.mark("first")
+    profile.record("zeroth", profile.started, profile.started + 0.002)
+
+    labels = [entry[0] for entry in sorted(profile.entries, key=lambda e: e[1])]
+    assert labels == ["zeroth", "second", "first"]
+    lines = profile.format().splitlines()
+    assert lines[1].endswith("zeroth")
+    assert lines[1].split()[:2] == ["0.0", "2.0"]
+    # Instants have no duration column
+    assert lines[3].split() == [lines[3].split()[0], "first"]
+
+
+def test_mark_first_write_only_marks_once():
+    profile = StartupProfile()
+    backend = MemoryBackend(2)
+    profile.mark_first_write(backend)
+    backend.write(bytes(6))
+    backend.write(bytes(6))
+
+    assert [entry[0] for entry in profile.entries] == ["first frame"]
+    assert backend.frame_count == 2
+
+
+def write_config(tmp_path, **overrides):
+    config = {
+        "LED_BACKEND": "memory",
+        "NUM_LEDS": 4,
+        "STARTUP_ANIMATION": 1,
+        "FRAME_CACHE_DIR": "",
+        "ACTIVITY_DB": "",
+        "ON_TIME": 0,
+        "OFF_TIME": 0,
+        "OPENWEATHERMAP_API_KEY": "",
+        "WEATHER_LAT": 0,
+        "WEATHER_LON": 0,
+    }
+    config.update(overrides)
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(config))
+    return str(path)
+
+
+def test_main_prints_startup_profile(tmp_path, capsys):
+    manager = MagicMock()
+    manager.run_integration_cycle.side_effect = KeyboardInterrupt
+    with patch.object(cli_main, "CONFIG_PATH", write_config(tmp_path)), \
+            patch.object(cli_main, "setup_integrations", return_value=manager) as setup, \
+            patch.dict(os.environ, {"CCAL_LED_BACKEND": "memory"}), \
+            patch("signal.signal"):
+        cli_main.main(["--startup-profile"])
+
+    out = capsys.readouterr().out
+    assert "[PROFILE] Startup timeline:" in out
+    for label in ("import display modules", "load config", "init LEDs",
+                  "startup animation started", "first frame", "startup animation finished"):
+        assert label in out
+    assert setup.call_count == 1
+    manager.run_integration_cycle.assert_called_once()
+
+
+def test_main_without_flag_prints_no_profile(tmp_path, capsys):
+    manager = MagicMock()
+    manager.run_integration_cycle.side_effect = KeyboardInterrupt
+    with patch.object(cli_main, "CONFIG_PATH", write_config(tmp_path, STARTUP_ANIMATION=0)), \
+            patch.object(cli_main, "setup_integrations", return_value=manager), \
+            patch.dict(os.environ, {"CCAL_LED_BACKEND": "memory"}), \
+            patch("signal.signal"):
+        cli_main.main([])
+
+    assert "[PROFILE]" not in capsys.readouterr().out
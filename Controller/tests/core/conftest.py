@@ -0,0 +1,42 @@
+import pytest
+
+
+class RecordingStrip:
+    """
+    Stand-in for neopixel.NeoPixel that records every transmitted frame.
+
+    With pixelbuf=True it exposes the adafruit_pixelbuf buffer attributes that
+    LEDController copies frames into; with pixelbuf=False it only supports
+    per-pixel assignment, like a strip driver without those internals.
+    """
+
+    def __init__(self, num_leds, pixelbuf=True):
+        self.n = num_leds
+        self.shown = []
+        if pixelbuf:
+            self._offset = 0
+            self._pre_brightness_buffer = None
+            self._post_brightness_buffer = bytearray(num_leds * 3)
+        else:
+            self.pixels = [(0, 0, 0)] * num_leds
+
+    def __setitem__(self, idx, color):
+        if not hasattr(self, "pixels"):
+            raise AssertionError("pixelbuf strips should be written in bulk")
+        self.pixels[idx] = tuple(color)
+
+    @property
+    def show_count(self):
+        return len(self.shown)
+
+    def show(self):
+        if hasattr(self, "pixels"):
+            self.shown.append(list(self.pixels))
+        else:
+            self.shown.append(bytes(self._post_brightness_buffer))
+
+
+@pytest.fixture
+def recording_strip():
+    """Factory for RecordingStrip test doubles."""
+    return RecordingStrip
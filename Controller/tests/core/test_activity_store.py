@@ -0,0 +1,82 @@
+"""
+Unit tests for the SQLite activity store.
+
+This test suite covers:
+- Recording and reading back a today-first window
+- Upserts replacing existing days, one transaction per batch
+- Windows only returning the asked tracker and date range
+- Retention pruning
+- WAL mode and persistence across reopening
+"""
+
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from led_control.core.activity_store import ActivityStore
+
+TODAY = date.today()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ActivityStore(str(tmp_path / "activity.db"))
+    yield store
+    store.close()
+
+
+def test_window_round_trip(store):
+    assert store.record_window("github:me", [3, 0, 1, 2.5], today=TODAY)
+    assert store.window("github:me", 6, today=TODAY) == [3, 0, 1, 2.5, 0, 0]
+
+
+def test_window_shifts_with_the_day(store):
+    store.record_window("strava", [1, 2], today=TODAY)
+    assert store.window("strava", 3, today=TODAY + timedelta(days=1)) == [0, 1, 2]
+
+
+def test_upsert_replaces_days(store):
+    store.record_window("strava", [1, 1, 1], today=TODAY)
+    store.record("strava", {TODAY: 5, TODAY - timedelta(days=1): 0}, today=TODAY)
+    assert store.window("strava", 3, today=TODAY) == [5, 0, 1]
+
+
+def test_window_is_per_tracker_and_range(store):
+    store.record_window("a", [1] * 40, today=TODAY)
+    store.record_window("b", [9, 9], today=TODAY)
+    assert store.window("a", 28, today=TODAY) == [1] * 28
+    assert store.window("b", 3, today=TODAY) == [9, 9, 0]
+    assert store.window("missing", 2, today=TODAY) == [0, 0]
+    assert sorted(store.trackers()) == ["a", "b"]
+
+
+def test_prune_drops_rows_past_retention(tmp_path):
+    store = ActivityStore(str(tmp_path / "activity.db"), retention_days=30)
+    store.record_window("a", [1] * 40, today=TODAY)
+    assert store.prune(today=TODAY) == 9
+    assert store.window("a", 40, today=TODAY) == [1] * 31 + [0] * 9
+    store.close()
+
+
+def test_uses_wal_and_survives_reopen(tmp_path):
+    path = str(tmp_path / "activity.db")
+    store = ActivityStore(path)
+    store.record_window("a", [4, 5], today=TODAY)
+    assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    store.close()
+
+    # Readable by other tools without this package
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute("SELECT day, count FROM activity ORDER BY day").fetchall()
+    assert rows == [((TODAY - timedelta(days=1)).isoformat(), 5), (TODAY.isoformat(), 4)]
+
+    reopened = ActivityStore(path)
+    assert reopened.window("a", 2, today=TODAY) == [4, 5]
+    reopened.close()
+
+
+def test_errors_are_reported_not_raised(store):
+    store.close()
+    assert store.window("a", 2, today=TODAY) is None
+    assert not store.record_window("a", [1], today=TODAY)
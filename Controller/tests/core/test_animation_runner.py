@@ -1,15 +1,10 @@
-import sys
-import types
-
-# Mock board and neopixel modules before importing AnimationRunner
-sys.modules["board"] = types.ModuleType("board")
-sys.modules["neopixel"] = types.ModuleType("neopixel")
+import itertools
 
 import pytest
 from unittest.mock import MagicMock, patch
 
 
-from led_control.core.animation_runner import AnimationRunner
+from led_control.core.animation_runner import AnimationRunner, DEFAULT_FRAME_RATES
 
 
 @pytest.fixture
@@ -43,8 +38,8 @@ def test_theater_chase(mock_sleep, mock_led):
     runner.num_leds = 6
     runner.led.num_leds = 6
     runner.theater_chase((10, 20, 30), wait=0.01, brightness=0.7)
-    # Should call set_pixel and show multiple times
-    assert mock_led.set_pixel.call_count > 0
+    # Should render whole frames and show multiple times
+    assert mock_led.set_frame.call_count > 0
     assert mock_led.show.call_count > 0
 
 
@@ -54,8 +49,8 @@ def test_rainbow_cycle(mock_sleep, mock_led):
     runner.num_leds = 2
     runner.led.num_leds = 2
     runner.rainbow_cycle(wait=0.0, brightness=1.0)
-    # Should set each pixel and show for each j in range(256)
-    assert mock_led.set_pixel.call_count == 2 * 256
+    # Should render one frame and show for each j in range(256)
+    assert mock_led.set_frame.call_count == 256
     assert mock_led.show.call_count == 256
     mock_led.turn_all_off.assert_called_once()
 
@@ -65,9 +60,40 @@ def test_cloud_animation_loop(mock_sleep, mock_led):
     runner = AnimationRunner(mock_led)
     runner.num_leds = 30
     runner.led.num_leds = 30
-    # Run for a very short time
-    with patch("time.time", side_effect=[0, 0, 1, 2, 3, 4, 5, 6]):
+    # Run for a very short time on a clock that advances on every read
+    with patch("time.monotonic", side_effect=itertools.count(0, 0.5)):
         runner.cloud_animation_loop(end_time=2, brightness=0.5)
     assert mock_led.set_pixel.call_count > 0
     assert mock_led.show.call_count > 0
     assert mock_led.turn_all_off.call_count > 0
+
+
+@patch("time.sleep", return_value=None)
+def test_loops_record_frame_stats(mock_sleep, mock_led):
+    runner = AnimationRunner(mock_led, frame_rates={"rain": 5})
+    with patch("time.monotonic", side_effect=itertools.count(0, 0.1)):
+        runner.rain_animation_loop(end_time=2, brightness=0.5)
+    stats = runner.frame_stats()["rain"]
+    assert stats["fps"] == 5
+    assert stats["frames"] == mock_led.show.call_count
+
+
+def test_update_calendar_keeps_absolute_levels(mock_led):
+    runner = AnimationRunner(mock_led)
+    colors = {"event": (0, 255, 0), "no_events": (30, 30, 30)}
+    runner.update_calendar([4, 0, 2, 0, 0], colors, brightness=0.3)
+    mock_led.set_brightness.assert_called_once_with(1.0)
+    levels = [c.args[2] for c in mock_led.set_pixel.call_args_list]
+    assert levels[0] == 1.0
+    assert levels[1] == 0.3
+    assert levels[2] == 0.55
+
+
+def test_invalid_frame_rates_ignored(mock_led):
+    runner = AnimationRunner(
+        mock_led, frame_rates={"rain": 0, "snow": -5, "fog": "fast", "sun": 12}
+    )
+    assert runner.frame_rates["rain"] == DEFAULT_FRAME_RATES["rain"]
+    assert runner.frame_rates["snow"] == DEFAULT_FRAME_RATES["snow"]
+    assert runner.frame_rates["fog"] == DEFAULT_FRAME_RATES["fog"]
+    assert runner.frame_rates["sun"] == 12
@@ -0,0 +1,54 @@
+import pytest
+
+from led_control.core.color_pipeline import ColorPipeline
+from led_control.core.framebuffer import FrameBuffer
+
+
+def test_full_brightness_is_identity():
+    pipeline = ColorPipeline(1.0)
+    assert pipeline.apply((0, 128, 255)) == (0, 128, 255)
+
+
+def test_tables_rebuilt_only_on_change():
+    pipeline = ColorPipeline(0.5)
+    tables = pipeline.tables
+    assert not pipeline.set_brightness(0.5)
+    assert pipeline.tables is tables
+    assert pipeline.set_brightness(0.25)
+    assert pipeline.tables is not tables
+
+
+@pytest.mark.parametrize("brightness", [0.01, 0.05, 0.1])
+def test_low_brightness_does_not_collapse(brightness):
+    pipeline = ColorPipeline(brightness, gamma=2.2)
+    assert pipeline.apply((30, 30, 30)) != (0, 0, 0)
+    assert pipeline.apply((0, 0, 0)) == (0, 0, 0)
+
+
+def test_zero_brightness_is_dark():
+    pipeline = ColorPipeline(0.0)
+    assert pipeline.apply((255, 255, 255)) == (0, 0, 0)
+
+
+def test_white_balance_per_channel():
+    pipeline = ColorPipeline(1.0, white_balance=(1.0, 0.5, 0.25))
+    assert pipeline.apply((255, 255, 255)) == (255, 128, 64)
+
+
+def test_render_respects_native_order():
+    frame = FrameBuffer(1, pixel_order="GRB")
+    frame.set_pixel(0, (255, 255, 255))
+    pipeline = ColorPipeline(1.0, white_balance=(1.0, 0.5, 0.25))
+    # GRB byte order: green first
+    assert pipeline.render(frame) == bytearray([128, 255, 64])
+
+
+def test_scale_relative_level():
+    assert ColorPipeline.scale((200, 100, 0), 1.0) == (200, 100, 0)
+    assert ColorPipeline.scale((200, 100, 0), 0.5) == (100, 50, 0)
+    assert ColorPipeline.scale((200, 100, 0), -1.0) == (0, 0, 0)
+
+
+def test_invalid_gamma():
+    with pytest.raises(ValueError):
+        ColorPipeline(1.0, gamma=0)
@@ -0,0 +1,212 @@
+"""
+Unit tests for the layered compositor.
+
+This test suite covers:
+- Transparent pixels showing the layers below
+- Opacity, brightness and every blend mode
+- Re-compositing only from the lowest changed layer
+- Layer settings validation, hidden layers and unknown layers
+- One merged frame per show(), in the strip's byte order
+- AnimationRunner drawing the calendar, weather and temperature into layers
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from led_control.core.animation_runner import AnimationRunner
+from led_control.core.compositor import LAYERS_BLENDED, Compositor
+from led_control.core.frame_clock import deadline
+from led_control.core.led_backends import MemoryBackend
+from led_control.core.led_controller import LEDController
+
+
+def make_compositor(num_leds=4, pixel_order="RGB"):
+    backend = MemoryBackend(num_leds, pixel_order=pixel_order)
+    led = LEDController(num_leds=num_leds, backend=backend)
+    return Compositor(led), backend
+
+
+def pixel(frame, idx):
+    return tuple(frame[idx * 3:idx * 3 + 3])
+
+
+def test_empty_compositor_is_black():
+    compositor, _ = make_compositor()
+    assert compositor.compose() == bytes(12)
+
+
+def test_transparent_pixels_show_layers_below():
+    compositor, _ = make_compositor()
+    compositor.layer("calendar").fill((0, 200, 0))
+    compositor.layer("weather").set_pixel(1, (0, 0, 255))
+    frame = compositor.compose()
+    assert [pixel(frame, i) for i in range(4)] == [
+        (0, 200, 0), (0, 0, 255), (0, 200, 0), (0, 200, 0)
+    ]
+
+    # Cleared overlays uncover the calendar again; black is drawn, not transparent
+    compositor.layer("weather").clear()
+    compositor.layer("text").set_pixel(2, (0, 0, 0))
+    frame = compositor.compose()
+    assert [pixel(frame, i) for i in range(4)] == [
+        (0, 200, 0), (0, 200, 0), (0, 0, 0), (0, 200, 0)
+    ]
+
+
+def test_opacity_and_brightness():
+    compositor, _ = make_compositor(num_leds=1)
+    compositor.layer("calendar").fill((200, 0, 0))
+    weather = compositor.layer("weather")
+    weather.fill((0, 0, 200))
+    weather.configure(opacity=0.5)
+    assert pixel(compositor.compose(), 0) == (100, 0, 100)
+
+    weather.configure(opacity=1.0)
+    weather.set_brightness(0.5)
+    assert pixel(compositor.compose(), 0) == (0, 0, 100)
+
+
+@pytest.mark.parametrize("blend, expected", [
+    ("normal", (50, 200, 0)),
+    ("add", (150, 255, 0)),
+    ("multiply", (19, 78, 0)),
+    ("screen", (131, 222, 0)),
+    ("lighten", (100, 200, 0)),
+])
+def test_blend_modes(blend, expected):
+    compositor, _ = make_compositor(num_leds=1)
+    compositor.layer("calendar").fill((100, 100, 0))
+    weather = compositor.layer("weather")
+    weather.fill((50, 200, 0))
+    weather.configure(blend=blend)
+    assert pixel(compositor.compose(), 0) == expected
+
+
+def test_only_changed_layers_are_recomposited():
+    compositor, _ = make_compositor()
+    compositor.layer("calendar").fill((0, 200, 0))
+    weather = compositor.layer("weather")
+    compositor.compose()
+    calendar_blends = LAYERS_BLENDED.value(layer="calendar")
+
+    for i in range(3):
+        weather.clear()
+        weather.set_pixel(i, (0, 0, 255))
+        assert pixel(compositor.compose(), i) == (0, 0, 255)
+    # The calendar below was blended once, not once per overlay frame
+    assert LAYERS_BLENDED.value(layer="calendar") == calendar_blends
+
+    frame = compositor.compose()
+    assert compositor.compose() is frame
+
+
+def test_hidden_layer_is_skipped():
+    compositor, _ = make_compositor(num_leds=1)
+    compositor.layer("calendar").fill((0, 200, 0))
+    compositor.layer("weather").fill((0, 0, 255))
+    compositor.configure({"weather": {"visible": False}})
+    assert pixel(compositor.compose(), 0) == (0, 200, 0)
+
+
+def test_configure_resets_unlisted_layers():
+    compositor, _ = make_compositor()
+    compositor.configure({"weather": {"opacity": 0.4, "blend": "screen"}})
+    compositor.configure({})
+    weather = compositor.layer("weather")
+    assert (weather.opacity, weather.blend, weather.visible) == (1.0, "normal", True)
+
+
+@pytest.mark.parametrize("settings", [
+    {"clouds": {}},
+    {"weather": {"opacity": 1.5}},
+    {"weather": {"opacity": True}},
+    {"weather": {"blend": "dodge"}},
+    {"weather": {"shadow": 1}},
+    {"text": {"opacity": 0.5}, "weather": "screen"},
+    [],
+])
+def test_invalid_settings_change_nothing(settings):
+    compositor, _ = make_compositor()
+    with pytest.raises(ValueError):
+        compositor.configure(settings)
+    assert all(layer.opacity == 1.0 for layer in compositor.layers)
+
+
+def test_show_sends_one_frame_in_strip_order():
+    compositor, backend = make_compositor(num_leds=2, pixel_order="GRB")
+    compositor.layer("calendar").fill((10, 20, 30))
+    compositor.layer("text").set_pixel(1, (1, 2, 3))
+    assert compositor.show()
+    assert backend.last_frame == bytes([20, 10, 30, 2, 1, 3])
+    # Nothing changed: nothing is sent
+    assert not compositor.layer("weather").show()
+    assert backend.frame_count == 1
+
+
+def test_show_runs_pipeline_at_full_brightness():
+    compositor, backend = make_compositor(num_leds=1)
+    compositor.led.set_brightness(0.2)
+    compositor.layer("calendar").fill((100, 100, 100))
+    compositor.show()
+    assert backend.last_frame == bytes([100, 100, 100])
+
+
+def test_layer_displays_numbers():
+    compositor, _ = make_compositor(num_leds=28)
+    text = compositor.layer("text")
+    text.display_number(7, (255, 255, 255))
+    lit = [i for i in range(28) if text.alpha[i]]
+    assert lit
+
+
+@pytest.fixture
+def layered_runner():
+    backend = MemoryBackend(28, pixel_order="RGB")
+    led = LEDController(num_leds=28, backend=backend)
+    compositor = Compositor(led)
+    return AnimationRunner(led, compositor=compositor, use_numpy=False), backend
+
+
+CALENDAR_COLORS = {"event": (0, 255, 0), "no_events": (30, 30, 30)}
+
+
+def test_rain_falls_over_the_calendar(layered_runner):
+    runner, backend = layered_runner
+    runner.update_calendar([1] * 28, CALENDAR_COLORS, brightness=0.8)
+    calendar = backend.last_frame
+
+    with patch("time.sleep", return_value=None):
+        runner.rain_animation_loop(deadline(0.05), drop_chance=0.5, brightness=0.8)
+
+    frame = backend.last_frame
+    rain = [i for i in range(28) if pixel(frame, i) != pixel(calendar, i)]
+    # Drops replace some days; every other day still shows the calendar
+    assert len(rain) < 28
+    assert all(pixel(frame, i) == (0, 255, 0) for i in range(28) if i not in rain)
+
+
+def test_temperature_overlays_calendar_until_next_update(layered_runner):
+    runner, backend = layered_runner
+    runner.update_calendar([0] * 28, CALENDAR_COLORS, brightness=1.0)
+    calendar = backend.last_frame
+
+    runner.run_weather_animation({"weather": [{"main": "unknown"}], "main": {"temp": 7}},
+                                 duration_sec=0)
+    text = runner.compositor.layer("text")
+    lit = [i for i in range(28) if text.alpha[i]]
+    frame = backend.last_frame
+    assert lit and all(pixel(frame, i) == (255, 255, 255) for i in lit)
+    assert all(pixel(frame, i) == pixel(calendar, i) for i in range(28) if i not in lit)
+
+    runner.update_calendar([0] * 28, CALENDAR_COLORS, brightness=1.0)
+    assert backend.last_frame == calendar
+
+
+def test_turn_all_off_clears_every_layer(layered_runner):
+    runner, backend = layered_runner
+    runner.update_calendar([1] * 28, CALENDAR_COLORS)
+    runner.display_number(12)
+    runner.turn_all_off()
+    assert backend.last_frame == bytes(28 * 3)
+    assert all(layer.is_empty for layer in runner.compositor.layers)
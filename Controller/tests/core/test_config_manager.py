@@ -3,8 +3,11 @@ import builtins
 import logging
 import threading
 import tempfile
-import shutil
 import json
+from unittest.mock import patch
+
+import pytest
+
 from led_control.core.config_manager import ConfigManager
 
 CONFIG_FILE = "config/config.json"
@@ -79,20 +82,29 @@ def test_update_config_atomic_write(tmp_path):
     cnf_man = ConfigManager(str(config_file))
     updated_conf = dict(CONFIG)
     updated_conf["BRIGHTNESS"] = 0.9
-    orig_move = shutil.move
 
-    def fail_move(src, dst):
-        raise OSError("Simulated move failure")
-
-    shutil.move = fail_move
-    try:
+    with patch("led_control.core.config_manager.os.replace",
+               side_effect=OSError("Simulated rename failure")):
         result = cnf_man.update_config(updated_conf)
-        assert not result
-        with open(config_file) as f:
-            data = json.load(f)
-        assert data == CONFIG
-    finally:
-        shutil.move = orig_move
+    assert not result
+    with open(config_file) as f:
+        data = json.load(f)
+    assert data == CONFIG
+    assert cnf_man.conf == CONFIG
+    # The temp file is not left behind
+    assert sorted(p.name for p in tmp_path.iterdir() if not p.name.endswith(".lock")) == ["config.json"]
+
+
+def test_update_config_fsyncs_and_keeps_mode(tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(CONFIG))
+    os.chmod(config_file, 0o644)
+    cnf_man = ConfigManager(str(config_file))
+    with patch("led_control.core.config_manager.os.fsync", wraps=os.fsync) as fsync:
+        assert cnf_man.update_config(dict(CONFIG, BRIGHTNESS=0.5))
+    assert fsync.call_count >= 1
+    assert os.stat(config_file).st_mode & 0o777 == 0o644
+    assert json.loads(config_file.read_text())["BRIGHTNESS"] == 0.5
 
 
 def test_logging_on_json_error(tmp_path, caplog):
@@ -130,3 +142,134 @@ def test_thread_safety(tmp_path):
     t1.join()
     t2.join()
     assert cnf_man.conf["BRIGHTNESS"] in (0.1, 0.2)
+
+
+def _rewrite(path, config):
+    """Write the file and move its mtime forward so the change is visible."""
+    path.write_text(json.dumps(config))
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_snapshot_is_read_only(tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(CONFIG))
+    cnf_man = ConfigManager(str(config_file))
+    try:
+        cnf_man.conf["BRIGHTNESS"] = 1.0
+        assert False, "snapshot should be read-only"
+    except TypeError:
+        pass
+
+
+def test_check_for_changes_swaps_snapshot_and_notifies(tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(CONFIG))
+    cnf_man = ConfigManager(str(config_file))
+    old = cnf_man.conf
+    seen = []
+    cnf_man.subscribe(lambda conf, changes: seen.append((conf, changes)))
+
+    assert cnf_man.check_for_changes() == {}
+    _rewrite(config_file, dict(CONFIG, BRIGHTNESS=0.2, POLL_TIME=60))
+    changes = cnf_man.check_for_changes()
+
+    assert changes == {"BRIGHTNESS": (0.6, 0.2), "POLL_TIME": (None, 60)}
+    assert seen == [(cnf_man.conf, changes)]
+    assert old["BRIGHTNESS"] == 0.6
+    assert cnf_man.conf["BRIGHTNESS"] == 0.2
+
+
+def test_broken_file_keeps_previous_snapshot(tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(CONFIG))
+    cnf_man = ConfigManager(str(config_file))
+    config_file.write_text('{"BRIGHTNESS": ')
+    assert cnf_man.check_for_changes() == {}
+    assert cnf_man.conf == CONFIG
+
+
+def test_unsubscribe_and_update_config_notifies(tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(CONFIG))
+    cnf_man = ConfigManager(str(config_file))
+    seen = []
+    unsubscribe = cnf_man.subscribe(lambda conf, changes: seen.append(changes))
+    cnf_man.update_config(dict(CONFIG, ON_TIME=8))
+    unsubscribe()
+    cnf_man.update_config(dict(CONFIG, ON_TIME=9))
+    assert seen == [{"ON_TIME": (10, 8)}]
+
+
+def test_watch_picks_up_changes(tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(CONFIG))
+    cnf_man = ConfigManager(str(config_file))
+    changed = threading.Event()
+    cnf_man.subscribe(lambda conf, changes: changed.set())
+    cnf_man.watch(interval=0.01)
+    try:
+        _rewrite(config_file, dict(CONFIG, OFF_TIME=23))
+        assert changed.wait(5)
+    finally:
+        cnf_man.stop_watching()
+    assert cnf_man.conf["OFF_TIME"] == 23
+
+
+def test_delayed_writes_are_coalesced(tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(CONFIG))
+    cnf_man = ConfigManager(str(config_file), write_delay=60)
+    with patch("led_control.core.config_manager.os.replace", wraps=os.replace) as replace:
+        for level in (0.1, 0.2, 0.3):
+            assert cnf_man.update_config(dict(CONFIG, BRIGHTNESS=level))
+        # Applied in memory straight away, not yet on disk
+        assert cnf_man.conf["BRIGHTNESS"] == 0.3
+        assert json.loads(config_file.read_text()) == CONFIG
+        assert cnf_man.check_for_changes() == {}
+        cnf_man.close()
+    assert replace.call_count == 1
+    assert json.loads(config_file.read_text())["BRIGHTNESS"] == 0.3
+
+
+def test_delayed_write_happens_after_the_delay(tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(CONFIG))
+    cnf_man = ConfigManager(str(config_file), write_delay=0.01)
+    cnf_man.update_config(dict(CONFIG, ON_TIME=7))
+    cnf_man._write_timer.join(5)
+    assert json.loads(config_file.read_text())["ON_TIME"] == 7
+    # Our own write is not reported as an external change
+    assert cnf_man.check_for_changes() == {}
+
+
+def test_failed_delayed_write_is_retried(tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(CONFIG))
+    cnf_man = ConfigManager(str(config_file), write_delay=60)
+    cnf_man.update_config(dict(CONFIG, ON_TIME=7))
+    with patch("led_control.core.config_manager.os.replace", side_effect=OSError("disk full")):
+        assert not cnf_man.flush()
+    assert cnf_man.flush()
+    assert json.loads(config_file.read_text())["ON_TIME"] == 7
+
+
+def test_write_waits_for_lock_held_by_another_process(tmp_path):
+    fcntl = pytest.importorskip("fcntl")
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(CONFIG))
+    cnf_man = ConfigManager(str(config_file))
+    done = threading.Event()
+    # flock locks belong to the open file, so this behaves like another process
+    with open(str(config_file) + ".lock", "a") as other:
+        fcntl.flock(other, fcntl.LOCK_EX)
+        writer = threading.Thread(
+            target=lambda: done.set() if cnf_man.update_config(dict(CONFIG, ON_TIME=7)) else None
+        )
+        writer.start()
+        assert not done.wait(0.2)
+        assert json.loads(config_file.read_text()) == CONFIG
+        fcntl.flock(other, fcntl.LOCK_UN)
+    writer.join(5)
+    assert done.is_set()
+    assert json.loads(config_file.read_text())["ON_TIME"] == 7
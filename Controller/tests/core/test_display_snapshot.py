@@ -0,0 +1,72 @@
+"""
+Unit tests for the display snapshot.
+
+This test suite covers:
+- Saving and loading the activity windows and colors
+- Shifting windows saved on an earlier day
+- Missing, corrupt, outdated and future snapshots loading as empty
+- Failed saves leaving the previous snapshot and no temporary files
+"""
+
+import json
+import os
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from led_control.core.display_snapshot import DisplaySnapshot, shift_window
+
+TODAY = date(2025, 3, 10)
+COLORS = {"event": [0, 255, 0], "no_events": [30, 30, 30]}
+
+
+def make_snapshot(tmp_path):
+    return DisplaySnapshot(str(tmp_path / "snapshot.json"))
+
+
+def test_round_trip(tmp_path):
+    snapshot = make_snapshot(tmp_path)
+    entries = {"github:octocat": {"activity": [3, 0, 1], "colors": COLORS}}
+    assert snapshot.save(entries, today=TODAY)
+    assert snapshot.load(today=TODAY) == entries
+
+
+def test_windows_shift_to_today(tmp_path):
+    snapshot = make_snapshot(tmp_path)
+    snapshot.save({"strava": {"activity": [3, 2, 1, 0], "colors": COLORS}}, today=TODAY)
+    loaded = snapshot.load(today=TODAY + timedelta(days=2))
+    assert loaded["strava"]["activity"] == [0, 0, 3, 2]
+
+
+def test_shift_window():
+    assert shift_window([1, 2, 3], 0) == [1, 2, 3]
+    assert shift_window([1, 2, 3], 1) == [0, 1, 2]
+    assert shift_window([1, 2, 3], 5) == [0, 0, 0]
+
+
+def test_missing_snapshot_is_empty(tmp_path):
+    assert make_snapshot(tmp_path).load(today=TODAY) == {}
+
+
+def test_unusable_snapshots_are_empty(tmp_path, capsys):
+    snapshot = make_snapshot(tmp_path)
+    with open(snapshot.path, "w") as f:
+        f.write("{not json")
+    assert snapshot.load(today=TODAY) == {}
+    assert "[ERROR]" in capsys.readouterr().out
+
+    snapshot.save({"a": {"activity": [1], "colors": COLORS}}, today=TODAY)
+    # Saved "tomorrow": the clock was wrong
+    assert snapshot.load(today=TODAY - timedelta(days=1)) == {}
+
+    with open(snapshot.path, "w") as f:
+        json.dump({"version": 0, "day": TODAY.isoformat(), "trackers": {}}, f)
+    assert snapshot.load(today=TODAY) == {}
+
+
+def test_failed_save_keeps_previous_snapshot(tmp_path):
+    snapshot = make_snapshot(tmp_path)
+    snapshot.save({"a": {"activity": [1], "colors": COLORS}}, today=TODAY)
+    with patch("led_control.core.display_snapshot.os.replace", side_effect=OSError("disk")):
+        assert not snapshot.save({"a": {"activity": [2], "colors": COLORS}}, today=TODAY)
+    assert snapshot.load(today=TODAY)["a"]["activity"] == [1]
+    assert os.listdir(tmp_path) == ["snapshot.json"]
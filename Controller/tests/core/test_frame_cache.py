@@ -0,0 +1,91 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from led_control.core.animation_runner import AnimationRunner
+from led_control.core.frame_cache import CachedAnimation, FrameCache
+from led_control.core.led_controller import LEDController
+
+
+@pytest.fixture
+def make_led(recording_strip):
+    def factory(num_leds=6, brightness=0.5):
+        return LEDController(
+            num_leds=num_leds, brightness=brightness, strip=recording_strip(num_leds)
+        )
+
+    return factory
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch("time.sleep", return_value=None):
+        yield
+
+
+def test_replay_matches_live_render(tmp_path, make_led):
+    live = make_led()
+    AnimationRunner(live).rainbow_cycle(wait=0.01)
+
+    cached = make_led()
+    runner = AnimationRunner(cached, frame_cache=FrameCache(str(tmp_path)))
+    runner.rainbow_cycle(wait=0.01)
+    assert len(os.listdir(tmp_path)) == 1
+    assert cached.strip.shown == live.strip.shown
+
+    # Second run replays the compiled file
+    cached.strip.shown.clear()
+    runner.rainbow_cycle(wait=0.01)
+    assert cached.strip.shown == live.strip.shown
+
+
+def test_frame_file_layout(tmp_path, make_led):
+    led = make_led()
+    runner = AnimationRunner(led, frame_cache=FrameCache(str(tmp_path)))
+    runner.color_wipe((255, 0, 0), wait=0.02)
+    (path,) = tmp_path.iterdir()
+    with CachedAnimation(str(path)) as anim:
+        assert len(anim) == 6
+        assert anim.holds[0] == pytest.approx(0.02)
+        frames = [bytes(frame) for frame, _ in anim]
+    assert frames[-1] == bytes([0, 128, 0] * 6)
+
+
+def test_parameter_change_rebuilds_and_evicts(tmp_path, make_led):
+    cache = FrameCache(str(tmp_path))
+    led = make_led()
+    runner = AnimationRunner(led, frame_cache=cache)
+    runner.color_wipe((255, 0, 0), wait=0.02)
+    first = set(os.listdir(tmp_path))
+    runner.color_wipe((255, 0, 0), wait=0.02, brightness=0.8)
+    second = set(os.listdir(tmp_path))
+    assert len(second) == 1
+    assert first != second
+
+
+def test_corrupt_file_is_recompiled(tmp_path, make_led):
+    cache = FrameCache(str(tmp_path))
+    led = make_led()
+    path = cache.path_for("flash", {}, led)
+    os.makedirs(tmp_path, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"garbage")
+    AnimationRunner(led, frame_cache=cache).flash()
+    with CachedAnimation(path) as anim:
+        assert len(anim) > 0
+
+
+def test_failed_compile_leaves_no_temp_file(tmp_path, make_led):
+    cache = FrameCache(str(tmp_path))
+    led = make_led()
+
+    def render(offscreen):
+        offscreen.fill((255, 0, 0))
+        yield 0.1
+
+    path = os.path.join(str(tmp_path), "fill.frames")
+    with patch("led_control.core.frame_cache.os.replace", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            cache.compile(path, led, render)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,68 @@
+from unittest.mock import patch
+
+import pytest
+
+from led_control.core.frame_clock import FrameClock
+
+
+class FakeTime:
+    """Monotonic clock that only moves when sleep() is called or advance() is used."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_time():
+    fake = FakeTime()
+    with patch("time.monotonic", fake.monotonic), patch("time.sleep", fake.sleep):
+        yield fake
+
+
+def test_sleeps_to_absolute_deadline(fake_time):
+    clock = FrameClock(10)
+    clock.start()
+    fake_time.advance(0.03)  # render cost
+    assert clock.tick() == 0
+    assert fake_time.sleeps[-1] == pytest.approx(0.07)
+    fake_time.advance(0.05)
+    clock.tick()
+    assert fake_time.now == pytest.approx(100.2)
+    assert clock.late == 0
+
+
+def test_late_frame_drops_missed_periods(fake_time):
+    clock = FrameClock(10)
+    clock.start()
+    fake_time.advance(0.35)
+    assert clock.tick() == 2
+    assert clock.late == 1
+    assert clock.dropped == 2
+    # Next deadline is realigned to the frame grid, not rendered back-to-back
+    clock.tick()
+    assert fake_time.now == pytest.approx(100.4)
+
+
+def test_resync_resets_deadline(fake_time):
+    clock = FrameClock(10)
+    clock.start()
+    fake_time.advance(1.0)
+    clock.resync()
+    assert clock.tick() == 0
+    assert clock.stats() == {"fps": 10.0, "frames": 1, "late": 0, "dropped": 0}
+
+
+def test_rejects_non_positive_fps():
+    with pytest.raises(ValueError):
+        FrameClock(0)
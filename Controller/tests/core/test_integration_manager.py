@@ -0,0 +1,216 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+from led_control.core.display_snapshot import DisplaySnapshot
+from led_control.core.integration_manager import IntegrationManager
+
+
+class FakeTracker:
+    """Tracker whose fetch blocks until its release event is set."""
+
+    def __init__(self, activity, blocked=False, error=None, fetch_timeout=None):
+        self.activity = activity
+        self.error = error
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not blocked:
+            self.release.set()
+        if fetch_timeout is not None:
+            self.fetch_timeout = fetch_timeout
+
+    def get_activity(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        if self.error:
+            raise self.error
+        return self.activity
+
+    def get_colors(self):
+        return {"event": (0, 255, 0), "no_events": (30, 30, 30)}
+
+
+def test_instant_tracker_does_not_deadlock():
+    tracker = FakeTracker([1] * 28)
+    manager = IntegrationManager(MagicMock(), trackers=[tracker], max_workers=1)
+    for _ in range(20):
+        manager.refresh_all()
+    assert manager.latest_activity(tracker) == [1] * 28
+    manager.close()
+
+
+def test_refresh_runs_trackers_in_parallel():
+    trackers = [FakeTracker([i + 1] * 28, blocked=True) for i in range(3)]
+    manager = IntegrationManager(MagicMock(), trackers=trackers, max_workers=3)
+
+    def release_when_all_started():
+        # Only possible if all three fetches are in flight at the same time
+        for tracker in trackers:
+            tracker.started.wait(5)
+        for tracker in trackers:
+            tracker.release.set()
+
+    releaser = threading.Thread(target=release_when_all_started)
+    releaser.start()
+    manager.refresh_all()
+    releaser.join()
+    assert [manager.latest_activity(t)[0] for t in trackers] == [1, 2, 3]
+    manager.close()
+
+
+def test_slow_tracker_bounded_by_deadline():
+    fast = FakeTracker([1] * 28)
+    slow = FakeTracker([2] * 28, blocked=True, fetch_timeout=0.01)
+    manager = IntegrationManager(MagicMock(), trackers=[fast, slow], max_workers=2)
+    manager.refresh_all()
+    assert manager.latest_activity(fast) == [1] * 28
+    assert manager.latest_activity(slow) is None
+
+    # The late result lands once the fetch finishes, without a new submit
+    stored = threading.Event()
+    manager._pending[slow].add_done_callback(lambda f: stored.set())
+    slow.release.set()
+    assert stored.wait(5)
+    assert manager.latest_activity(slow) == [2] * 28
+    assert slow.calls == 1
+    manager.close()
+
+
+def test_failed_fetch_keeps_previous_result():
+    tracker = FakeTracker([3] * 28)
+    manager = IntegrationManager(MagicMock(), trackers=[tracker], max_workers=1)
+    manager.refresh_all()
+    tracker.error = RuntimeError("boom")
+    manager.refresh_all()
+    assert manager.latest_activity(tracker) == [3] * 28
+    manager.close()
+
+
+@patch("led_control.core.integration_manager.time.sleep", return_value=None)
+def test_display_rotation_reads_latest_results(mock_sleep):
+    runner = MagicMock()
+    tracker = FakeTracker([1] * 28)
+    manager = IntegrationManager(runner, trackers=[tracker], max_workers=2)
+    manager.update_calendar_display(poll_time=10)
+    assert tracker.calls == 1
+    assert runner.update_calendar.call_count == manager.iterations_per_cycle
+    manager.close()
+
+
+@patch("led_control.core.integration_manager.time.sleep", return_value=None)
+def test_serial_mode_fetches_inline(mock_sleep):
+    runner = MagicMock()
+    tracker = FakeTracker([1] * 28)
+    manager = IntegrationManager(runner, trackers=[tracker], max_workers=0)
+    manager.update_calendar_display(poll_time=10)
+    assert tracker.calls == manager.iterations_per_cycle
+
+
+def test_settings_change_redraws_current_tracker():
+    runner = MagicMock()
+    tracker = FakeTracker([1] * 28)
+    manager = IntegrationManager(runner, trackers=[tracker], max_workers=0)
+    manager.iterations_per_cycle = 1
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 1:
+            manager.apply_settings(brightness=0.3)
+
+    with patch("led_control.core.integration_manager.time.sleep", side_effect=fake_sleep):
+        manager.update_calendar_display(brightness=0.8, poll_time=4)
+
+    levels = [c.kwargs["brightness"] for c in runner.update_calendar.call_args_list]
+    assert levels == [0.8, 0.3]
+    assert all(s <= 1.0 for s in sleeps)
+
+
+def test_unknown_setting_rejected():
+    manager = IntegrationManager(MagicMock())
+    try:
+        manager.apply_settings(colour="red")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_display_reads_window_from_activity_store():
+    store = MagicMock()
+    store.window.return_value = [2] * 28
+    tracker = FakeTracker(None, error=RuntimeError("offline"))
+    tracker.store_key = lambda: "fake"
+    manager = IntegrationManager(MagicMock(), trackers=[tracker], max_workers=0,
+                                 activity_store=store)
+    # The fetch failed, the stored history is still shown
+    assert manager.display_activity(tracker) == [2] * 28
+    store.window.assert_called_with("fake", 28)
+    assert tracker.calls == 1
+
+
+def test_display_falls_back_to_fetch_without_store_rows():
+    store = MagicMock()
+    store.window.return_value = None
+    tracker = FakeTracker([1] * 28)
+    tracker.store_key = lambda: "fake"
+    manager = IntegrationManager(MagicMock(), trackers=[tracker], max_workers=0,
+                                 activity_store=store)
+    assert manager.display_activity(tracker) == [1] * 28
+
+
+def test_restored_snapshot_is_shown_and_not_waited_for(tmp_path):
+    snapshot = DisplaySnapshot(str(tmp_path / "snapshot.json"))
+    snapshot.save({"fake": {"activity": [4] * 28, "colors": {"event": [1, 2, 3]}}})
+    runner = MagicMock()
+    tracker = FakeTracker([5] * 28, blocked=True, fetch_timeout=30)
+    tracker.store_key = lambda: "fake"
+    manager = IntegrationManager(runner, trackers=[tracker], max_workers=1, snapshot=snapshot)
+
+    assert manager.restore_snapshot() == 1
+    assert manager.show_snapshot()
+    runner.update_calendar.assert_called_once_with(
+        [4] * 28, brightness=0.8, colors={"event": [1, 2, 3]}
+    )
+
+    # The network is slow: the refresh returns at once, the snapshot stays
+    manager.refresh_all()
+    assert manager.latest_activity(tracker) == [4] * 28
+
+    stored = threading.Event()
+    manager._pending[tracker].add_done_callback(lambda f: stored.set())
+    tracker.release.set()
+    assert stored.wait(5)
+    assert manager.latest_activity(tracker) == [5] * 28
+    assert not manager.show_snapshot()
+    manager.close()
+
+
+@patch("led_control.core.integration_manager.time.sleep", return_value=None)
+def test_rotation_saves_snapshot_when_changed(mock_sleep, tmp_path):
+    snapshot = DisplaySnapshot(str(tmp_path / "snapshot.json"))
+    tracker = FakeTracker([1] * 28)
+    manager = IntegrationManager(MagicMock(), trackers=[tracker], max_workers=1,
+                                 snapshot=snapshot)
+    manager.update_calendar_display(poll_time=10)
+    assert snapshot.load() == {
+        "FakeTracker": {
+            "activity": [1] * 28,
+            "colors": {"event": [0, 255, 0], "no_events": [30, 30, 30]},
+        }
+    }
+
+    with patch.object(snapshot, "save", wraps=snapshot.save) as save:
+        manager.update_calendar_display(poll_time=10)
+        save.assert_not_called()
+        tracker.activity = [2] * 28
+        manager.update_calendar_display(poll_time=10)
+        save.assert_called_once()
+    manager.close()
+
+
+def test_without_snapshot_nothing_is_restored():
+    manager = IntegrationManager(MagicMock(), trackers=[FakeTracker([1] * 28)])
+    assert manager.restore_snapshot() == 0
+    assert not manager.show_snapshot()
+    assert not manager.save_snapshot()
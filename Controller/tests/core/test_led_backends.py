@@ -0,0 +1,97 @@
+"""
+Unit tests for the LED output backends.
+
+This test suite covers:
+- No hardware modules imported until the NeoPixel strip is first used
+- The in-memory backend recording frames
+- The terminal renderer's grid and colours
+- Picking a backend from the config or the environment
+"""
+
+import io
+import sys
+import types
+
+import pytest
+
+from led_control.core.led_backends import (
+    LED_BACKEND_ENV,
+    MemoryBackend,
+    NeoPixelBackend,
+    TerminalBackend,
+    backend_name,
+    create_backend,
+)
+from led_control.core.led_controller import LEDController
+
+
+def test_neopixel_modules_imported_on_first_frame(monkeypatch, recording_strip):
+    opened = []
+    fake_board = types.SimpleNamespace(D18="D18")
+    fake_neopixel = types.SimpleNamespace(
+        GRB="GRB",
+        NeoPixel=lambda pin, n, **kwargs: opened.append(pin) or recording_strip(n),
+    )
+    monkeypatch.setitem(sys.modules, "board", fake_board)
+    monkeypatch.setitem(sys.modules, "neopixel", fake_neopixel)
+
+    led = LEDController(num_leds=2)
+    assert opened == []
+    led.fill((1, 2, 3))
+    led.show()
+    assert opened == ["D18"]
+    assert led.strip.shown == [bytes([2, 1, 3, 2, 1, 3])]
+
+
+def test_neopixel_without_hardware_fails_on_use(monkeypatch):
+    monkeypatch.setitem(sys.modules, "board", None)
+    backend = NeoPixelBackend(2)
+    with pytest.raises(ImportError, match="memory"):
+        backend.write(bytes(6))
+
+
+def test_memory_backend_records_frames():
+    backend = MemoryBackend(3, max_frames=2)
+    led = LEDController(num_leds=3, backend=backend)
+    for level in (10, 20, 30):
+        led.fill((level, 0, 0))
+        led.show()
+    assert backend.frame_count == 3
+    assert len(backend.frames) == 2
+    assert backend.pixels(backend.last_frame) == [(30, 0, 0)] * 3
+
+
+def test_offscreen_controller_keeps_no_frames():
+    led = LEDController(num_leds=2, backend=MemoryBackend(2))
+    offscreen = led.offscreen()
+    offscreen.fill((1, 1, 1))
+    offscreen.show()
+    assert list(offscreen.backend.frames) == []
+
+
+def test_terminal_backend_draws_rows():
+    stream = io.StringIO()
+    backend = TerminalBackend(3, stream=stream, columns=2)
+    led = LEDController(num_leds=3, backend=backend)
+    led.set_pixel(0, (255, 0, 0))
+    led.set_pixel(2, (0, 0, 255))
+    led.show()
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 2
+    assert lines[0].startswith("\x1b[38;2;255;0;0m")
+    assert "\x1b[38;2;0;0;255m" in lines[1]
+
+
+def test_backend_name_prefers_environment(monkeypatch):
+    monkeypatch.delenv(LED_BACKEND_ENV, raising=False)
+    assert backend_name(None) == "neopixel"
+    assert backend_name("Memory") == "memory"
+    monkeypatch.setenv(LED_BACKEND_ENV, "terminal")
+    assert backend_name("memory") == "terminal"
+
+
+def test_create_backend():
+    assert isinstance(create_backend("memory", 4), MemoryBackend)
+    assert create_backend("neopixel", 4, pin_num=12).pin_num == 12
+    with pytest.raises(ValueError):
+        create_backend("dmx", 4)
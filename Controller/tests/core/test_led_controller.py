@@ -0,0 +1,107 @@
+import pytest
+
+from led_control.core.framebuffer import FrameBuffer
+from led_control.core.led_controller import LEDController
+
+
+@pytest.fixture
+def led(recording_strip):
+    return LEDController(pin_num=18, num_leds=4, brightness=1.0, strip=recording_strip(4))
+
+
+def test_framebuffer_native_order():
+    fb = FrameBuffer(2, pixel_order="GRB")
+    fb.set_pixel(1, (10, 20, 30))
+    assert fb.buf == bytearray([0, 0, 0, 20, 10, 30])
+    assert fb.get_pixel(1) == (10, 20, 30)
+
+
+def test_framebuffer_fill_and_clear():
+    fb = FrameBuffer(3)
+    fb.fill((1, 2, 3))
+    assert fb.buf == bytearray([2, 1, 3] * 3)
+    fb.clear()
+    assert fb.is_blank()
+
+
+def test_framebuffer_rejects_bad_order():
+    with pytest.raises(ValueError):
+        FrameBuffer(3, pixel_order="RGX")
+
+
+def test_set_pixel_does_not_transmit(led):
+    led.set_pixel(0, (255, 0, 0))
+    assert led.strip.show_count == 0
+    assert led.frame.get_pixel(0) == (255, 0, 0)
+
+
+def test_commit_copies_frame_in_bulk(led):
+    led.set_pixel(1, (10, 20, 30))
+    assert led.commit()
+    assert led.strip._post_brightness_buffer == led.frame.buf
+    assert led.strip.show_count == 1
+
+
+def test_commit_skips_identical_frame(led):
+    led.fill((5, 5, 5))
+    led.show()
+    led.fill((5, 5, 5))
+    assert not led.commit()
+    assert led.strip.show_count == 1
+    assert led.commit(force=True)
+    assert led.strip.show_count == 2
+
+
+def test_clear_does_not_transmit(led):
+    led.fill((5, 5, 5))
+    led.show()
+    led.clear()
+    assert led.strip.show_count == 1
+    led.turn_all_off()
+    assert led.strip.show_count == 2
+    assert led.strip._post_brightness_buffer == bytearray(12)
+
+
+def test_global_brightness_applied_at_commit(led):
+    led.set_brightness(0.5)
+    led.set_pixel(0, (200, 100, 0))
+    led.show()
+    assert led.frame.get_pixel(0) == (200, 100, 0)
+    assert led.strip._post_brightness_buffer[:3] == bytearray([50, 100, 0])
+
+
+def test_brightness_change_retransmits(led):
+    led.fill((100, 100, 100))
+    led.show()
+    led.set_brightness(0.5)
+    assert led.commit()
+    assert led.strip.show_count == 2
+
+
+def test_set_frame_from_tuples(led):
+    led.set_frame([(1, 2, 3), (4, 5, 6)])
+    assert led.frame.get_pixel(1) == (4, 5, 6)
+
+
+def test_set_frame_from_array(led):
+    np = pytest.importorskip("numpy")
+    frame = np.array([(1, 2, 3), (4, 5, 6), (7, 8, 9), (0, 0, 0)], dtype=np.uint8)
+    led.set_frame(frame)
+    assert led.frame.buf == bytearray([2, 1, 3, 5, 4, 6, 8, 7, 9, 0, 0, 0])
+
+
+def test_per_pixel_fallback_without_pixelbuf(recording_strip):
+    strip = recording_strip(3, pixelbuf=False)
+    led = LEDController(num_leds=3, brightness=0.5, strip=strip)
+    led.set_pixel(1, (200, 100, 0))
+    assert led.commit()
+    assert strip.shown[-1] == [(0, 0, 0), (100, 50, 0), (0, 0, 0)]
+    assert not led.commit()
+
+
+def test_color_correction_change_retransmits(led):
+    led.fill((100, 100, 100))
+    led.show()
+    assert not led.set_color_correction(led.pipeline.gamma, led.pipeline.white_balance)
+    assert led.set_color_correction(2.2, (1.0, 1.0, 1.0))
+    assert led.strip.show_count == 2
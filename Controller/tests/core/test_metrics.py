@@ -0,0 +1,133 @@
+"""
+Unit tests for the runtime metrics registry and exporters.
+
+This test suite covers:
+- Counter and histogram rendering in the Prometheus text format
+- Label checks, collectors and metric de-duplication
+- The HTTP and text file exporters
+- Instrumentation of commits, tracker fetches and animation frame clocks
+"""
+
+import urllib.request
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from led_control.core import metrics
+from led_control.core.animation_runner import AnimationRunner
+from led_control.core.integration_manager import FETCHES, FETCH_SECONDS, IntegrationManager
+from led_control.core.led_backends import MemoryBackend
+from led_control.core.led_controller import FRAMES_COMMITTED, SHOW_SECONDS, LEDController
+from led_control.core.metrics import MetricsExporter, MetricsRegistry
+
+
+def test_counter_render():
+    registry = MetricsRegistry()
+    fetches = registry.counter("fetches_total", "Fetches", ("tracker", "outcome"))
+    fetches.inc(tracker="GitHubTracker", outcome="ok")
+    fetches.inc(2, tracker="GitHubTracker", outcome="ok")
+    fetches.inc(tracker='odd"name', outcome="error")
+    assert registry.render().splitlines() == [
+        "# HELP fetches_total Fetches",
+        "# TYPE fetches_total counter",
+        'fetches_total{tracker="GitHubTracker",outcome="ok"} 3',
+        'fetches_total{tracker="odd\\"name",outcome="error"} 1',
+    ]
+
+
+def test_histogram_render_is_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value)
+    lines = registry.render().splitlines()
+    assert lines[2:] == [
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_sum 3.65",
+        "latency_seconds_count 4",
+    ]
+
+
+def test_labels_must_match():
+    registry = MetricsRegistry()
+    hits = registry.counter("hits_total", "Hits", ("cache",))
+    with pytest.raises(ValueError):
+        hits.inc()
+    with pytest.raises(ValueError):
+        registry.histogram("hits_total", "Hits", ("cache",))
+    assert registry.counter("hits_total", "Hits", ("cache",)) is hits
+
+
+def test_collectors_run_before_render():
+    registry = MetricsRegistry()
+    frames = registry.counter("frames_total", "Frames", ("animation",))
+    registry.add_collector(lambda: frames.set(42, animation="sun"))
+    assert 'frames_total{animation="sun"} 42' in registry.render()
+
+
+def test_http_exporter_serves_metrics():
+    registry = MetricsRegistry()
+    registry.counter("up_total", "Up").inc()
+    exporter = MetricsExporter(port=0, registry=registry)
+    port = exporter.start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as resp:
+            assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert "up_total 1" in resp.read().decode()
+    finally:
+        exporter.stop()
+
+
+def test_file_exporter_writes_on_start_and_stop(tmp_path):
+    registry = MetricsRegistry()
+    up = registry.counter("up_total", "Up")
+    path = tmp_path / "ccal.prom"
+    exporter = MetricsExporter(path=str(path), interval=60, registry=registry)
+    exporter.start()
+    assert "up_total" in path.read_text()
+    up.inc(5)
+    exporter.stop()
+    assert "up_total 5" in path.read_text()
+
+
+def test_commit_records_show_time_and_result():
+    led = LEDController(num_leds=2, backend=MemoryBackend(2))
+    sent = FRAMES_COMMITTED.value(result="sent")
+    unchanged = FRAMES_COMMITTED.value(result="unchanged")
+    shows = SHOW_SECONDS.count()
+    led.fill((1, 2, 3))
+    led.show()
+    led.show()
+    assert FRAMES_COMMITTED.value(result="sent") == sent + 1
+    assert FRAMES_COMMITTED.value(result="unchanged") == unchanged + 1
+    assert SHOW_SECONDS.count() == shows + 1
+
+
+class Failing:
+    def get_activity(self):
+        raise RuntimeError("offline")
+
+    def get_colors(self):
+        return {}
+
+
+def test_fetch_outcomes_per_tracker_class():
+    tracker = Failing()
+    manager = IntegrationManager(MagicMock(), trackers=[tracker], max_workers=1)
+    errors = FETCHES.value(tracker="Failing", outcome="error")
+    timed = FETCH_SECONDS.count(tracker="Failing")
+    manager.refresh_all()
+    manager.close()
+    assert FETCHES.value(tracker="Failing", outcome="error") == errors + 1
+    assert FETCH_SECONDS.count(tracker="Failing") == timed + 1
+
+
+def test_animation_frames_collected_from_clocks():
+    runner = AnimationRunner(LEDController(num_leds=4, backend=MemoryBackend(4)))
+    with patch("time.sleep", return_value=None):
+        runner.flash()
+    runner.collect_metrics()
+    frames = metrics.counter("ccal_animation_frames_total", "", ("animation",))
+    assert frames.value(animation="flash") == runner.frame_stats()["flash"]["frames"] > 0
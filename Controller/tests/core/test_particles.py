@@ -0,0 +1,61 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from led_control.core.particles import ParticleSystem
+
+PALETTE = [(0, 0, 255), (0, 128, 255)]
+
+
+@pytest.fixture
+def mock_led():
+    led = MagicMock()
+    led.num_leds = 8
+    return led
+
+
+def test_spawn_respects_capacity():
+    ps = ParticleSystem(rows=4, cols=2, capacity=2)
+    assert ps.spawn(0, 1.0, 0, 0.5)
+    assert ps.spawn(1, 1.0, 1, 0.5)
+    assert not ps.spawn(0, 1.0, 0, 0.5)
+    assert ps.count == 2
+    assert ps.rejected == 1
+
+
+def test_step_draws_then_advances(mock_led):
+    ps = ParticleSystem(rows=4, cols=2, capacity=4)
+    ps.spawn(1, 1.0, 1, 0.5)
+    ps.step(mock_led, PALETTE)
+    mock_led.set_pixel.assert_called_once_with(1, PALETTE[1], 0.5)
+    ps.step(mock_led, PALETTE)
+    mock_led.set_pixel.assert_called_with(3, PALETTE[1], 0.5)
+
+
+def test_particles_removed_at_bottom(mock_led):
+    ps = ParticleSystem(rows=4, cols=2, capacity=4)
+    ps.spawn(0, 2.0, 0, 0.5)
+    ps.spawn(1, 1.0, 1, 0.7)
+    ps.step(mock_led, PALETTE)
+    ps.step(mock_led, PALETTE)
+    # The fast particle left the grid and the slow one was swapped into slot 0
+    assert ps.count == 1
+    assert ps.col[0] == 1
+    assert ps.brightness[0] == pytest.approx(0.7)
+
+
+def test_spawn_random_rate_above_one():
+    ps = ParticleSystem.for_rate(rows=4, cols=7, speed=1.0, per_frame=3)
+    ps.spawn_random(3, 1.0, len(PALETTE))
+    assert ps.count == 3
+    assert ps.capacity >= 12
+
+
+def test_steady_state_never_overflows(mock_led):
+    # speed 0.1 is not exact in float32, so a drop can take an extra frame
+    ps = ParticleSystem.for_rate(rows=4, cols=2, speed=0.1, per_frame=1)
+    for _ in range(300):
+        ps.spawn_random(1, 0.1, len(PALETTE))
+        ps.step(mock_led, PALETTE)
+    assert ps.rejected == 0
+    assert ps.count <= ps.capacity
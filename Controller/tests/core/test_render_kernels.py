@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from led_control.core import render_kernels
+from led_control.core.render_kernels import (
+    FogKernel,
+    RainbowKernel,
+    SunKernel,
+    TheaterChaseKernel,
+)
+
+requires_numpy = pytest.mark.skipif(
+    not render_kernels.HAVE_NUMPY, reason="NumPy not installed"
+)
+
+
+def as_tuples(frame):
+    return [tuple(int(c) for c in pixel) for pixel in frame]
+
+
+def make_patches(rows, cols, seed=1):
+    rng = random.Random(seed)
+    return [
+        {
+            "row": rng.randint(0, rows - 1),
+            "pos": rng.uniform(0, cols - 1),
+            "width": rng.uniform(cols * 0.4, cols * 0.7),
+            "color": rng.choice([(200, 200, 200), (255, 255, 255)]),
+            "speed": rng.uniform(0.02, 0.25) * rng.choice([-1, 1]),
+        }
+        for _ in range(3)
+    ]
+
+
+def test_python_rainbow_matches_wheel():
+    kernel = RainbowKernel(4, use_numpy=False)
+    frame = kernel.render(10)
+    assert frame == [render_kernels.wheel((i * 64 + 10) & 255) for i in range(4)]
+
+
+def test_python_theater_chase():
+    kernel = TheaterChaseKernel(6, (1, 2, 3), spacing=3, use_numpy=False)
+    frame = kernel.render(1)
+    assert frame[2] == (1, 2, 3)
+    assert frame[5] == (1, 2, 3)
+    assert frame[0] == (0, 0, 0)
+
+
+@requires_numpy
+@pytest.mark.parametrize("num_leds", [5, 28, 112])
+def test_numpy_rainbow_matches_python(num_leds):
+    np_kernel = RainbowKernel(num_leds)
+    py_kernel = RainbowKernel(num_leds, use_numpy=False)
+    for phase in (0, 100, 255):
+        assert as_tuples(np_kernel.render(phase)) == py_kernel.render(phase)
+
+
+@requires_numpy
+def test_numpy_theater_chase_matches_python():
+    np_kernel = TheaterChaseKernel(10, (9, 8, 7))
+    py_kernel = TheaterChaseKernel(10, (9, 8, 7), use_numpy=False)
+    for phase in range(3):
+        assert as_tuples(np_kernel.render(phase)) == py_kernel.render(phase)
+
+
+@requires_numpy
+def test_numpy_sun_matches_python():
+    colors = [(255, 255, 0), (255, 255, 50), (255, 255, 20)]
+    np_kernel = SunKernel(28, colors)
+    py_kernel = SunKernel(28, colors, use_numpy=False)
+    for now in (0.0, 0.4, 1.3):
+        np_frame = as_tuples(np_kernel.render(now))
+        py_frame = py_kernel.render(now)
+        for a, b in zip(np_frame, py_frame):
+            assert all(abs(x - y) <= 1 for x, y in zip(a, b))
+
+
+@requires_numpy
+def test_numpy_fog_matches_python():
+    rows, cols, num_leds = 4, 7, 28
+    kwargs = dict(base_color=(180, 180, 180), min_brightness=0.07, max_brightness=0.18)
+    np_kernel = FogKernel(num_leds, rows, cols, make_patches(rows, cols), **kwargs)
+    py_kernel = FogKernel(
+        num_leds, rows, cols, make_patches(rows, cols), use_numpy=False, **kwargs
+    )
+    for _ in range(20):
+        np_frame = as_tuples(np_kernel.step())
+        py_frame = py_kernel.step()
+        for a, b in zip(np_frame, py_frame):
+            assert all(abs(x - y) <= 1 for x, y in zip(a, b))
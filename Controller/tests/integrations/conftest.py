@@ -0,0 +1,10 @@
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def no_transport_backoff():
+    """Retries in the shared HTTP transport don't wait between attempts."""
+    with patch("led_control.integrations.http_transport.time.sleep", return_value=None):
+        yield
@@ -0,0 +1,142 @@
+"""
+Unit tests for the GenericTracker integration module.
+
+This test suite covers:
+- Loading the tracker file
+- Re-reading the file only when it changes
+- Keeping the last good state when the file is broken
+- The date-anchored ring buffer and migration of legacy files
+"""
+
+import json
+import os
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from led_control.integrations.generic_tracker import RING_DAYS, GenericTracker, epoch_day
+
+TODAY = date.today()
+
+
+def ring_for(values, anchor=TODAY):
+    """Ring holding values[i] for anchor - i days."""
+    ring = [0] * RING_DAYS
+    for days_ago, value in enumerate(values):
+        ring[epoch_day(anchor - timedelta(days=days_ago)) % RING_DAYS] = value
+    return ring
+
+
+TRACKER = {
+    "name": "Water",
+    "anchor": TODAY.isoformat(),
+    "ring": ring_for([1, 2, 3]),
+    "event": [0, 0, 255],
+    "no_events": [30, 30, 30],
+    "metric": "glasses",
+}
+
+
+@pytest.fixture
+def tracker_file(tmp_path):
+    path = tmp_path / "Water.json"
+    path.write_text(json.dumps(TRACKER))
+    return path
+
+
+def write(path, config, bump=1):
+    """Write the file and move its mtime forward so the change is visible."""
+    path.write_text(json.dumps(config))
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump * 1_000_000_000))
+
+
+def test_loads_tracker_file(tracker_file):
+    tracker = GenericTracker(str(tracker_file))
+    assert tracker.get_name() == "Water"
+    assert tracker.get_activity()[:3] == [1, 2, 3]
+    assert tracker.get_colors() == {"event": [0, 0, 255], "no_events": [30, 30, 30]}
+
+
+def test_unchanged_file_is_not_reparsed(tracker_file):
+    tracker = GenericTracker(str(tracker_file))
+    with patch("led_control.integrations.generic_tracker.ConfigManager") as manager:
+        for _ in range(5):
+            tracker.get_activity()
+    manager.assert_not_called()
+
+
+def test_changed_file_is_reloaded(tracker_file):
+    tracker = GenericTracker(str(tracker_file))
+    write(tracker_file, dict(TRACKER, ring=ring_for([9])))
+    assert tracker.get_activity()[0] == 9
+
+
+def test_broken_file_keeps_last_good_state(tracker_file):
+    tracker = GenericTracker(str(tracker_file))
+    tracker_file.write_text('{"name": "Wat')
+    assert tracker.get_activity()[:3] == [1, 2, 3]
+    assert tracker.get_name() == "Water"
+
+    # Fixed on disk: picked up on the next poll
+    write(tracker_file, dict(TRACKER, name="Tea"))
+    tracker.get_activity()
+    assert tracker.get_name() == "Tea"
+
+
+def test_unloadable_file_raises_instead_of_exiting(tmp_path):
+    path = tmp_path / "Broken.json"
+    path.write_text("[]")
+    with pytest.raises(ValueError):
+        GenericTracker(str(path))
+
+
+def test_gap_of_days_read_from_anchor(tracker_file):
+    tracker = GenericTracker(str(tracker_file))
+    # Three days later, with nothing recorded since: values moved three days back
+    with patch("led_control.integrations.generic_tracker.date") as mock_date:
+        mock_date.today.return_value = TODAY + timedelta(days=3)
+        mock_date.fromisoformat = date.fromisoformat
+        activity = tracker.get_activity()
+    assert activity[:6] == [0, 0, 0, 1, 2, 3]
+
+
+def test_expired_days_read_as_zero(tracker_file):
+    write(tracker_file, dict(TRACKER, anchor=(TODAY - timedelta(days=RING_DAYS - 1)).isoformat(),
+                             ring=ring_for([5, 6], anchor=TODAY - timedelta(days=RING_DAYS - 1))))
+    activity = GenericTracker(str(tracker_file)).get_activity()
+    assert activity[RING_DAYS - 1] == 5
+    assert sum(activity) == 5
+
+
+def test_day_change_writes_nothing(tracker_file):
+    tracker = GenericTracker(str(tracker_file))
+    before = os.stat(tracker_file).st_mtime_ns
+    with patch("led_control.integrations.generic_tracker.date") as mock_date:
+        mock_date.today.return_value = TODAY + timedelta(days=1)
+        tracker.get_activity()
+    assert os.stat(tracker_file).st_mtime_ns == before
+
+
+def test_legacy_data_file_is_migrated(tmp_path):
+    path = tmp_path / "Old.json"
+    legacy = {k: v for k, v in TRACKER.items() if k not in ("anchor", "ring")}
+    legacy["data"] = [4, 0, 7] + [0] * 25
+    path.write_text(json.dumps(legacy))
+
+    tracker = GenericTracker(str(path))
+    assert tracker.get_activity()[:3] == [4, 0, 7]
+    saved = json.loads(path.read_text())
+    assert "data" not in saved
+    assert saved["anchor"] == TODAY.isoformat()
+    assert saved["ring"] == ring_for([4, 0, 7])
+
+
+def test_config_manager_reused_across_reloads(tracker_file):
+    tracker = GenericTracker(str(tracker_file))
+    manager = tracker.config_manager
+    write(tracker_file, dict(json.loads(tracker_file.read_text()), name="Renamed"))
+    tracker.get_activity()
+    assert tracker.get_name() == "Renamed"
+    assert tracker.config_manager is manager
@@ -0,0 +1,128 @@
+"""
+Unit tests for the GitHubGraphQLTracker integration module.
+
+The tracker talks to a local stub GraphQL server, so requests go through a
+real HTTP round trip.
+
+This test suite covers:
+- Mapping the contribution calendar onto the per-day array
+- The query variables sent for the window
+- GraphQL errors and HTTP failures keeping the last good counts
+"""
+
+import json
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from led_control.core.activity_store import ActivityStore
+from led_control.integrations.github_graphql_tracker import GitHubGraphQLTracker
+
+API_KEY = "blahblah"
+GITHUB_USERNAME = "Logan-Fouts"
+NUM_DAYS = 28
+TODAY = date.today()
+
+
+def calendar_response(counts_by_days_ago):
+    days = [
+        {"date": (TODAY - timedelta(days=n)).isoformat(), "contributionCount": count}
+        for n, count in sorted(counts_by_days_ago.items(), reverse=True)
+    ]
+    weeks = [{"contributionDays": days[i : i + 7]} for i in range(0, len(days), 7)]
+    return {"data": {"user": {"contributionsCollection": {"contributionCalendar": {"weeks": weeks}}}}}
+
+
+@pytest.fixture
+def stub_server():
+    """Local GraphQL stub. Set .response/.status and read .requests."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers["Content-Length"])
+            server.requests.append(
+                {"headers": dict(self.headers), "body": json.loads(self.rfile.read(length))}
+            )
+            body = json.dumps(server.response).encode("utf-8")
+            self.send_response(server.status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    server.requests = []
+    server.response = calendar_response({})
+    server.status = 200
+    server.url = f"http://127.0.0.1:{server.server_port}/graphql"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_tracker(server):
+    return GitHubGraphQLTracker(GITHUB_USERNAME, API_KEY, api_url=server.url)
+
+
+def test_calendar_maps_to_daily_counts(stub_server):
+    stub_server.response = calendar_response({0: 3, 1: 0, 5: 7, 27: 1, 30: 9})
+    counts = make_tracker(stub_server).get_activity()
+    assert len(counts) == NUM_DAYS
+    assert counts[0] == 3
+    assert counts[5] == 7
+    assert counts[27] == 1
+    assert sum(counts) == 11
+    assert len(stub_server.requests) == 1
+
+
+def test_query_covers_the_window(stub_server):
+    make_tracker(stub_server).get_activity()
+    request = stub_server.requests[0]
+    variables = request["body"]["variables"]
+    assert variables["login"] == GITHUB_USERNAME
+    assert variables["from"].startswith((TODAY - timedelta(days=NUM_DAYS - 1)).isoformat())
+    assert variables["to"].startswith(TODAY.isoformat())
+    assert request["headers"]["Authorization"] == f"Bearer {API_KEY}"
+
+
+def test_graphql_error_keeps_last_counts(stub_server):
+    tracker = make_tracker(stub_server)
+    stub_server.response = calendar_response({0: 2})
+    first = tracker.get_activity()
+    stub_server.response = {"errors": [{"message": "Bad credentials"}]}
+    assert tracker.get_activity() == first
+
+
+def test_http_error_retries_then_keeps_last_counts(stub_server):
+    tracker = make_tracker(stub_server)
+    stub_server.status = 502
+    stub_server.response = {"message": "Bad gateway"}
+    assert tracker.get_activity() == [0] * NUM_DAYS
+    assert len(stub_server.requests) == 3
+
+
+def test_rejects_missing_credentials():
+    with pytest.raises(ValueError):
+        GitHubGraphQLTracker("", API_KEY)
+    with pytest.raises(ValueError):
+        GitHubGraphQLTracker(GITHUB_USERNAME, "")
+
+
+def test_only_successful_fetches_are_recorded(stub_server, tmp_path):
+    store = ActivityStore(str(tmp_path / "activity.db"))
+    tracker = GitHubGraphQLTracker(GITHUB_USERNAME, API_KEY, api_url=stub_server.url,
+                                   activity_store=store)
+    stub_server.response = calendar_response({0: 4, 2: 1})
+    tracker.get_activity()
+    stub_server.response = {"errors": [{"message": "Bad credentials"}]}
+    tracker.get_activity()
+    window = store.window(f"github-contributions:{GITHUB_USERNAME}", NUM_DAYS)
+    assert window[:3] == [4, 0, 1]
+    store.close()
@@ -5,18 +5,26 @@ This test suite covers:
 - Initialization and argument validation
 - Event fetching (success, pagination, API errors, rate limiting, network errors)
 - Event counting (normal, malformed, and empty event lists)
+- Incremental ingestion, deduplication and the rolling day counter
+- Conditional requests, poll interval and the persisted event cache
 
 Mocks are used to simulate API responses and error conditions.
 """
 
 import time
+from datetime import date, timedelta
 from unittest.mock import Mock, patch
+import pytest
 import requests
+from led_control.integrations import github_tracker
 from led_control.integrations.github_tracker import GitHubTracker
 
+SESSION_REQUEST = "led_control.integrations.http_transport.requests.Session.request"
+
 API_KEY = "blahblah"
 NUM_DAYS = 28
 GITHUB_USERNAME = "Logan-Fouts"
+TODAY = date.today()
 RESPONSE_JSON = [
     {
         "id": "22249084947",
@@ -25,7 +33,7 @@ RESPONSE_JSON = [
         "repo": {"id": 1296269, "name": "octocat/Hello-World"},
         "payload": {"action": "started"},
         "public": True,
-        "created_at": "2022-06-09T12:47:28Z",
+        "created_at": f"{TODAY.isoformat()}T12:47:28Z",
     },
     {
         "id": "22249084964",
@@ -34,11 +42,24 @@ RESPONSE_JSON = [
         "repo": {"id": 1296269, "name": "octocat/Hello-World"},
         "payload": {"push_id": 10115855396},
         "public": False,
-        "created_at": "2022-06-07T07:50:26Z",
+        "created_at": f"{(TODAY - timedelta(days=2)).isoformat()}T07:50:26Z",
     },
 ]
 
 
+def make_event(n, days_ago=0):
+    created = (TODAY - timedelta(days=days_ago)).isoformat()
+    return {"id": str(1000 - n), "type": "PushEvent", "created_at": f"{created}T10:00:00Z"}
+
+
+@pytest.fixture(autouse=True)
+def cache_path(tmp_path, monkeypatch):
+    """Keep the persisted ETag cache out of the real home directory."""
+    path = str(tmp_path / "github_events")
+    monkeypatch.setattr(github_tracker, "DEFAULT_CACHE_PATH", path)
+    return path
+
+
 def test_github_tracker_initialization():
     """Test initializing GitHubTracker with arguments."""
     gt = GitHubTracker(GITHUB_USERNAME, API_KEY)
@@ -50,7 +71,7 @@ def test_github_tracker_initialization():
     assert gt._max_retries == 3
 
 
-@patch("led_control.integrations.github_tracker.requests.get")
+@patch(SESSION_REQUEST)
 def test_fetch_events_success(mock_get):
     """Test that _fetch_events retrieves and processes events correctly."""
     mock_get.return_value.status_code = 200
@@ -63,11 +84,11 @@ def test_fetch_events_success(mock_get):
     assert events[1]["id"] == "22249084964"
 
 
-@patch("led_control.integrations.github_tracker.requests.get")
+@patch(SESSION_REQUEST)
 def test_fetch_events_pagination(mock_get):
     """Test that _fetch_events handles pagination correctly."""
-    first_page = RESPONSE_JSON * 15  # 30 events
-    second_page = RESPONSE_JSON[:1]  # 1 event
+    first_page = [make_event(i) for i in range(30)]
+    second_page = [make_event(30)]
     mock_get.side_effect = [
         Mock(status_code=200, json=Mock(return_value=first_page)),
         Mock(status_code=200, json=Mock(return_value=second_page)),
@@ -78,7 +99,7 @@ def test_fetch_events_pagination(mock_get):
     assert len(events) == 31
 
 
-@patch("led_control.integrations.github_tracker.requests.get")
+@patch(SESSION_REQUEST)
 def test_fetch_events_api_error(mock_get):
     """Test that _fetch_events handles API errors gracefully."""
     mock_get.return_value.status_code = 500
@@ -88,7 +109,7 @@ def test_fetch_events_api_error(mock_get):
     assert events == []
 
 
-@patch("led_control.integrations.github_tracker.requests.get")
+@patch(SESSION_REQUEST)
 def test_fetch_events_rate_limit(mock_get):
     """Test that _fetch_events handles rate limiting correctly."""
     rate_limit_resp = Mock(
@@ -106,7 +127,7 @@ def test_fetch_events_rate_limit(mock_get):
     assert len(events) == 2
 
 
-@patch("led_control.integrations.github_tracker.requests.get")
+@patch(SESSION_REQUEST)
 def test_fetch_events_retries_on_network_error(mock_get):
     """Test that _fetch_events retries on network errors."""
     mock_get.side_effect = [
@@ -118,34 +139,139 @@ def test_fetch_events_retries_on_network_error(mock_get):
     assert len(events) == 2
 
 
-@patch("led_control.integrations.github_tracker.requests.get")
+@patch(SESSION_REQUEST)
 def test_get_event_counts_normal(mock_get):
-    """Test that get_event_counts returns correct counts."""
+    """Test that get_activity returns correct counts."""
     mock_get.return_value.status_code = 200
     mock_get.return_value.json.return_value = RESPONSE_JSON
     gt = GitHubTracker(GITHUB_USERNAME, API_KEY)
-    counts = gt.get_event_counts()
+    counts = gt.get_activity()
     assert isinstance(counts, list)
     assert len(counts) == NUM_DAYS
+    assert counts[0] == 1 and counts[2] == 1
 
 
-@patch("led_control.integrations.github_tracker.requests.get")
+@patch(SESSION_REQUEST)
 def test_get_event_counts_malformed_event(mock_get):
-    """Test that get_event_counts handles malformed events."""
+    """Test that get_activity handles malformed events."""
     malformed = [{"id": "bad"}] + RESPONSE_JSON
     mock_get.return_value.status_code = 200
     mock_get.return_value.json.return_value = malformed
     gt = GitHubTracker(GITHUB_USERNAME, API_KEY)
-    counts = gt.get_event_counts()
+    counts = gt.get_activity()
     assert isinstance(counts, list)
     assert len(counts) == NUM_DAYS
 
 
-@patch("led_control.integrations.github_tracker.requests.get")
+@patch(SESSION_REQUEST)
 def test_get_event_counts_empty(mock_get):
-    """Test that get_event_counts handles empty event lists."""
+    """Test that get_activity handles empty event lists."""
     mock_get.return_value.status_code = 200
     mock_get.return_value.json.return_value = []
     gt = GitHubTracker(GITHUB_USERNAME, API_KEY)
-    counts = gt.get_event_counts()
+    counts = gt.get_activity()
     assert counts == [0] * NUM_DAYS
+
+
+@patch(SESSION_REQUEST)
+def test_paging_stops_at_known_event(mock_get):
+    """Test that a poll only ingests events newer than the last one seen."""
+    mock_get.return_value = Mock(status_code=200, headers={}, json=Mock(return_value=[make_event(1)]))
+    gt = GitHubTracker(GITHUB_USERNAME, API_KEY)
+    assert gt.get_activity()[0] == 1
+
+    # Two new events on top of the known one; the full page is not re-read
+    newer = [make_event(3), make_event(2), make_event(1)] + [make_event(n) for n in range(4, 31)]
+    mock_get.return_value = Mock(status_code=200, headers={}, json=Mock(return_value=newer))
+    gt._next_poll = 0
+    assert gt.get_activity()[0] == 3
+    assert mock_get.call_count == 2
+    assert gt._last_event_id == make_event(3)["id"]
+
+
+@patch("led_control.integrations.github_tracker.time.sleep", return_value=None)
+@patch(SESSION_REQUEST)
+def test_shifted_page_is_not_double_counted(mock_get, mock_sleep):
+    """Test that an event repeated across pages is only counted once."""
+    first_page = [make_event(i) for i in range(30)]
+    # A new event pushed event 29 down onto the second page
+    second_page = [make_event(29), make_event(30)]
+    mock_get.side_effect = [
+        Mock(status_code=200, headers={}, json=Mock(return_value=first_page)),
+        Mock(status_code=200, headers={}, json=Mock(return_value=second_page)),
+    ]
+    gt = GitHubTracker(GITHUB_USERNAME, API_KEY)
+    assert gt.get_activity()[0] == 31
+
+
+@patch("led_control.integrations.github_tracker.time.sleep", return_value=None)
+@patch(SESSION_REQUEST)
+def test_failed_page_is_retried_whole(mock_get, mock_sleep):
+    """Test that a fetch with a failed page ingests nothing."""
+    mock_get.side_effect = [
+        Mock(status_code=200, headers={"ETag": '"abc"'},
+             json=Mock(return_value=[make_event(i) for i in range(30)])),
+    ] + [requests.RequestException("fail")] * 3
+    gt = GitHubTracker(GITHUB_USERNAME, API_KEY)
+    assert gt.get_activity() == [0] * NUM_DAYS
+    assert gt._etag is None and gt._last_event_id is None
+
+
+@patch(SESSION_REQUEST)
+def test_old_days_expire(mock_get):
+    """Test that days leaving the window are dropped with their ids."""
+    events = [make_event(1), make_event(2, days_ago=NUM_DAYS + 1)]
+    mock_get.return_value = Mock(status_code=200, headers={}, json=Mock(return_value=events))
+    gt = GitHubTracker(GITHUB_USERNAME, API_KEY)
+    gt.get_activity()
+    assert list(gt._event_days) == [make_event(1)["id"]]
+
+    gt._day_counts[TODAY.toordinal() - NUM_DAYS] = 1
+    gt._event_days["stale"] = TODAY.toordinal() - NUM_DAYS
+    gt._next_poll = time.monotonic() + 60
+    gt.get_activity()
+    assert "stale" not in gt._event_days
+    assert TODAY.toordinal() - NUM_DAYS not in gt._day_counts
+
+
+@patch(SESSION_REQUEST)
+def test_not_modified_keeps_counts(mock_get):
+    """Test that a 304 keeps the counts and sends the stored ETag."""
+    mock_get.side_effect = [
+        Mock(status_code=200, headers={"ETag": '"abc"'}, json=Mock(return_value=RESPONSE_JSON)),
+        Mock(status_code=304, headers={}),
+    ]
+    gt = GitHubTracker(GITHUB_USERNAME, API_KEY)
+    first = gt.get_activity()
+    gt._next_poll = 0
+    assert gt.get_activity() == first
+    assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == '"abc"'
+
+
+@patch(SESSION_REQUEST)
+def test_poll_interval_is_respected(mock_get):
+    """Test that no request is made before X-Poll-Interval has passed."""
+    mock_get.return_value = Mock(
+        status_code=200,
+        headers={"ETag": '"abc"', "X-Poll-Interval": "90"},
+        json=Mock(return_value=RESPONSE_JSON),
+    )
+    gt = GitHubTracker(GITHUB_USERNAME, API_KEY)
+    first = gt.get_activity()
+    assert gt.get_activity() == first
+    assert mock_get.call_count == 1
+    assert gt._poll_interval == 90
+
+
+@patch(SESSION_REQUEST)
+def test_validators_persist_across_restarts(mock_get):
+    """Test that a new tracker starts from the persisted ETag and counts."""
+    mock_get.return_value = Mock(
+        status_code=200, headers={"ETag": '"abc"'}, json=Mock(return_value=RESPONSE_JSON)
+    )
+    counts = GitHubTracker(GITHUB_USERNAME, API_KEY).get_activity()
+
+    mock_get.return_value = Mock(status_code=304, headers={})
+    restarted = GitHubTracker(GITHUB_USERNAME, API_KEY)
+    assert restarted.get_activity() == counts
+    assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == '"abc"'
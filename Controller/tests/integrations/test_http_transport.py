@@ -0,0 +1,98 @@
+"""
+Unit tests for the shared HTTP transport.
+
+This test suite covers:
+- Retry with backoff on connection errors and 5xx responses
+- No automatic retry of non-idempotent requests
+- Default timeout, gzip negotiation and per-host timing stats
+- The process-wide shared instance
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from led_control.integrations import http_transport
+from led_control.integrations.http_transport import HttpTransport
+
+SESSION_REQUEST = "led_control.integrations.http_transport.requests.Session.request"
+URL = "https://api.example.com/data"
+
+
+@patch(SESSION_REQUEST)
+def test_retries_connection_errors_then_succeeds(mock_request):
+    mock_request.side_effect = [requests.ConnectionError("reset"), Mock(status_code=200)]
+    transport = HttpTransport()
+    assert transport.get(URL).status_code == 200
+    assert mock_request.call_count == 2
+
+
+@patch(SESSION_REQUEST)
+def test_server_errors_retried_until_attempts_run_out(mock_request):
+    mock_request.return_value = Mock(status_code=503)
+    transport = HttpTransport(attempts=3)
+    assert transport.get(URL).status_code == 503
+    assert mock_request.call_count == 3
+
+
+@patch(SESSION_REQUEST)
+def test_client_errors_returned_without_retry(mock_request):
+    mock_request.return_value = Mock(status_code=404)
+    assert HttpTransport().get(URL).status_code == 404
+    assert mock_request.call_count == 1
+
+
+@patch(SESSION_REQUEST)
+def test_last_error_raised_after_attempts(mock_request):
+    mock_request.side_effect = requests.Timeout("slow")
+    with pytest.raises(requests.Timeout):
+        HttpTransport(attempts=2).get(URL)
+    assert mock_request.call_count == 2
+
+
+@patch(SESSION_REQUEST)
+def test_post_not_retried_by_default(mock_request):
+    mock_request.return_value = Mock(status_code=502)
+    transport = HttpTransport()
+    transport.post(URL, data={"a": 1})
+    assert mock_request.call_count == 1
+    transport.post(URL, data={"a": 1}, attempts=2)
+    assert mock_request.call_count == 3
+
+
+@patch(SESSION_REQUEST)
+def test_default_timeout_and_override(mock_request):
+    mock_request.return_value = Mock(status_code=200)
+    transport = HttpTransport(timeout=7)
+    transport.get(URL)
+    assert mock_request.call_args.kwargs["timeout"] == 7
+    transport.get(URL, timeout=2)
+    assert mock_request.call_args.kwargs["timeout"] == 2
+
+
+def test_session_negotiates_gzip():
+    transport = HttpTransport()
+    assert "gzip" in transport._session.headers["Accept-Encoding"]
+
+
+@patch(SESSION_REQUEST)
+def test_stats_per_host(mock_request):
+    mock_request.side_effect = [Mock(status_code=200), Mock(status_code=500), Mock(status_code=200)]
+    transport = HttpTransport()
+    transport.get(URL)
+    transport.get(URL)
+    stats = transport.stats()["api.example.com"]
+    assert stats["requests"] == 3
+    assert stats["errors"] == 1
+    assert stats["max_seconds"] >= stats["avg_seconds"] >= 0
+    assert [t.attempt for t in transport.timings] == [1, 1, 2]
+
+
+def test_shared_transport_is_reused():
+    http_transport.close_transport()
+    first = http_transport.get_transport()
+    assert http_transport.get_transport() is first
+    http_transport.close_transport()
+    assert http_transport.get_transport() is not first
+    http_transport.close_transport()
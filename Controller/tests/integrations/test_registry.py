@@ -0,0 +1,129 @@
+"""
+Unit tests for the integration registry.
+
+This test suite covers:
+- Which integrations the config enables, including the GitHub backend choice
+- Building a tracker from the config (options, colors, activity store)
+- Finding the integration a tracker was built from
+- Tracker modules only being imported for configured integrations
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+import led_control
+from led_control.integrations import registry
+from led_control.integrations.registry import Integration
+
+
+def make_cfg(**overrides):
+    cfg = {
+        "num_leds": 28,
+        "github_username": None,
+        "github_token": None,
+        "github_backend": "events",
+        "github_event_color": [0, 255, 0],
+        "github_no_events_color": [30, 30, 30],
+        "strava_client_id": None,
+        "strava_client_secret": None,
+        "strava_events_color": [255, 165, 0],
+        "strava_no_events_color": [30, 30, 30],
+        "weather_api_key": None,
+        "weather_lat": None,
+        "weather_lon": None,
+        "weather_max_staleness": 600,
+    }
+    cfg.update(overrides)
+    return cfg
+
+
+def names(cfg):
+    return [integration.name for integration in registry.enabled_integrations(cfg)]
+
+
+class FakeTracker:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+FAKE = Integration(
+    "fake",
+    f"{__name__}:FakeTracker",
+    ("fake_key",),
+    lambda cfg: {"key": cfg["fake_key"]},
+    color_keys=("fake_event", "fake_none"),
+)
+
+
+def test_nothing_configured_enables_nothing():
+    assert names(make_cfg()) == []
+
+
+def test_all_config_keys_are_required():
+    assert names(make_cfg(github_username="octocat")) == []
+    assert names(make_cfg(weather_api_key="k", weather_lat=1.0)) == []
+
+
+def test_github_backend_selects_tracker():
+    cfg = make_cfg(github_username="octocat", github_token="t")
+    assert names(cfg) == ["github"]
+    assert names(dict(cfg, github_backend="graphql")) == ["github-graphql"]
+    # Unknown backends fall back to the events tracker
+    assert names(dict(cfg, github_backend="bogus")) == ["github"]
+
+
+def test_enabled_integrations_keep_registry_order():
+    cfg = make_cfg(
+        github_username="octocat", github_token="t",
+        strava_client_id="id", strava_client_secret="secret",
+        weather_api_key="k", weather_lat=1.0, weather_lon=2.0,
+    )
+    assert names(cfg) == ["github", "strava", "weather"]
+
+
+def test_create_passes_options_colors_and_store():
+    store = object()
+    tracker = FAKE.create(
+        {"fake_key": "abc", "fake_event": [1, 2, 3], "fake_none": [4, 5, 6]},
+        activity_store=store,
+    )
+    assert isinstance(tracker, FakeTracker)
+    assert tracker.kwargs == {
+        "key": "abc",
+        "colors": {"event": [1, 2, 3], "no_events": [4, 5, 6]},
+        "activity_store": store,
+    }
+
+
+def test_weather_gets_no_colors_or_store():
+    weather = next(i for i in registry.INTEGRATIONS if i.name == "weather")
+    cfg = make_cfg(weather_api_key="k", weather_lat=1.0, weather_lon=2.0)
+    assert weather.options(cfg) == {"api_key": "k", "location": (1.0, 2.0), "max_staleness": 600}
+    assert weather.colors(cfg) is None
+
+
+def test_integration_for_matches_exact_class():
+    assert registry.integration_for(FakeTracker(), [FAKE]) is FAKE
+    assert registry.integration_for(object(), [FAKE]) is None
+
+
+def test_unconfigured_tracker_modules_are_not_imported():
+    # A fresh interpreter, so modules imported by other tests do not count
+    code = textwrap.dedent("""
+        import sys
+        from led_control.integrations import registry
+        cfg = {"github_username": "octocat", "github_token": "t", "github_backend": "graphql",
+               "github_event_color": [0, 255, 0], "github_no_events_color": [30, 30, 30]}
+        for integration in registry.enabled_integrations(cfg):
+            integration.load()
+        print(" ".join(sorted(m for m in sys.modules if m.startswith("led_control.integrations."))))
+    """)
+    src = os.path.dirname(os.path.dirname(led_control.__file__))
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            check=True, env=dict(os.environ, PYTHONPATH=src))
+    loaded = result.stdout.split()
+    assert "led_control.integrations.github_graphql_tracker" in loaded
+    for module in ("github_tracker", "strava", "weather_tracker", "generic_tracker"):
+        assert f"led_control.integrations.{module}" not in loaded
@@ -0,0 +1,172 @@
+"""
+Unit tests for the StravaTracker integration module.
+
+This test suite covers:
+- Incremental sync with the overlap window
+- Activity edits and deletions inside the overlap
+- Eviction of activities that left the window
+- Counting from the persisted activity cache
+- The rate limit budget and fetch scheduling
+
+The HTTP transport is a mock and authentication is skipped.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from led_control.integrations import strava
+from led_control.integrations.strava import RateLimitBudget, StravaTracker
+
+NOW = datetime.now()
+
+
+def make_activity(activity_id, days_ago=0, hours_ago=0, kind="Run"):
+    start = NOW - timedelta(days=days_ago, hours=hours_ago)
+    return {
+        "id": activity_id,
+        "type": kind,
+        "start_date": start.astimezone().isoformat(),
+        "start_date_local": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+
+
+def page(activities, headers=None):
+    return Mock(status_code=200, headers=headers or {}, json=Mock(return_value=activities))
+
+
+@pytest.fixture(autouse=True)
+def activity_cache(tmp_path, monkeypatch):
+    path = str(tmp_path / "strava_activities")
+    monkeypatch.setattr(strava, "ACTIVITY_CACHE_PATH", path)
+    return path
+
+
+@pytest.fixture
+def make_tracker():
+    def factory(transport):
+        with patch.object(StravaTracker, "_load_cached_token", return_value=True):
+            tracker = StravaTracker("id", "secret", transport=transport)
+        tracker.access_token = "token"
+        return tracker
+
+    return factory
+
+
+def test_first_sync_fetches_the_window(make_tracker):
+    transport = MagicMock()
+    transport.get.return_value = page([make_activity(1), make_activity(2, days_ago=3)])
+    tracker = make_tracker(transport)
+    counts = tracker.get_activity()
+    assert counts[0] == 1 and counts[3] == 1
+    after = transport.get.call_args.kwargs["params"]["after"]
+    assert after == pytest.approx((NOW - timedelta(days=28)).timestamp(), abs=5)
+
+
+def test_next_sync_only_asks_after_newest_minus_overlap(make_tracker):
+    transport = MagicMock()
+    newest = make_activity(1, hours_ago=2)
+    transport.get.return_value = page([newest, make_activity(2, days_ago=3)])
+    tracker = make_tracker(transport)
+    tracker.get_activity()
+
+    transport.get.return_value = page([newest, make_activity(3)])
+    counts = tracker.get_activity()
+    after = transport.get.call_args.kwargs["params"]["after"]
+    newest_start = datetime.fromisoformat(newest["start_date"]).timestamp()
+    assert after == int(newest_start - tracker.sync_overlap)
+    assert counts[0] == 2 and counts[3] == 1
+
+
+def test_overlap_picks_up_edits_and_deletions(make_tracker):
+    transport = MagicMock()
+    transport.get.return_value = page([make_activity(1, hours_ago=1), make_activity(2, hours_ago=2)])
+    tracker = make_tracker(transport)
+    tracker.get_activity()
+
+    # Activity 2 was deleted and activity 1 changed type
+    transport.get.return_value = page([make_activity(1, hours_ago=1, kind="Ride")])
+    tracker.get_activity()
+    assert list(tracker._activities) == ["1"]
+    assert tracker._activities["1"]["type"] == "Ride"
+
+
+def test_failed_sync_keeps_cache(make_tracker):
+    transport = MagicMock()
+    transport.get.return_value = page([make_activity(1)])
+    tracker = make_tracker(transport)
+    first = tracker.get_activity()
+    transport.get.return_value = Mock(status_code=500, text="error")
+    assert tracker.get_activity() == first
+
+
+def test_old_activities_evicted(make_tracker):
+    transport = MagicMock()
+    transport.get.return_value = page([make_activity(1)])
+    tracker = make_tracker(transport)
+    tracker._activities["old"] = {
+        "start": (NOW - timedelta(days=40)).timestamp(), "date": "2000-01-01", "type": "Run"
+    }
+    tracker.get_activity()
+    assert "old" not in tracker._activities
+
+
+def test_cache_persists_across_restarts(make_tracker):
+    transport = MagicMock()
+    activity = make_activity(1, days_ago=2)
+    transport.get.return_value = page([activity])
+    counts = make_tracker(transport).get_activity()
+
+    transport.get.return_value = page([activity])
+    restarted = make_tracker(transport)
+    assert restarted.get_activity() == counts
+    assert transport.get.call_args.kwargs["params"]["after"] >= int((NOW - timedelta(days=3)).timestamp())
+
+
+def test_budget_allows_fetch_within_limits():
+    budget = RateLimitBudget()
+    budget.update({"X-RateLimit-Limit": "200,2000", "X-RateLimit-Usage": "10,150"}, now=1000)
+    assert budget.limits == (200, 2000) and budget.usage == (10, 150)
+    assert budget.allows_fetch(now=1000)
+
+
+def test_spent_short_budget_waits_for_next_quarter_hour():
+    budget = RateLimitBudget()
+    budget.update({"X-RateLimit-Limit": "200,2000", "X-RateLimit-Usage": "200,300"}, now=1000)
+    assert budget.next_allowed == 1800
+    assert not budget.allows_fetch(now=1799)
+    assert budget.allows_fetch(now=1800)
+
+
+def test_spent_daily_budget_waits_for_utc_midnight():
+    budget = RateLimitBudget()
+    noon = datetime(2026, 3, 4, 12, tzinfo=timezone.utc).timestamp()
+    budget.update({"X-RateLimit-Limit": "200,2000", "X-RateLimit-Usage": "50,2000"}, now=noon)
+    assert budget.next_allowed == datetime(2026, 3, 5, tzinfo=timezone.utc).timestamp()
+
+
+def test_429_without_headers_waits_for_next_quarter_hour():
+    budget = RateLimitBudget()
+    budget.update({}, now=1000, throttled=True)
+    assert budget.next_allowed == 1800
+
+
+@patch("led_control.integrations.strava.time.sleep")
+def test_rate_limited_poll_serves_cache_without_blocking(mock_sleep, make_tracker):
+    transport = MagicMock()
+    transport.get.return_value = page([make_activity(1)])
+    tracker = make_tracker(transport)
+    first = tracker.get_activity()
+
+    transport.get.return_value = Mock(
+        status_code=429,
+        headers={"X-RateLimit-Limit": "200,2000", "X-RateLimit-Usage": "201,400"},
+    )
+    assert tracker.get_activity() == first
+    mock_sleep.assert_not_called()
+
+    # Throttled: served from cache without another request
+    calls = transport.get.call_count
+    assert tracker.get_activity() == first
+    assert transport.get.call_count == calls
@@ -6,15 +6,22 @@ This test suite verifies the behavior of the WeatherTracker class, including:
 - Making GET requests to the weather API
 - Handling request exceptions and retry logic
 - Caching and cache expiration of weather data
+- Stale-while-revalidate, maximum staleness and the persisted reading
 - Ensuring correct use of mocked responses
 
 Tests use unittest.mock to patch network calls and simulate various scenarios.
 """
 
+import threading
 import time
 from unittest.mock import Mock, patch
+import pytest
+import requests
+from led_control.integrations import weather_tracker
 from led_control.integrations.weather_tracker import WeatherTracker
 
+SESSION_REQUEST = "led_control.integrations.http_transport.requests.Session.request"
+
 API_KEY = "blahblah"
 LOCATION = [40.7128, -74.0060]  # New York City coordinates
 RESPONSE_JSON = {
@@ -22,13 +29,21 @@ RESPONSE_JSON = {
 }
 
 
+@pytest.fixture(autouse=True)
+def weather_cache(tmp_path, monkeypatch):
+    """Keep the persisted reading out of the real home directory."""
+    path = str(tmp_path / "weather")
+    monkeypatch.setattr(weather_tracker, "WEATHER_CACHE_PATH", path)
+    return path
+
+
 def test_initialize_with_args():
     """Test initializing WeatherTracker with arguments."""
     wt = WeatherTracker(API_KEY, LOCATION)
     assert wt.get_location() == LOCATION
 
 
-@patch("led_control.integrations.weather_tracker.requests.get")
+@patch(SESSION_REQUEST)
 def test_get_weather_makes_get_request(mock_get):
     """Test that updateWeather() makes a GET request to the correct endpoint."""
     # Create mock response
@@ -43,32 +58,32 @@ def test_get_weather_makes_get_request(mock_get):
     mock_get.assert_called_once()
 
     assert weather is not None
-    assert wt.get_current_weather() == RESPONSE_JSON
+    assert wt.get_weather() == RESPONSE_JSON
     assert weather == RESPONSE_JSON
 
 
-@patch("led_control.integrations.weather_tracker.requests.get")
+@patch(SESSION_REQUEST)
 def test_update_weather_handles_request_exception(mock_get):
     """Test that updateWeather() handles request exceptions gracefully."""
-    mock_get.side_effect = Exception("Network error")
+    mock_get.side_effect = requests.ConnectionError("Network error")
 
     wt = WeatherTracker(API_KEY, LOCATION)
 
     weather = wt._update_weather()
 
     assert weather is None
-    assert wt.get_current_weather() is None
+    assert wt.get_weather() is None
 
 
-@patch("led_control.integrations.weather_tracker.requests.get")
+@patch(SESSION_REQUEST)
 def test_update_weather_retries_on_failure(mock_get):
     """Test that updateWeather() retries on failure."""
     mock_response = Mock()
     mock_response.status_code = 200
     mock_response.json.return_value = RESPONSE_JSON
     mock_get.side_effect = [
-        Exception("Network error"),
-        Exception("Network error"),
+        requests.ConnectionError("Network error"),
+        requests.ConnectionError("Network error"),
         mock_response,
     ]
 
@@ -77,14 +92,14 @@ def test_update_weather_retries_on_failure(mock_get):
     weather = wt._update_weather()
 
     assert weather == RESPONSE_JSON
-    assert wt.get_current_weather() == RESPONSE_JSON
+    assert wt.get_weather() == RESPONSE_JSON
     assert mock_get.call_count == 3
 
 
-@patch("led_control.integrations.weather_tracker.requests.get")
+@patch(SESSION_REQUEST)
 def test_update_weather_fails_after_max_retries(mock_get):
     """Test that updateWeather() returns None after max retries."""
-    mock_get.side_effect = Exception("Network error")
+    mock_get.side_effect = requests.ConnectionError("Network error")
 
     wt = WeatherTracker(API_KEY, LOCATION)
 
@@ -94,7 +109,7 @@ def test_update_weather_fails_after_max_retries(mock_get):
     assert mock_get.call_count == 3
 
 
-@patch("led_control.integrations.weather_tracker.requests.get")
+@patch(SESSION_REQUEST)
 def test_get_weather_uses_cached_data(mock_get):
     """Test that getCurrentWeather() returns cached data if within cache duration."""
     mock_response = Mock()
@@ -104,16 +119,16 @@ def test_get_weather_uses_cached_data(mock_get):
 
     wt = WeatherTracker(API_KEY, LOCATION)
 
-    weather1 = wt.get_current_weather()
+    weather1 = wt.get_weather()
     wt._current_weather = "Modified Data"
-    weather2 = wt.get_current_weather()
+    weather2 = wt.get_weather()
 
     assert weather1 == RESPONSE_JSON
     assert weather2 == "Modified Data"
     mock_get.assert_called_once()
 
 
-@patch("led_control.integrations.weather_tracker.requests.get")
+@patch(SESSION_REQUEST)
 def test_get_weather_no_cache_initially(mock_get):
     """Test that getCurrentWeather() calls updateWeather() if no cached data."""
     mock_response = Mock()
@@ -124,16 +139,16 @@ def test_get_weather_no_cache_initially(mock_get):
     wt = WeatherTracker(API_KEY, LOCATION)
 
     assert wt._current_weather is None
-    weather = wt.get_current_weather()
+    weather = wt.get_weather()
 
     assert weather == RESPONSE_JSON
-    assert wt.get_current_weather() == RESPONSE_JSON
+    assert wt.get_weather() == RESPONSE_JSON
     mock_get.assert_called_once()
 
 
-@patch("led_control.integrations.weather_tracker.requests.get")
+@patch(SESSION_REQUEST)
 def test_get_weather_cache_expires(mock_get):
-    """Test that getCurrentWeather() fetches new data after cache expires."""
+    """Test that an expired reading is served while it refreshes in the background."""
     mock_response = Mock()
     mock_response.status_code = 200
     mock_response.json.return_value = RESPONSE_JSON
@@ -142,13 +157,65 @@ def test_get_weather_cache_expires(mock_get):
     wt = WeatherTracker(API_KEY, LOCATION)
     wt._cache_duration = 1
 
-    weather1 = wt.get_current_weather()
+    weather1 = wt.get_weather()
     wt._current_weather = "Modified Data"
+    wt._cache_time -= 2
 
-    time.sleep(2)
-
-    weather2 = wt.get_current_weather()
+    weather2 = wt.get_weather()
+    wt._refresh_thread.join(5)
 
     assert weather1 == RESPONSE_JSON
-    assert weather2 == RESPONSE_JSON
+    assert weather2 == "Modified Data"
+    assert wt.get_weather() == RESPONSE_JSON
+    assert mock_get.call_count == 2
+
+
+@patch(SESSION_REQUEST)
+def test_expired_reading_returned_without_waiting(mock_get):
+    """Test that a slow API never delays get_weather() once a reading exists."""
+    mock_get.return_value = Mock(status_code=200, json=Mock(return_value=RESPONSE_JSON))
+    wt = WeatherTracker(API_KEY, LOCATION)
+    wt.get_weather()
+    wt._cache_time -= wt._cache_duration + 1
+
+    release = threading.Event()
+
+    def slow_request(*args, **kwargs):
+        release.wait(5)
+        return Mock(status_code=200, json=Mock(return_value={"fresh": True}))
+
+    mock_get.side_effect = slow_request
+    assert wt.get_weather() == RESPONSE_JSON
+    # A second call while the refresh is in flight does not start another one
+    assert wt.get_weather() == RESPONSE_JSON
+    release.set()
+    wt._refresh_thread.join(5)
+    assert wt.get_weather() == {"fresh": True}
     assert mock_get.call_count == 2
+
+
+@patch(SESSION_REQUEST)
+def test_too_stale_reading_not_shown(mock_get):
+    """Test that a reading past the maximum staleness is dropped if refresh fails."""
+    mock_get.return_value = Mock(status_code=200, json=Mock(return_value=RESPONSE_JSON))
+    wt = WeatherTracker(API_KEY, LOCATION, max_staleness=60)
+    wt.get_weather()
+    wt._cache_time -= 61
+
+    mock_get.side_effect = requests.ConnectionError("down")
+    assert wt.get_weather() is None
+
+
+@patch(SESSION_REQUEST)
+def test_reading_persists_across_restarts(mock_get):
+    """Test that the first reading after a restart comes from disk."""
+    mock_get.return_value = Mock(status_code=200, json=Mock(return_value=RESPONSE_JSON))
+    WeatherTracker(API_KEY, LOCATION).get_weather()
+
+    restarted = WeatherTracker(API_KEY, LOCATION)
+    assert restarted.get_weather() == RESPONSE_JSON
+    assert mock_get.call_count == 1
+
+    # A reading for another location is not reused
+    elsewhere = WeatherTracker(API_KEY, [0.0, 0.0])
+    assert elsewhere._current_weather is None
@@ -132,28 +132,92 @@ app.post('/submit', (req, res, next) => {
     newConfig.PIHOLE_ENABLE = req.body.PIHOLE_ENABLE === 'on';
     newConfig.SYNCTHING_ENABLE = req.body.SYNCTHING_ENABLE === 'on';
 
-    fs.writeFile(configPath, JSON.stringify(newConfig, null, 2), (err) => {
-        if (err) {
-            console.error(err);
-            return res.status(500).send('Error saving config.');
-        }
+    try {
+        writeJsonAtomic(configPath, newConfig);
+    } catch (err) {
+        console.error(err);
+        return res.status(500).send('Error saving config.');
+    }
+
+    exec(`sudo bash /home/${USERNAME}/Daily-Grid/WebGUI/setup_addons.sh`,
+        { timeout: 120000 },
+        (error, stdout, stderr) => {
+            if (error) {
+                console.error(`Setup error: ${error.message}`);
+                return res.status(500).send('Config saved, but error running setup script.');
+            }
+            if (stderr) {
+                console.error(`Setup stderr: ${stderr}`);
+            }
+            console.log(`Setup stdout: ${stdout}`);
+            res.send('<h2>Config saved and add-ons setup!</h2><a href="/">Back</a>');
+        });
+});
+
+// Custom tracker data is a date-anchored ring buffer (see
+// Controller/src/led_control/integrations/generic_tracker.py): the value for a
+// day lives in ring[daysSinceEpoch % ring.length] and "anchor" is the newest
+// day written. Older files with a today-first "data" array are converted.
+const RING_DAYS = 28;
+
+function epochDay(date) {
+    return Math.floor(Date.UTC(date.getFullYear(), date.getMonth(), date.getDate()) / 86400000);
+}
 
+function parseDay(iso) {
+    const [y, m, d] = iso.split('-').map(Number);
+    return Math.floor(Date.UTC(y, m - 1, d) / 86400000);
+}
 
-        exec(`sudo bash /home/${USERNAME}/Daily-Grid/WebGUI/setup_addons.sh`,
-            { timeout: 120000 },
-            (error, stdout, stderr) => {
-                if (error) {
-                    console.error(`Setup error: ${error.message}`);
-                    return res.status(500).send('Config saved, but error running setup script.');
-                }
-                if (stderr) {
-                    console.error(`Setup stderr: ${stderr}`);
-                }
-                console.log(`Setup stdout: ${stdout}`);
-                res.send('<h2>Config saved and add-ons setup!</h2><a href="/">Back</a>');
-            });
+function formatDay(day) {
+    return new Date(day * 86400000).toISOString().slice(0, 10);
+}
+
+function toRing(tracker, today) {
+    if (Array.isArray(tracker.ring) && tracker.anchor) return;
+    const data = tracker.data || [];
+    tracker.ring = new Array(RING_DAYS).fill(0);
+    data.slice(0, RING_DAYS).forEach((value, daysAgo) => {
+        tracker.ring[(today - daysAgo) % RING_DAYS] = value;
     });
-});
+    tracker.anchor = formatDay(today);
+    delete tracker.data;
+}
+
+// Move the anchor to today, clearing the slots of the days in between
+function advanceRing(tracker, today) {
+    const anchor = parseDay(tracker.anchor);
+    const n = tracker.ring.length;
+    for (let day = anchor + 1; day <= today && day <= anchor + n; day++) {
+        tracker.ring[day % n] = 0;
+    }
+    if (today > anchor) tracker.anchor = formatDay(today);
+}
+
+// Today-first array of the last ring.length days, as the display sees it
+function logicalData(tracker, today) {
+    const anchor = parseDay(tracker.anchor);
+    const n = tracker.ring.length;
+    return Array.from({ length: n }, (_, daysAgo) => {
+        const day = today - daysAgo;
+        const offset = anchor - day;
+        return offset < 0 || offset >= n ? 0 : tracker.ring[day % n];
+    });
+}
+
+// The controller reads these files while we write them, so never truncate in
+// place: write a temp file, fsync it and rename it over the original.
+function writeJsonAtomic(filePath, data) {
+    const tmpPath = `${filePath}.${process.pid}.tmp`;
+    const fd = fs.openSync(tmpPath, 'w');
+    try {
+        fs.writeSync(fd, JSON.stringify(data, null, 2));
+        fs.fsyncSync(fd);
+    } finally {
+        fs.closeSync(fd);
+    }
+    fs.renameSync(tmpPath, filePath);
+}
 
 // Custom tracker endpoints
 app.get('/api/trackers', (req, res) => {
@@ -164,9 +228,12 @@ app.get('/api/trackers', (req, res) => {
             const filePath = path.join(trackersDir, file);
             try {
                 const data = JSON.parse(fs.readFileSync(filePath, 'utf8'));
+                const today = epochDay(new Date());
+                toRing(data, today);
                 return {
                     filename: file,
-                    ...data
+                    ...data,
+                    data: logicalData(data, today)
                 };
             } catch (e) {
                 console.error(`Error reading tracker file ${file}:`, e);
@@ -206,14 +273,15 @@ app.post('/api/trackers', (req, res) => {
     
     const newTracker = {
         name: name,
-        data: new Array(28).fill(0), // 28 days of data, all zeros
+        anchor: formatDay(epochDay(new Date())),
+        ring: new Array(RING_DAYS).fill(0), // 28 days of data, all zeros
         no_events: [30, 30, 30],
         event: rgbColor,
         metric: metric
     };
     
     try {
-        fs.writeFileSync(filePath, JSON.stringify(newTracker, null, 2));
+        writeJsonAtomic(filePath, newTracker);
         res.json({ success: true, filename });
     } catch (e) {
         console.error('Error creating tracker:', e);
@@ -237,12 +305,15 @@ app.post('/api/trackers/:filename/increment', (req, res) => {
         }
         
         const tracker = JSON.parse(fs.readFileSync(filePath, 'utf8'));
+        const today = epochDay(new Date());
+        toRing(tracker, today);
+        advanceRing(tracker, today);
         
-        // Increment today's count (last element in the array)
-        tracker.data[0] += parseFloat(amount);
+        // Increment today's slot
+        tracker.ring[today % tracker.ring.length] += parseFloat(amount);
         
-        fs.writeFileSync(filePath, JSON.stringify(tracker, null, 2));
-        res.json({ success: true, newValue: tracker.data[tracker.data.length - 1] });
+        writeJsonAtomic(filePath, tracker);
+        res.json({ success: true, newValue: tracker.ring[today % tracker.ring.length] });
     } catch (e) {
         console.error('Error updating tracker:', e);
         res.status(500).json({ error: 'Failed to update tracker' });
@@ -284,7 +355,7 @@ app.put('/api/trackers/:filename/color', (req, res) => {
         const tracker = JSON.parse(fs.readFileSync(filePath, 'utf8'));
         tracker.event = color;
         
-        fs.writeFileSync(filePath, JSON.stringify(tracker, null, 2));
+        writeJsonAtomic(filePath, tracker);
         res.json({ success: true });
     } catch (e) {
         console.error('Error updating tracker color:', e);